@@ -1,25 +1,49 @@
-from fastapi import FastAPI, APIRouter, UploadFile, File, HTTPException, Body
+from fastapi import FastAPI, APIRouter, UploadFile, File, HTTPException, Body, Query, Request, Response
 from fastapi.responses import JSONResponse, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne, UpdateMany, DeleteMany
+from pymongo.errors import BulkWriteError, OperationFailure
 import os
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional, Dict, Any, Iterable
 import uuid
-from datetime import datetime, timezone
+import hashlib
+from functools import lru_cache
+import numpy as np
+from datetime import datetime, timezone, timedelta
 import json
+import base64
+try:
+    import orjson  # optional: schnellerer JSON-Decoder für große Importe
+except ImportError:
+    orjson = None
+try:
+    import zstandard  # optional: zstd-Kompression für Exporte
+except ImportError:
+    zstandard = None
 import html
+import codecs
 import re
+import bisect
 import asyncio
+import contextvars
+from collections import deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import time
 import aiohttp
-from urllib.parse import urlparse
+from urllib.parse import urlparse, urlsplit, unquote, quote
 import xml.etree.ElementTree as ET
 import csv
 import io
 import zipfile
+import zlib
 import tempfile
 
 ROOT_DIR = Path(__file__).parent
@@ -50,12 +74,22 @@ class Bookmark(BaseModel):
     last_checked: Optional[datetime] = None
     favicon: Optional[str] = None
     description: Optional[str] = None
+    tags: List[str] = Field(default_factory=list)
     status_type: str = "active"  # active, dead, localhost, duplicate, locked
+    url_key: Optional[str] = None  # kanonische URL für die Duplikat-Erkennung (indiziert)
+    rank: Optional[str] = None  # Sortierschlüssel innerhalb der Kategorie (siehe RankManager)
+    
+    @model_validator(mode="after")
+    def fill_url_key(self):
+        if self.url_key is None:
+            self.url_key = canonicalize_url(self.url)
+        return self
 
 class Category(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     name: str
     parent_category: Optional[str] = None
+    rank: Optional[str] = None  # Sortierschlüssel unter Geschwistern (siehe RankManager)
     bookmark_count: int = 0
     subcategory_count: int = 0
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -88,8 +122,14 @@ class BookmarkMove(BaseModel):
     target_subcategory: Optional[str] = None
 
 class ExportRequest(BaseModel):
-    format: str  # "xml" or "csv"
+    format: str  # "xml", "csv", "html", "json" oder "bundle" (alle vier als ZIP)
     category: Optional[str] = None
+    compression: Optional[str] = None  # "gzip" oder "zstd", nur für Einzelformate
+
+class ValidationRequest(BaseModel):
+    mode: str = "all"  # "all" oder "stale"
+    max_age_hours: Optional[float] = None  # nur für "stale"
+    write_chunk_size: Optional[int] = None  # Größe der bulk_write Chunks
 
 class Statistics(BaseModel):
     total_bookmarks: int
@@ -118,361 +158,762 @@ class BookmarkParser:
         bookmarks = []
         
         try:
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            current_folder = "Nicht zugeordnet"
-            current_subfolder = None
-            
-            # Durchlaufe alle Elemente sequenziell
-            for element in soup.find_all(['h3', 'a']):
-                if element.name == 'h3':
-                    folder_text = element.get_text().strip()
-                    
-                    # Erkenne Unterkategorien durch Pfeil-Symbol oder →
-                    if '→' in folder_text or '->' in folder_text:
-                        parts = folder_text.split('→') if '→' in folder_text else folder_text.split('->')
-                        if len(parts) >= 2:
-                            current_folder = parts[0].strip()
-                            current_subfolder = parts[1].strip()
-                        else:
-                            current_subfolder = folder_text
-                    else:
-                        current_folder = folder_text
-                        current_subfolder = None
-                        
-                elif element.name == 'a':
-                    href = element.get('href', '')
-                    title = element.get_text().strip() or href
-                    
-                    if href and href.startswith(('http://', 'https://')):
-                        bookmarks.append({
-                            'title': title,
-                            'url': href,
-                            'category': current_folder,
-                            'subcategory': current_subfolder
-                        })
-                        
+            parser = NetscapeBookmarkTokenizer()
+            bookmarks = parser.feed(content) + parser.close()
         except Exception as e:
             logging.error(f"Error parsing HTML bookmarks: {e}")
             
         return bookmarks
     
-    def parse_json_bookmarks(self, content: str) -> List[Dict[str, Any]]:
-        """Parse JSON-Bookmarks von verschiedenen Browsern"""
+    def incremental_parser(self, file_type: str):
+        """Feed-basierten Parser für blockweises Einlesen liefern (None: Format braucht das ganze Dokument)"""
+        parsers = {
+            'html': NetscapeBookmarkTokenizer,
+            'xml': IncrementalXMLParser,
+            'csv': IncrementalCSVParser
+        }
+        parser_class = parsers.get(file_type.lower())
+        return parser_class() if parser_class else None
+    
+    def parse_json_bookmarks(self, content) -> List[Dict[str, Any]]:
+        """Parse JSON-Bookmarks von verschiedenen Browsern (str oder bytes)"""
         bookmarks = []
         
         try:
-            data = json.loads(content)
-            logging.info(f"Parsed JSON data keys: {data.keys() if isinstance(data, dict) else 'not dict'}")
+            data = orjson.loads(content) if orjson is not None else json.loads(content)
             
             # Firefox JSON Format erkennen (hat 'children' und 'title' auf oberster Ebene)
             if isinstance(data, dict) and 'children' in data and 'title' in data:
-                logging.info("Detected Firefox JSON format")
+                format_name = "Firefox"
                 bookmarks = self._parse_firefox_json(data)
             # Chrome JSON Format erkennen  
             elif isinstance(data, dict) and 'roots' in data:
-                logging.info("Detected Chrome JSON format")
+                format_name = "Chrome"
                 bookmarks = self._parse_chrome_json(data)
             # Safari JSON Format
             elif isinstance(data, list) and all('Title' in item for item in data if isinstance(item, dict)):
-                logging.info("Detected Safari JSON format")
+                format_name = "Safari"
                 bookmarks = self._parse_safari_json(data)
             # Standard/Generic JSON Format
             else:
-                logging.info("Using generic JSON parser")
+                format_name = "generic"
                 bookmarks = self._parse_generic_json(data)
+            
+            logging.info(f"{format_name} JSON parser found {len(bookmarks)} bookmarks")
                 
         except Exception as e:
             logging.error(f"Error parsing JSON bookmarks: {e}")
             
         return bookmarks
     
-    def _parse_firefox_json(self, data: dict) -> List[Dict[str, Any]]:
-        """Parse Firefox JSON Format"""
+    @staticmethod
+    def _walk_json_tree(root, category: str, folder_name, to_bookmark) -> List[Dict[str, Any]]:
+        """Ordnerbaum iterativ mit explizitem Stack durchlaufen (Reihenfolge wie rekursiv, ohne Rekursionslimit)
+        
+        folder_name(node, category) liefert die Kategorie für die Kinder eines Ordners,
+        to_bookmark(node, category) ein Bookmark-Dict oder None.
+        """
         bookmarks = []
+        stack = [(root, category)]
         
-        def extract_firefox_bookmarks(node, category="Nicht zugeordnet", subcategory=None):
-            if isinstance(node, dict):
-                # Debug logging
-                logging.info(f"Processing node: {node.get('title', 'no title')}, has children: {'children' in node}, has uri: {'uri' in node}")
-                
+        while stack:
+            node, category = stack.pop()
+            if isinstance(node, list):
+                stack.extend((child, category) for child in reversed(node))
+            elif isinstance(node, dict):
                 if 'children' in node:
-                    # Folder
-                    folder_name = node.get('title', node.get('name', category))
-                    logging.info(f"Processing folder: {folder_name}")
-                    
-                    # Skip standard Firefox folder names, use parent category instead
-                    if folder_name in ['Bookmarks Toolbar', 'Bookmarks Menu', 'Other Bookmarks', 'Bookmarks']:
-                        for child in node['children']:
-                            extract_firefox_bookmarks(child, category, subcategory)
-                    else:
-                        for child in node['children']:
-                            extract_firefox_bookmarks(child, folder_name, subcategory)
-                            
-                elif 'uri' in node or 'url' in node:
-                    # Firefox Bookmark
-                    url = node.get('uri', node.get('url', ''))
-                    title = node.get('title', node.get('name', url))
-                    
-                    logging.info(f"Found bookmark: {title} -> {url}")
-                    
-                    if url and url.startswith(('http://', 'https://')):
-                        bookmarks.append({
-                            'title': title,
-                            'url': url,
-                            'category': category,
-                            'subcategory': subcategory
-                        })
-                        logging.info(f"Added bookmark: {title}")
-                        
-            elif isinstance(node, list):
-                for item in node:
-                    extract_firefox_bookmarks(item, category, subcategory)
-        
-        extract_firefox_bookmarks(data)
-        logging.info(f"Firefox JSON parser found {len(bookmarks)} bookmarks")
+                    children = node['children']
+                    if isinstance(children, list):
+                        child_category = folder_name(node, category)
+                        stack.extend((child, child_category) for child in reversed(children))
+                else:
+                    bookmark = to_bookmark(node, category)
+                    if bookmark:
+                        bookmarks.append(bookmark)
+        
         return bookmarks
     
+    # Standard-Ordner von Firefox: Kinder bleiben in der übergeordneten Kategorie
+    FIREFOX_CONTAINER_FOLDERS = {'Bookmarks Toolbar', 'Bookmarks Menu', 'Other Bookmarks', 'Bookmarks'}
+    
+    def _parse_firefox_json(self, data: dict) -> List[Dict[str, Any]]:
+        """Parse Firefox JSON Format"""
+        def folder_name(node, category):
+            name = node.get('title', node.get('name', category))
+            return category if name in self.FIREFOX_CONTAINER_FOLDERS else name
+        
+        def to_bookmark(node, category):
+            if 'uri' not in node and 'url' not in node:
+                return None
+            url = node.get('uri', node.get('url', ''))
+            if not url or not url.startswith(('http://', 'https://')):
+                return None
+            return {
+                'title': node.get('title', node.get('name', url)),
+                'url': url,
+                'category': category,
+                'subcategory': None
+            }
+        
+        return self._walk_json_tree(data, "Nicht zugeordnet", folder_name, to_bookmark)
+    
     def _parse_chrome_json(self, data: dict) -> List[Dict[str, Any]]:
         """Parse Chrome JSON Format"""
-        bookmarks = []
+        def folder_name(node, category):
+            return node.get('name', category)
         
-        def extract_chrome_bookmarks(node, category="Nicht zugeordnet", subcategory=None):
-            if isinstance(node, dict):
-                if 'children' in node:
-                    # Chrome Folder
-                    folder_name = node.get('name', category)
-                    for child in node['children']:
-                        extract_chrome_bookmarks(child, folder_name, subcategory)
-                elif 'url' in node and node.get('type') == 'url':
-                    # Chrome Bookmark
-                    bookmarks.append({
-                        'title': node.get('name', ''),
-                        'url': node['url'],
-                        'category': category,
-                        'subcategory': subcategory
-                    })
-            elif isinstance(node, list):
-                for item in node:
-                    extract_chrome_bookmarks(item, category, subcategory)
+        def to_bookmark(node, category):
+            if 'url' not in node or node.get('type') != 'url':
+                return None
+            return {
+                'title': node.get('name', ''),
+                'url': node['url'],
+                'category': category,
+                'subcategory': None
+            }
         
         # Chrome hat 'roots' mit verschiedenen Bereichen
-        if 'roots' in data:
-            for root_name, root_data in data['roots'].items():
-                if root_name in ['bookmark_bar', 'other', 'synced']:
-                    extract_chrome_bookmarks(root_data, 'Chrome Bookmarks')
-        
-        return bookmarks
+        roots = [
+            root_data for root_name, root_data in data['roots'].items()
+            if root_name in ['bookmark_bar', 'other', 'synced']
+        ]
+        return self._walk_json_tree(roots, 'Chrome Bookmarks', folder_name, to_bookmark)
     
     def _parse_safari_json(self, data: list) -> List[Dict[str, Any]]:
         """Parse Safari JSON Format"""
-        bookmarks = []
-        
-        for item in data:
-            if isinstance(item, dict):
-                if 'Title' in item and 'URLString' in item:
-                    bookmarks.append({
-                        'title': item['Title'],
-                        'url': item['URLString'],
-                        'category': 'Safari Bookmarks',
-                        'subcategory': None
-                    })
+        def to_bookmark(node, category):
+            if 'Title' not in node or 'URLString' not in node:
+                return None
+            return {
+                'title': node['Title'],
+                'url': node['URLString'],
+                'category': category,
+                'subcategory': None
+            }
         
-        return bookmarks
+        return self._walk_json_tree(data, 'Safari Bookmarks', lambda node, category: category, to_bookmark)
     
     def _parse_generic_json(self, data) -> List[Dict[str, Any]]:
         """Parse Generic JSON Format (fallback)"""
-        bookmarks = []
+        def folder_name(node, category):
+            return node.get('name', node.get('title', category))
         
-        def extract_bookmarks(node, category="Nicht zugeordnet", subcategory=None):
-            if isinstance(node, dict):
-                if 'children' in node:
-                    # Folder
-                    folder_name = node.get('name', node.get('title', category))
-                    for child in node['children']:
-                        extract_bookmarks(child, folder_name, subcategory)
-                elif 'url' in node:
-                    # Bookmark
-                    bookmarks.append({
-                        'title': node.get('name', node.get('title', '')),
-                        'url': node['url'],
-                        'category': category,
-                        'subcategory': subcategory
-                    })
-            elif isinstance(node, list):
-                for item in node:
-                    extract_bookmarks(item, category, subcategory)
+        def to_bookmark(node, category):
+            if 'url' not in node:
+                return None
+            return {
+                'title': node.get('name', node.get('title', '')),
+                'url': node['url'],
+                'category': category,
+                'subcategory': None
+            }
         
-        extract_bookmarks(data)
-        return bookmarks
+        return self._walk_json_tree(data, "Nicht zugeordnet", folder_name, to_bookmark)
     
     def parse_xml_bookmarks(self, content: str) -> List[Dict[str, Any]]:
         """Parse XML-Bookmarks"""
+        parser = IncrementalXMLParser()
+        return parser.feed(content) + parser.close()
+    
+    @staticmethod
+    def _xml_bookmark(bookmark_elem) -> Optional[Dict[str, Any]]:
+        """Standard XML Format: <bookmarks><bookmark><title/><url/><category/></bookmark></bookmarks>"""
+        title_elem = bookmark_elem.find('title')
+        url_elem = bookmark_elem.find('url')
+        category_elem = bookmark_elem.find('category')
+        subcategory_elem = bookmark_elem.find('subcategory')
+        description_elem = bookmark_elem.find('description')
+        
+        if title_elem is None or url_elem is None:
+            return None
+        
+        title = title_elem.text or "Ohne Titel"
+        url = url_elem.text or ""
+        category = category_elem.text if category_elem is not None else "Nicht zugeordnet"
+        subcategory = subcategory_elem.text if subcategory_elem is not None else None
+        description = description_elem.text if description_elem is not None else None
+        
+        if not url:  # Nur hinzufügen wenn URL vorhanden
+            return None
+        
+        return {
+            "title": title.strip(),
+            "url": url.strip(),
+            "category": category.strip() if category else "Nicht zugeordnet",
+            "subcategory": subcategory.strip() if subcategory else None,
+            "description": description.strip() if description else None
+        }
+    
+    @staticmethod
+    def _xml_item(item_elem) -> Optional[Dict[str, Any]]:
+        """Alternative XML-Struktur: <item><name/><href/></item>"""
+        name_elem = item_elem.find('name')
+        href_elem = item_elem.find('href')
+        
+        if name_elem is None or href_elem is None:
+            return None
+        
+        title = name_elem.text or "Ohne Titel"
+        url = href_elem.text or ""
+        if not url:
+            return None
+        
+        return {
+            "title": title.strip(),
+            "url": url.strip(),
+            "category": "Nicht zugeordnet",
+            "subcategory": None,
+            "description": None
+        }
+    
+    def parse_csv_bookmarks(self, content: str) -> List[Dict[str, Any]]:
+        """Parse CSV-Bookmarks"""
         bookmarks = []
         
         try:
-            import xml.etree.ElementTree as ET
-            root = ET.fromstring(content)
-            
-            # Verschiedene XML-Strukturen unterstützen
-            # Standard XML Format: <bookmarks><bookmark><title/><url/><category/></bookmark></bookmarks>
-            for bookmark_elem in root.findall('.//bookmark'):
-                title_elem = bookmark_elem.find('title')
-                url_elem = bookmark_elem.find('url')
-                category_elem = bookmark_elem.find('category')
-                subcategory_elem = bookmark_elem.find('subcategory')
-                description_elem = bookmark_elem.find('description')
-                
-                if title_elem is not None and url_elem is not None:
-                    title = title_elem.text or "Ohne Titel"
-                    url = url_elem.text or ""
-                    category = category_elem.text if category_elem is not None else "Nicht zugeordnet"
-                    subcategory = subcategory_elem.text if subcategory_elem is not None else None
-                    description = description_elem.text if description_elem is not None else None
-                    
-                    if url:  # Nur hinzufügen wenn URL vorhanden
-                        bookmarks.append({
-                            "title": title.strip(),
-                            "url": url.strip(),
-                            "category": category.strip(),
-                            "subcategory": subcategory.strip() if subcategory else None,
-                            "description": description.strip() if description else None
-                        })
-            
-            # Alternative XML-Struktur: <item><name/><href/></item>
-            if not bookmarks:
-                for item_elem in root.findall('.//item'):
-                    name_elem = item_elem.find('name')
-                    href_elem = item_elem.find('href')
-                    
-                    if name_elem is not None and href_elem is not None:
-                        title = name_elem.text or "Ohne Titel"
-                        url = href_elem.text or ""
-                        
-                        if url:
-                            bookmarks.append({
-                                "title": title.strip(),
-                                "url": url.strip(),
-                                "category": "Nicht zugeordnet",
-                                "subcategory": None,
-                                "description": None
-                            })
-                            
-        except ET.ParseError as e:
-            logging.error(f"XML Parse Error: {e}")
+            parser = IncrementalCSVParser()
+            bookmarks = parser.feed(content) + parser.close()
         except Exception as e:
-            logging.error(f"Error parsing XML bookmarks: {e}")
+            logging.error(f"Error parsing CSV bookmarks: {e}")
         
         return bookmarks
     
-    def parse_csv_bookmarks(self, content: str) -> List[Dict[str, Any]]:
-        """Parse CSV-Bookmarks"""
-        bookmarks = []
+    # Mapping für verschiedene CSV-Formate
+    CSV_FIELD_MAPPING = {
+        'title': ['title', 'name', 'bookmark name', 'bookmark_name'],
+        'url': ['url', 'link', 'href', 'address', 'bookmark url'],
+        'category': ['category', 'folder', 'group', 'tag'],
+        'subcategory': ['subcategory', 'subfolder', 'subgroup'],
+        'description': ['description', 'note', 'comment', 'remarks']
+    }
+    
+    @classmethod
+    def _csv_columns(cls, headers: List[str]) -> Dict[str, int]:
+        """Spalten-Indizes aus der Header-Zeile bestimmen (case-insensitive)"""
+        headers = [h.strip().lower() for h in headers]
+        column_indices = {}
+        for field, possible_names in cls.CSV_FIELD_MAPPING.items():
+            for i, header in enumerate(headers):
+                if header in possible_names:
+                    column_indices[field] = i
+                    break
+        return column_indices
+    
+    @staticmethod
+    def _csv_row(row: List[str], column_indices: Dict[str, int], row_num: int) -> Optional[Dict[str, Any]]:
+        """Eine Daten-Zeile in ein Bookmark-Dict umwandeln (None wenn ohne URL)"""
+        def column(field, default):
+            index = column_indices.get(field)
+            if index is None or len(row) <= index:
+                return default
+            return row[index].strip()
+        
+        title = column('title', f"Bookmark {row_num}")
+        url = column('url', "")
+        category = column('category', "Nicht zugeordnet")
+        subcategory = column('subcategory', None)
+        description = column('description', None)
+        
+        # Validierung
+        if not url:
+            return None  # Überspringe Zeilen ohne URL
+        
+        # Füge http:// hinzu wenn Schema fehlt
+        if not url.startswith(('http://', 'https://', 'ftp://')):
+            url = 'https://' + url
         
+        return {
+            "title": title or "Ohne Titel",
+            "url": url,
+            "category": category or "Nicht zugeordnet",
+            "subcategory": subcategory if subcategory else None,
+            "description": description if description else None
+        }
+
+class NetscapeBookmarkTokenizer:
+    """Single-Pass-Tokenizer für das Netscape-Format (<DL><DT><H3>/<A>) mit echtem Ordner-Stack
+    
+    Arbeitet blockweise per feed(): unvollständige Konstrukte am Blockende bleiben im Puffer.
+    Kategorie ist der oberste Ordner, Unterkategorie der Ordner, in dem der Link direkt liegt.
+    """
+    
+    TOKEN = re.compile(r'<(/?)(dl|h3|a|dd)\b([^>]*)>', re.IGNORECASE)
+    # Ende von Titeltext: schließendes Tag oder - bei fehlendem End-Tag - das nächste Struktur-Tag
+    TEXT_END = {
+        'a': re.compile(r'</a\s*>|<(?:/?dl|dt|dd|a|h3)\b', re.IGNORECASE),
+        'h3': re.compile(r'</h3\s*>|<(?:/?dl|dt|dd|a|h3)\b', re.IGNORECASE),
+    }
+    ATTRIBUTE = re.compile(r'([\w-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))')
+    INNER_TAG = re.compile(r'<[^>]*>')
+    # Browser-Container, die nicht als Kategorie zählen
+    CONTAINER_ATTRIBUTES = ('personal_toolbar_folder', 'unfiled_bookmarks_folder')
+    
+    def __init__(self):
+        self._buffer = ""
+        self._stack = []  # Ordner pro geöffneter <DL>-Ebene (Liste von Namen, leer für Container)
+        self._folder = None  # zuletzt gelesener <H3>, wird beim nächsten <DL> geöffnet
+        self._last = None  # zuletzt gelesenes Bookmark, für eine folgende <DD>-Beschreibung
+        self._pending = []
+    
+    @classmethod
+    def _attributes(cls, raw: str) -> Dict[str, str]:
+        return {
+            match.group(1).lower(): html.unescape(
+                match.group(2) if match.group(2) is not None else
+                match.group(3) if match.group(3) is not None else match.group(4)
+            )
+            for match in cls.ATTRIBUTE.finditer(raw)
+        }
+    
+    @classmethod
+    def _text(cls, raw: str) -> str:
+        return html.unescape(cls.INNER_TAG.sub('', raw)).strip()
+    
+    @staticmethod
+    def _timestamp(value: Optional[str]) -> Optional[datetime]:
         try:
-            import csv
-            import io
+            return datetime.fromtimestamp(int(value), tz=timezone.utc) if value else None
+        except (ValueError, OverflowError, OSError):
+            return None
+    
+    @staticmethod
+    def _folder_names(name: str, attributes: Dict[str, str]) -> List[str]:
+        if any(key in attributes for key in NetscapeBookmarkTokenizer.CONTAINER_ATTRIBUTES):
+            return []
+        # Kompatibilität: "Kategorie → Unterkategorie" in einem Ordnernamen
+        if '→' in name or '->' in name:
+            parts = name.split('→') if '→' in name else name.split('->')
+            return [part.strip() for part in parts[:2]]
+        return [name]
+    
+    def _location(self):
+        path = [name for names in self._stack for name in names]
+        if not path:
+            return "Nicht zugeordnet", None
+        return path[0], (path[-1] if len(path) > 1 else None)
+    
+    def _add_link(self, attributes: Dict[str, str], text: str):
+        href = attributes.get('href', '')
+        if not href.startswith(('http://', 'https://')):
+            self._last = None
+            return
+        category, subcategory = self._location()
+        tags = [tag.strip() for tag in attributes.get('tags', '').split(',') if tag.strip()]
+        bookmark = {
+            'title': text or href,
+            'url': href,
+            'category': category,
+            'subcategory': subcategory,
+            'date_added': self._timestamp(attributes.get('add_date')),
+            'favicon': attributes.get('icon_uri') or attributes.get('icon'),
+            'tags': tags
+        }
+        self._pending.append(bookmark)
+        self._last = bookmark
+    
+    def _tokenize(self, final: bool):
+        buffer = self._buffer
+        position = 0
+        
+        while True:
+            match = self.TOKEN.search(buffer, position)
+            if not match:
+                break
+            closing, tag = match.group(1), match.group(2).lower()
             
-            # CSV-Content in StringIO für csv.reader
-            csv_file = io.StringIO(content)
-            reader = csv.reader(csv_file)
+            if closing:
+                if tag == 'dl' and self._stack:
+                    self._stack.pop()
+                position = match.end()
+                continue
             
-            # Header-Zeile lesen
-            headers = next(reader, None)
-            if not headers:
-                return bookmarks
+            if tag == 'dl':
+                self._stack.append(self._folder or [])
+                self._folder = None
+                position = match.end()
+                continue
             
-            # Headers normalisieren (case-insensitive)
-            headers = [h.strip().lower() for h in headers]
+            if tag == 'dd':
+                # Beschreibung reicht bis zum nächsten Tag
+                end = buffer.find('<', match.end())
+                if end == -1 and not final:
+                    break
+                end = len(buffer) if end == -1 else end
+                if self._last is not None:
+                    self._last['description'] = self._text(buffer[match.end():end]) or None
+                self._last = None
+                position = end
+                continue
             
-            # Mapping für verschiedene CSV-Formate
-            field_mapping = {
-                'title': ['title', 'name', 'bookmark name', 'bookmark_name'],
-                'url': ['url', 'link', 'href', 'address', 'bookmark url'],
-                'category': ['category', 'folder', 'group', 'tag'],
-                'subcategory': ['subcategory', 'subfolder', 'subgroup'],
-                'description': ['description', 'note', 'comment', 'remarks']
-            }
+            text_end = self.TEXT_END[tag].search(buffer, match.end())
+            if text_end is None and not final:
+                break
+            text_stop = text_end.start() if text_end else len(buffer)
+            text = self._text(buffer[match.end():text_stop])
+            attributes = self._attributes(match.group(3))
             
-            # Finde Spalten-Indizes
-            column_indices = {}
-            for field, possible_names in field_mapping.items():
-                for i, header in enumerate(headers):
-                    if header in possible_names:
-                        column_indices[field] = i
-                        break
+            if tag == 'h3':
+                self._folder = self._folder_names(text, attributes)
+                self._last = None
+            else:
+                self._add_link(attributes, text)
             
-            # Daten-Zeilen verarbeiten
-            for row_num, row in enumerate(reader, start=2):  # Start at 2 da Header Zeile 1 ist
-                if len(row) == 0:  # Leere Zeile überspringen
-                    continue
-                
-                try:
-                    # Extrahiere Felder basierend auf gefundenen Spalten
-                    title = row[column_indices['title']].strip() if 'title' in column_indices and len(row) > column_indices['title'] else f"Bookmark {row_num}"
-                    url = row[column_indices['url']].strip() if 'url' in column_indices and len(row) > column_indices['url'] else ""
-                    category = row[column_indices['category']].strip() if 'category' in column_indices and len(row) > column_indices['category'] else "Nicht zugeordnet"
-                    subcategory = row[column_indices['subcategory']].strip() if 'subcategory' in column_indices and len(row) > column_indices['subcategory'] else None
-                    description = row[column_indices['description']].strip() if 'description' in column_indices and len(row) > column_indices['description'] else None
-                    
-                    # Validierung
-                    if not url:
-                        continue  # Überspringe Zeilen ohne URL
-                    
-                    # Füge http:// hinzu wenn Schema fehlt
-                    if not url.startswith(('http://', 'https://', 'ftp://')):
-                        url = 'https://' + url
-                    
-                    bookmarks.append({
-                        "title": title or "Ohne Titel",
-                        "url": url,
-                        "category": category or "Nicht zugeordnet",
-                        "subcategory": subcategory if subcategory else None,
-                        "description": description if description else None
-                    })
-                    
-                except (IndexError, AttributeError) as e:
-                    logging.warning(f"Error processing CSV row {row_num}: {e}")
-                    continue
-                    
-        except Exception as e:
-            logging.error(f"Error parsing CSV bookmarks: {e}")
-        
+            # Nur ein echtes End-Tag verbrauchen, sonst ab dem Struktur-Tag weiterlesen
+            if text_end is None:
+                position = len(buffer)
+            elif text_end.group(0).startswith('</'):
+                position = text_end.end()
+            else:
+                position = text_end.start()
+        
+        # Rest behalten: ab dem ersten offenen Konstrukt bzw. einem angeschnittenen Tag
+        rest = buffer[position:]
+        if not final and not self.TOKEN.search(rest):
+            cut = rest.rfind('<')
+            rest = rest[cut:] if cut != -1 else ""
+        self._buffer = "" if final else rest
+    
+    def _drain(self) -> List[Dict[str, Any]]:
+        bookmarks, self._pending = self._pending, []
+        return bookmarks
+    
+    def feed(self, data: str) -> List[Dict[str, Any]]:
+        self._buffer += data
+        self._tokenize(final=False)
+        return self._drain()
+    
+    def close(self) -> List[Dict[str, Any]]:
+        self._tokenize(final=True)
+        return self._drain()
+
+class IncrementalXMLParser:
+    """XML blockweise über XMLPullParser parsen; verarbeitete Elemente werden sofort freigegeben"""
+    
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=("end",))
+        self._seen_bookmark = False
+        self._failed = False
+    
+    def _collect(self) -> List[Dict[str, Any]]:
+        bookmarks = []
+        for _, elem in self._parser.read_events():
+            if elem.tag == 'bookmark':
+                self._seen_bookmark = True
+                bookmark = BookmarkParser._xml_bookmark(elem)
+                elem.clear()
+            elif elem.tag == 'item' and not self._seen_bookmark:
+                # <item>-Struktur nur, solange kein <bookmark> vorkam
+                bookmark = BookmarkParser._xml_item(elem)
+                elem.clear()
+            else:
+                continue
+            if bookmark:
+                bookmarks.append(bookmark)
+        return bookmarks
+    
+    def feed(self, data: str) -> List[Dict[str, Any]]:
+        if self._failed:
+            return []
+        try:
+            self._parser.feed(data)
+        except ET.ParseError as e:
+            logging.error(f"XML Parse Error: {e}")
+            self._failed = True
+        return self._collect()
+    
+    def close(self) -> List[Dict[str, Any]]:
+        if self._failed:
+            return []
+        try:
+            self._parser.close()
+        except ET.ParseError as e:
+            logging.error(f"XML Parse Error: {e}")
+            self._failed = True
+        return self._collect()
+
+class IncrementalCSVParser:
+    """CSV blockweise parsen; Datensätze mit Zeilenumbruch in Anführungszeichen werden zusammengehalten"""
+    
+    def __init__(self):
+        self._buffer = ""
+        self._record = []
+        self._quotes = 0
+        self._column_indices = None
+        self._row_num = 1
+    
+    def _rows(self, records: List[str]) -> List[Dict[str, Any]]:
+        bookmarks = []
+        for row in csv.reader(records):
+            if self._column_indices is None:
+                # Header-Zeile
+                self._column_indices = BookmarkParser._csv_columns(row)
+                continue
+            self._row_num += 1
+            if len(row) == 0:  # Leere Zeile überspringen
+                continue
+            bookmark = BookmarkParser._csv_row(row, self._column_indices, self._row_num)
+            if bookmark:
+                bookmarks.append(bookmark)
         return bookmarks
+    
+    def _records(self, lines: List[str]) -> List[str]:
+        records = []
+        for line in lines:
+            self._record.append(line)
+            self._quotes += line.count('"')
+            # Gerade Anzahl Anführungszeichen: Datensatz ist vollständig
+            if self._quotes % 2 == 0:
+                records.append(''.join(self._record))
+                self._record = []
+                self._quotes = 0
+        return records
+    
+    def feed(self, data: str) -> List[Dict[str, Any]]:
+        lines = (self._buffer + data).split('\n')
+        self._buffer = lines.pop()
+        return self._rows(self._records([line + '\n' for line in lines]))
+    
+    def close(self) -> List[Dict[str, Any]]:
+        lines = [self._buffer] if self._buffer else []
+        self._buffer = ""
+        records = self._records(lines)
+        if self._record:
+            records.append(''.join(self._record))
+            self._record = []
+        return self._rows(records)
+
+# Blockgröße beim Einlesen großer Uploads
+IMPORT_CHUNK_SIZE = int(os.environ.get('IMPORT_CHUNK_SIZE', 1024 * 1024))
+# Worker-Prozesse für das Parsen mehrerer Dateien (Standard: Anzahl CPUs)
+IMPORT_PARSE_WORKERS = int(os.environ.get('IMPORT_PARSE_WORKERS', 0)) or None
+
+def parse_bookmark_file(content: bytes, file_type: str) -> List[Dict[str, Any]]:
+    """Eine vollständige Datei parsen - läuft in einem Worker-Prozess des Import-Pools"""
+    parser = BookmarkParser()
+    file_type = file_type.lower()
+    if file_type == 'json':
+        return parser.parse_json_bookmarks(content)
+    
+    text = content.decode('utf-8')
+    if file_type == 'html':
+        return parser.parse_html_bookmarks(text)
+    if file_type == 'xml':
+        return parser.parse_xml_bookmarks(text)
+    if file_type == 'csv':
+        return parser.parse_csv_bookmarks(text)
+    raise ValueError(f"Unsupported file type: {file_type}")
+
+class ImportPipeline:
+    """Streaming-Import: validieren, deduplizieren und per ungeordnetem insert_many in Batches schreiben"""
+    
+    BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', 1000))
+    MAX_REPORTED_ERRORS = 20
+    
+    def __init__(self, database, duplicate_detector: "DuplicateDetector", statistics_manager: "StatisticsManager"):
+        self.db = database
+        self.duplicate_detector = duplicate_detector
+        self.statistics_manager = statistics_manager
+    
+    @staticmethod
+    def build_document(data: Dict[str, Any], now: datetime) -> Optional[Dict[str, Any]]:
+        """Bookmark-Dokument direkt als dict aufbauen (Defaults wie im Bookmark-Modell), None wenn ungültig"""
+        title = data.get('title')
+        url = data.get('url')
+        if not title or not url:
+            return None
+        category = data.get('category')
+        subcategory = data.get('subcategory')
+        return {
+            "id": str(uuid.uuid4()),
+            "title": str(title),
+            "url": str(url),
+            "category": str(category) if category is not None else 'Imported',
+            "subcategory": str(subcategory) if subcategory is not None else '',
+            "date_added": data.get('date_added') or now,
+            "is_dead_link": False,
+            "is_locked": False,
+            "last_checked": None,
+            "favicon": data.get('favicon'),
+            "description": data.get('description'),
+            "tags": data.get('tags') or [],
+            "status_type": "active",
+            "url_key": canonicalize_url(str(url))
+        }
+    
+    @staticmethod
+    async def _iterate(records):
+        """Synchrone und asynchrone Datensatz-Quellen gleich behandeln"""
+        if hasattr(records, "__aiter__"):
+            async for record in records:
+                yield record
+        else:
+            for record in records:
+                yield record
+    
+    async def _flush(self, batch: List[Dict[str, Any]], report: Dict[str, Any]):
+        """Einen Batch schreiben; Fehler pro Batch sammeln statt einzeln zu loggen"""
+        report["batches"] += 1
+        try:
+            await self.db.bookmarks.insert_many(batch, ordered=False)
+            inserted = batch
+        except BulkWriteError as e:
+            write_errors = e.details.get("writeErrors", [])
+            failed = {error["index"] for error in write_errors}
+            inserted = [doc for index, doc in enumerate(batch) if index not in failed]
+            report["failed_count"] += len(failed)
+            for error in write_errors[:self.MAX_REPORTED_ERRORS - len(report["errors"])]:
+                report["errors"].append({
+                    "batch": report["batches"],
+                    "url": batch[error["index"]]["url"],
+                    "code": error.get("code"),
+                    "message": error.get("errmsg")
+                })
+        
+        report["imported_count"] += len(inserted)
+        await self.statistics_manager.record_insert(inserted)
+    
+    async def run(self, records) -> Dict[str, Any]:
+        """Datensätze aus dem Parser durchlaufen; innerhalb der Datei gewinnt das erste Vorkommen einer URL"""
+        started = time.perf_counter()
+        now = datetime.now(timezone.utc)
+        report = {
+            "imported_count": 0,
+            "total_parsed": 0,
+            "valid_bookmarks": 0,
+            "after_deduplication": 0,
+            "failed_count": 0,
+            "batches": 0,
+            "errors": []
+        }
+        seen_urls = set()
+        batch = []
+        
+        async for data in self._iterate(records):
+            report["total_parsed"] += 1
+            doc = self.build_document(data, now)
+            if doc is None:
+                continue
+            report["valid_bookmarks"] += 1
+            
+            if doc["url_key"] in seen_urls:
+                continue
+            seen_urls.add(doc["url_key"])
+            report["after_deduplication"] += 1
+            
+            batch.append(doc)
+            if len(batch) >= self.BATCH_SIZE:
+                await self._flush(batch, report)
+                batch = []
+        
+        if batch:
+            await self._flush(batch, report)
+        
+        elapsed = time.perf_counter() - started
+        report["duration_seconds"] = round(elapsed, 3)
+        report["rows_per_second"] = round(report["total_parsed"] / elapsed, 1) if elapsed > 0 else None
+        return report
 
 class LinkValidator:
     """Klasse für Link-Validierung und Dead-Link-Erkennung"""
     
+    # Status-Codes, bei denen HEAD nicht aussagekräftig ist und ein Range-GET folgt
+    HEAD_FALLBACK_STATUSES = {400, 403, 405, 406, 429, 500, 501, 502, 503}
+    
     def __init__(self):
         self.timeout = 10
         self.user_agent = "FavLink-Manager/1.0"
+        # Begrenzte Parallelität (global und pro Host) statt unbegrenztem gather
+        self.max_concurrency = int(os.environ.get('LINK_CHECK_CONCURRENCY', '64'))
+        self.per_host_limit = int(os.environ.get('LINK_CHECK_PER_HOST', '4'))
+        self.dns_cache_ttl = int(os.environ.get('LINK_CHECK_DNS_TTL', '300'))
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Gemeinsame ClientSession mit Connection-Pool und DNS-Cache (lazy erstellt)"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrency,
+                limit_per_host=self.per_host_limit,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_cache_ttl
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={'User-Agent': self.user_agent}
+            )
+        return self._session
+    
+    async def close(self):
+        """Schließt die gemeinsame Session (beim Shutdown)"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._host_semaphores.clear()
+    
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = (urlparse(url).hostname or "").lower()
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_limit)
+            self._host_semaphores[host] = semaphore
+        return semaphore
     
     async def check_link(self, url: str) -> Dict[str, Any]:
         """Überprüft einen einzelnen Link und gibt Status zurück"""
+        if not url or not url.startswith(('http://', 'https://')):
+            return {"status": "dead", "is_dead_link": True}
+        
         try:
-            async with aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=self.timeout),
-                headers={'User-Agent': self.user_agent}
-            ) as session:
+            session = await self._get_session()
+            # Timeout gilt erst ab Slot-Vergabe, Wartezeit im Pool zählt nicht als "timeout"
+            async with self._host_semaphore(url):
                 async with session.head(url, allow_redirects=True) as response:
-                    if response.status < 400:
-                        return {"status": "active", "is_dead_link": False}
-                    else:
-                        return {"status": "dead", "is_dead_link": True}
+                    status = response.status
+                
+                # Viele Server lehnen HEAD ab - Fallback auf GET mit minimalem Range
+                if status in self.HEAD_FALLBACK_STATUSES:
+                    async with session.get(url, allow_redirects=True, headers={'Range': 'bytes=0-0'}) as response:
+                        status = response.status
+            
+            if status < 400:
+                return {"status": "active", "is_dead_link": False}
+            else:
+                return {"status": "dead", "is_dead_link": True}
         except asyncio.TimeoutError:
             return {"status": "timeout", "is_dead_link": True}
         except Exception:
             return {"status": "dead", "is_dead_link": True}
     
     async def validate_bookmarks(self, bookmarks: List[Bookmark]) -> List[Bookmark]:
-        """Validiert alle Bookmarks auf Dead Links"""
-        tasks = []
+        """Validiert alle Bookmarks auf Dead Links (begrenzte Worker-Anzahl)"""
+        if not bookmarks:
+            return []
+        
+        # Hosts verschränken, damit Worker nicht alle am selben Host-Limit warten
+        pending = iter(self._interleave_by_host(bookmarks))
+        
+        async def worker():
+            for bookmark in pending:
+                await self._validate_single_bookmark(bookmark)
+        
+        worker_count = min(self.max_concurrency, len(bookmarks))
+        await asyncio.gather(*(worker() for _ in range(worker_count)))
+        return bookmarks
+    
+    def _interleave_by_host(self, bookmarks: List[Bookmark]) -> List[Bookmark]:
+        """Sortiert Bookmarks round-robin nach Host"""
+        seen_per_host: Dict[str, int] = {}
+        ranked = []
         for bookmark in bookmarks:
-            tasks.append(self._validate_single_bookmark(bookmark))
+            host = (urlparse(bookmark.url).hostname or "").lower()
+            rank = seen_per_host.get(host, 0)
+            seen_per_host[host] = rank + 1
+            ranked.append((rank, bookmark))
         
-        validated_bookmarks = await asyncio.gather(*tasks)
-        return validated_bookmarks
+        ranked.sort(key=lambda item: item[0])
+        return [bookmark for _, bookmark in ranked]
     
     async def _validate_single_bookmark(self, bookmark: Bookmark) -> Bookmark:
         """Validiert ein einzelnes Bookmark"""
@@ -490,11 +931,302 @@ class LinkValidator:
         
         return bookmark
 
+class ValidationJobManager:
+    """Link-Validierung als Hintergrund-Job mit Fortschritt und Checkpoint"""
+    
+    def __init__(self, database, validator: LinkValidator, statistics_manager: "StatisticsManager"):
+        self.db = database
+        self.validator = validator
+        self.statistics_manager = statistics_manager
+        self.batch_size = int(os.environ.get('LINK_CHECK_BATCH_SIZE', '200'))
+        self.write_chunk_size = int(os.environ.get('LINK_CHECK_WRITE_CHUNK', '500'))
+        self.recent_results_limit = 100
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.changes: Optional[ChangeTracker] = None
+        self.change_feed: Optional[ChangeFeed] = None
+    
+    def _build_query(self, stale_before: Optional[datetime]) -> Dict[str, Any]:
+        """Query für die zu prüfenden Bookmarks (alle oder nur veraltete)"""
+        if stale_before is None:
+            return {}
+        return {"$or": [
+            {"last_checked": None},
+            {"last_checked": {"$lt": stale_before}}
+        ]}
+    
+    def _public_job(self, job: dict) -> Dict[str, Any]:
+        job = {k: v for k, v in job.items() if k != "_id"}
+        total = job.get("total", 0)
+        job["progress"] = round((job.get("total_checked", 0) / total) * 100, 1) if total > 0 else 100.0
+        return job
+    
+    def _running_job_id(self) -> Optional[str]:
+        for job_id, task in self._tasks.items():
+            if not task.done():
+                return job_id
+        return None
+    
+    async def start_job(self, mode: str = "all", max_age_hours: Optional[float] = None, write_chunk_size: Optional[int] = None) -> Dict[str, Any]:
+        """Startet einen neuen Validierungs-Job und gibt sofort die Job-ID zurück"""
+        if mode not in ("all", "stale"):
+            raise HTTPException(status_code=400, detail=f"Unsupported validation mode: {mode}. Supported modes: all, stale")
+        
+        if write_chunk_size is not None and write_chunk_size < 1:
+            raise HTTPException(status_code=400, detail="write_chunk_size must be at least 1")
+        
+        # Nur ein Lauf gleichzeitig - laufenden Job zurückgeben statt doppelt zu prüfen
+        running_job_id = self._running_job_id()
+        if running_job_id:
+            return await self.get_job(running_job_id)
+        
+        stale_before = None
+        if mode == "stale":
+            max_age_hours = max_age_hours if max_age_hours is not None else 24
+            stale_before = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
+        
+        total = await self.db.bookmarks.count_documents(self._build_query(stale_before))
+        
+        job = {
+            "id": str(uuid.uuid4()),
+            "status": "running",
+            "mode": mode,
+            "max_age_hours": max_age_hours,
+            "stale_before": stale_before,
+            "total": total,
+            "total_checked": 0,
+            "dead_links_found": 0,
+            "write_chunk_size": write_chunk_size or self.write_chunk_size,
+            "write_stats": {"chunks": 0, "matched": 0, "modified": 0},
+            "checkpoint": None,
+            "recent_results": [],
+            "error": None,
+            "created_at": datetime.now(timezone.utc),
+            "updated_at": datetime.now(timezone.utc),
+            "finished_at": None
+        }
+        await self.db.validation_jobs.insert_one(job)
+        self._launch(job["id"])
+        
+        return self._public_job(job)
+    
+    async def resume_job(self, job_id: str) -> Dict[str, Any]:
+        """Setzt einen unterbrochenen Job ab dem letzten Checkpoint fort"""
+        job = await self.db.validation_jobs.find_one({"id": job_id})
+        if not job:
+            raise HTTPException(status_code=404, detail="Validation job not found")
+        
+        if job["status"] == "completed":
+            raise HTTPException(status_code=400, detail="Validation job is already completed")
+        
+        task = self._tasks.get(job_id)
+        if task is None or task.done():
+            running_job_id = self._running_job_id()
+            if running_job_id:
+                raise HTTPException(status_code=409, detail=f"Another validation job is running: {running_job_id}")
+            
+            await self.db.validation_jobs.update_one(
+                {"id": job_id},
+                {"$set": {"status": "running", "error": None, "updated_at": datetime.now(timezone.utc)}}
+            )
+            self._launch(job_id)
+        
+        return await self.get_job(job_id)
+    
+    async def get_job(self, job_id: str) -> Dict[str, Any]:
+        """Fortschritt und Teilergebnisse eines Jobs abrufen"""
+        job = await self.db.validation_jobs.find_one({"id": job_id})
+        if not job:
+            raise HTTPException(status_code=404, detail="Validation job not found")
+        return self._public_job(job)
+    
+    async def list_jobs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Letzte Validierungs-Jobs (ohne Teilergebnisse)"""
+        jobs = await self.db.validation_jobs.find(
+            {}, {"recent_results": 0}
+        ).sort("created_at", -1).limit(limit).to_list(limit)
+        return [self._public_job(job) for job in jobs]
+    
+    async def mark_interrupted_jobs(self):
+        """Beim Start: Jobs eines beendeten Prozesses als unterbrochen markieren"""
+        result = await self.db.validation_jobs.update_many(
+            {"status": "running"},
+            {"$set": {"status": "interrupted", "updated_at": datetime.now(timezone.utc)}}
+        )
+        if result.modified_count:
+            logging.info(f"Marked {result.modified_count} validation jobs as interrupted")
+    
+    def _launch(self, job_id: str):
+        self._tasks[job_id] = asyncio.create_task(self._run_job(job_id))
+    
+    async def _run_job(self, job_id: str):
+        """Verarbeitet die Bookmarks batchweise in id-Reihenfolge ab dem Checkpoint"""
+        try:
+            job = await self.db.validation_jobs.find_one({"id": job_id})
+            query = self._build_query(job.get("stale_before"))
+            checkpoint = job.get("checkpoint")
+            chunk_size = job.get("write_chunk_size") or self.write_chunk_size
+            
+            while True:
+                batch_query = query
+                if checkpoint is not None:
+                    batch_query = {"$and": [query, {"id": {"$gt": checkpoint}}]}
+                
+                docs = await self.db.bookmarks.find(batch_query).sort("id", 1).limit(self.batch_size).to_list(self.batch_size)
+                if not docs:
+                    break
+                
+                bookmarks = [Bookmark(**doc) for doc in docs]
+                await self.validator.validate_bookmarks(bookmarks)
+                write_stats = await self._store_results(bookmarks, chunk_size)
+                await self.statistics_manager.record_change(docs, [b.dict() for b in bookmarks])
+                
+                checkpoint = docs[-1]["id"]
+                dead_count = sum(1 for b in bookmarks if b.is_dead_link)
+                
+                await self.db.validation_jobs.update_one(
+                    {"id": job_id},
+                    {
+                        "$set": {"checkpoint": checkpoint, "updated_at": datetime.now(timezone.utc)},
+                        "$inc": {
+                            "total_checked": len(bookmarks),
+                            "dead_links_found": dead_count,
+                            "write_stats.chunks": write_stats["chunks"],
+                            "write_stats.matched": write_stats["matched"],
+                            "write_stats.modified": write_stats["modified"]
+                        },
+                        "$push": {"recent_results": {
+                            "$each": [
+                                {"id": b.id, "url": b.url, "status_type": b.status_type, "is_dead_link": b.is_dead_link}
+                                for b in bookmarks
+                            ],
+                            "$slice": -self.recent_results_limit
+                        }}
+                    }
+                )
+            
+            await self.db.validation_jobs.update_one(
+                {"id": job_id},
+                {"$set": {
+                    "status": "completed",
+                    "updated_at": datetime.now(timezone.utc),
+                    "finished_at": datetime.now(timezone.utc)
+                }}
+            )
+        except asyncio.CancelledError:
+            await self.db.validation_jobs.update_one(
+                {"id": job_id},
+                {"$set": {"status": "interrupted", "updated_at": datetime.now(timezone.utc)}}
+            )
+            raise
+        except Exception as e:
+            logging.error(f"Validation job {job_id} failed: {e}")
+            await self.db.validation_jobs.update_one(
+                {"id": job_id},
+                {"$set": {"status": "failed", "error": str(e), "updated_at": datetime.now(timezone.utc)}}
+            )
+    
+    async def _store_results(self, bookmarks: List[Bookmark], chunk_size: int) -> Dict[str, int]:
+        """Validierungsergebnisse in bulk_write Chunks speichern (nur Status-Felder)"""
+        stats = {"chunks": 0, "matched": 0, "modified": 0}
+        
+        for start in range(0, len(bookmarks), chunk_size):
+            items = [
+                {"id": bookmark.id, "fields": {
+                    "is_dead_link": bookmark.is_dead_link,
+                    "status_type": bookmark.status_type,
+                    "last_checked": bookmark.last_checked
+                }}
+                for bookmark in bookmarks[start:start + chunk_size]
+            ]
+            operations = [UpdateOne({"id": item["id"]}, {"$set": item["fields"]}) for item in items]
+            result = await self.db.bookmarks.bulk_write(operations, ordered=False)
+            stats["chunks"] += 1
+            stats["matched"] += result.matched_count
+            stats["modified"] += result.modified_count
+            if self.change_feed:
+                self.change_feed.publish("bookmarks", "update", items=items)
+        
+        if self.changes and stats["modified"]:
+            self.changes.bump("bookmarks")
+        return stats
+    
+    async def shutdown(self):
+        """Laufende Jobs beim Shutdown abbrechen (Checkpoint bleibt erhalten)"""
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+# Query-Parameter, die nur der Kampagnen-Verfolgung dienen
+TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid", "_hsenc", "_hsmi"}
+TRACKING_PREFIXES = ("utm_",)
+PERCENT_ESCAPE = re.compile(r'%([0-9A-Fa-f]{2})')
+UNRESERVED = set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~")
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+def _normalize_percent(value: str) -> str:
+    """Prozent-Kodierung vereinheitlichen: unreservierte Zeichen dekodieren, Rest groß kodieren"""
+    def replace(match):
+        char = chr(int(match.group(1), 16))
+        return char if char in UNRESERVED else f"%{match.group(1).upper()}"
+    return quote(PERCENT_ESCAPE.sub(replace, value), safe="/:@!$&'()*+,;=%-._~")
+
+def canonicalize_url(url: str) -> str:
+    """Kanonische Form einer URL als Duplikat-Schlüssel (url_key)
+    
+    http/https, www., Standard-Ports, Fragmente, Tracking-Parameter, Parameter-Reihenfolge,
+    Prozent-Kodierung und abschließende Slashes werden vereinheitlicht. Pfad und Query
+    bleiben case-sensitiv; nur Schema und Host werden kleingeschrieben.
+    """
+    raw = (url or "").strip()
+    try:
+        parts = urlsplit(raw)
+        port = parts.port
+    except ValueError:
+        return raw
+    
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return raw
+    
+    host = parts.hostname.rstrip('.')
+    if host.startswith('www.'):
+        host = host[4:]
+    try:
+        host = host.encode('idna').decode('ascii')
+    except UnicodeError:
+        pass
+    if ':' in host:
+        host = f"[{host}]"  # IPv6
+    # Nur den Standard-Port des eigenen Schemas weglassen (http://host:443 ist ein anderer Dienst)
+    if port and port != DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+    
+    path = _normalize_percent(parts.path).rstrip('/')
+    
+    params = []
+    for param in parts.query.split('&'):
+        if not param:
+            continue
+        name = unquote(param.split('=', 1)[0]).lower()
+        if name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES):
+            continue
+        params.append(_normalize_percent(param))
+    query = '?' + '&'.join(sorted(params)) if params else ''
+    
+    # Fragmente nur als Client-Routen ("#/...", "#!...") behalten
+    fragment = parts.fragment
+    fragment = '#' + fragment if fragment.startswith(('/', '!')) else ''
+    
+    return f"{host}{path}{query}{fragment}"
+
 class DuplicateDetector:
     """Klasse für Duplikat-Erkennung"""
     
-    def __init__(self):
-        pass
+    BACKFILL_CHUNK_SIZE = 1000
+    
+    def __init__(self, database=None):
+        self.db = database
     
     def find_duplicates(self, bookmarks: List[Bookmark]) -> List[List[Bookmark]]:
         """Findet Duplikate basierend auf URL"""
@@ -511,12 +1243,7 @@ class DuplicateDetector:
     
     def _normalize_url(self, url: str) -> str:
         """Normalisiert URL für Duplikat-Vergleich"""
-        normalized = url.lower().rstrip('/')
-        if normalized.startswith('https://www.'):
-            normalized = normalized.replace('https://www.', 'https://')
-        elif normalized.startswith('http://www.'):
-            normalized = normalized.replace('http://www.', 'http://')
-        return normalized
+        return canonicalize_url(url)
     
     def remove_duplicates(self, bookmarks: List[Bookmark]) -> List[Bookmark]:
         """Entfernt Duplikate und behält das neueste"""
@@ -534,62 +1261,397 @@ class DuplicateDetector:
         """Normalisiert URL für Duplikat-Vergleich (public method)"""
         return self._normalize_url(url)
     
-    async def find_and_mark_duplicates(self):
-        """Duplikate finden und mit 'duplicate' Status markieren"""
-        bookmarks = await db.bookmarks.find({}).to_list(100000)
+    # Felder pro Bookmark in einer Duplikat-Gruppe: Anzeige im Dry-Run und Statistik-Deltas
+    GROUP_FIELDS = ("id", "title", "url", "category", "subcategory", "status_type", "is_locked")
+    
+    async def duplicate_groups(self) -> List[List[Dict[str, Any]]]:
+        """Duplikat-Gruppen in einer $group-Aggregation auf url_key (ältestes Bookmark zuerst)"""
+        groups = await self.db.bookmarks.aggregate([
+            {"$match": {"url_key": {"$type": "string"}}},
+            {"$sort": {"url_key": 1, "date_added": 1, "id": 1}},
+            {"$group": {
+                "_id": "$url_key",
+                "count": {"$sum": 1},
+                "bookmarks": {"$push": {field: f"${field}" for field in self.GROUP_FIELDS}}
+            }},
+            {"$match": {"count": {"$gt": 1}}},
+            {"$sort": {"_id": 1}}
+        ], allowDiskUse=True).to_list(None)
+        return [group["bookmarks"] for group in groups]
+    
+    async def bulk_by_ids(self, operation, ids: List[str], update: Optional[dict] = None) -> int:
+        """UpdateMany/DeleteMany über id-Listen als ein einziges bulk_write (ids in Blöcken)"""
+        if not ids:
+            return 0
+        chunks = [ids[i:i + self.BACKFILL_CHUNK_SIZE] for i in range(0, len(ids), self.BACKFILL_CHUNK_SIZE)]
+        if operation is DeleteMany:
+            requests = [DeleteMany({"id": {"$in": chunk}}) for chunk in chunks]
+        else:
+            requests = [UpdateMany({"id": {"$in": chunk}}, update) for chunk in chunks]
+        result = await self.db.bookmarks.bulk_write(requests, ordered=False)
+        return result.deleted_count if operation is DeleteMany else result.modified_count
+    
+    @staticmethod
+    def describe_groups(groups: List[List[Dict[str, Any]]], keep_newest: bool) -> List[Dict[str, Any]]:
+        """Gruppen für den Dry-Run aufbereiten: welches Bookmark bleibt, welche wären betroffen"""
+        described = []
+        for group in groups:
+            keep = group[-1] if keep_newest else group[0]
+            described.append({
+                "url_key": canonicalize_url(keep.get("url", "")),
+                "keep": {"id": keep["id"], "title": keep.get("title"), "url": keep.get("url")},
+                "duplicates": [
+                    {"id": b["id"], "title": b.get("title"), "url": b.get("url")}
+                    for b in group if b is not keep
+                ]
+            })
+        return described
+    
+    async def find_and_mark_duplicates(self, dry_run: bool = False):
+        """Duplikate finden und mit 'duplicate' Status markieren (das älteste bleibt unmarkiert)"""
+        duplicate_groups = await self.duplicate_groups()
         
-        # Gruppiere Bookmarks nach normalisierter URL
-        url_groups = {}
-        for bookmark in bookmarks:
-            normalized_url = self.normalize_url(bookmark['url'])
-            if normalized_url not in url_groups:
-                url_groups[normalized_url] = []
-            url_groups[normalized_url].append(bookmark)
-        
-        # Finde Gruppen mit mehr als einem Bookmark (Duplikate)
-        duplicate_groups = []
-        for url, bookmark_group in url_groups.items():
-            if len(bookmark_group) > 1:
-                duplicate_groups.append(bookmark_group)
-                
-                # Markiere alle außer dem ersten als Duplikat
-                for bookmark in bookmark_group[1:]:  # Überspringe den ersten
-                    await db.bookmarks.update_one(
-                        {"id": bookmark['id']},
-                        {"$set": {"status_type": "duplicate"}}
-                    )
+        if not dry_run:
+            ids = [bookmark["id"] for group in duplicate_groups for bookmark in group[1:]]
+            await self.bulk_by_ids(UpdateMany, ids, {"$set": {"status_type": "duplicate"}})
         
         return duplicate_groups
+    
+    async def backfill_url_keys(self, rebuild: bool = False) -> Dict[str, Any]:
+        """url_key für Bookmarks ohne Schlüssel (oder bei rebuild für alle) berechnen"""
+        query = {} if rebuild else {"url_key": {"$exists": False}}
+        updated = 0
+        operations = []
+        
+        async for bookmark in self.db.bookmarks.find(query, {"_id": 0, "id": 1, "url": 1, "url_key": 1}):
+            url_key = canonicalize_url(bookmark.get("url", ""))
+            if bookmark.get("url_key") == url_key:
+                continue
+            operations.append(UpdateOne({"id": bookmark["id"]}, {"$set": {"url_key": url_key}}))
+            if len(operations) >= self.BACKFILL_CHUNK_SIZE:
+                updated += (await self.db.bookmarks.bulk_write(operations, ordered=False)).modified_count
+                operations = []
+        if operations:
+            updated += (await self.db.bookmarks.bulk_write(operations, ordered=False)).modified_count
+        
+        if updated:
+            logging.info(f"Backfilled url_key for {updated} bookmarks")
+        return {"updated_count": updated, "message": f"Updated url_key for {updated} bookmarks"}
 
-class ExportManager:
-    """Klasse für Export-Funktionen"""
+class NearDuplicateDetector:
+    """Near-Duplikate (Mirror, AMP, Mobil-Subdomain) per MinHash-Signaturen und LSH-Buckets"""
     
-    def __init__(self):
-        pass
+    NUM_PERM = 64
+    PRIME = (1 << 31) - 1
+    # Zeilen pro LSH-Band; gewählt wird die größte Bandbreite, deren Schwelle unter der gewünschten liegt
+    ROW_OPTIONS = (8, 4, 2)
+    # Übervolle Buckets (z.B. identische Allerwelts-Titel) nicht paarweise vergleichen
+    MAX_BUCKET_SIZE = 50
+    HOST_PREFIXES = {"www", "m", "mobile", "amp"}
+    STOP_TOKENS = {"http", "https", "www", "html", "htm", "php", "aspx", "index", "amp"}
+    TOKEN = re.compile(r'\w+')
     
-    def export_to_xml(self, bookmarks: List[Bookmark]) -> str:
-        """Exportiert Bookmarks zu XML"""
-        root = ET.Element("bookmarks")
-        root.set("version", "1.0")
-        root.set("generated", datetime.now(timezone.utc).isoformat())
-        
-        for bookmark in bookmarks:
-            bookmark_elem = ET.SubElement(root, "bookmark")
-            bookmark_elem.set("id", bookmark.id)
-            
-            ET.SubElement(bookmark_elem, "title").text = bookmark.title
-            ET.SubElement(bookmark_elem, "url").text = bookmark.url
-            ET.SubElement(bookmark_elem, "category").text = bookmark.category
-            if bookmark.subcategory:
-                ET.SubElement(bookmark_elem, "subcategory").text = bookmark.subcategory
-            ET.SubElement(bookmark_elem, "date_added").text = bookmark.date_added.isoformat()
-            ET.SubElement(bookmark_elem, "is_dead_link").text = str(bookmark.is_dead_link).lower()
-            if bookmark.last_checked:
-                ET.SubElement(bookmark_elem, "last_checked").text = bookmark.last_checked.isoformat()
-        
-        return ET.tostring(root, encoding='unicode', xml_declaration=True)
-    
-    def export_to_csv(self, bookmarks: List[Bookmark]) -> str:
+    def __init__(self, database, seed: int = 1):
+        self.db = database
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, self.PRIME, self.NUM_PERM, dtype=np.uint64)
+        self.b = rng.integers(0, self.PRIME, self.NUM_PERM, dtype=np.uint64)
+    
+    def _features(self, title: str, url: str) -> set:
+        """Tokens und Bigramme aus Titel, Host und URL-Pfad"""
+        try:
+            parts = urlsplit(url or "")
+            hostname = parts.hostname or ""
+            path = unquote(parts.path)
+        except ValueError:
+            hostname, path = "", url or ""
+        
+        host_tokens = [label for label in hostname.split('.')[:-1] if label not in self.HOST_PREFIXES]
+        path_tokens = [t for t in self.TOKEN.findall(path.lower()) if t not in self.STOP_TOKENS]
+        title_tokens = self.TOKEN.findall((title or "").lower())
+        
+        features = {f"h:{token}" for token in host_tokens}
+        for prefix, tokens in (("p", path_tokens), ("t", title_tokens)):
+            features.update(f"{prefix}:{token}" for token in tokens)
+            features.update(f"{prefix}:{first} {second}" for first, second in zip(tokens, tokens[1:]))
+        return features
+    
+    @staticmethod
+    @lru_cache(maxsize=1 << 16)
+    def _feature_hash(feature: str) -> int:
+        # Prozessübergreifend stabil (im Gegensatz zu hash()); häufige Tokens kommen aus dem Cache
+        return int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), 'big') % NearDuplicateDetector.PRIME
+    
+    def signature(self, title: str, url: str) -> Optional[np.ndarray]:
+        """MinHash-Signatur (NUM_PERM Werte) oder None ohne verwertbare Tokens"""
+        features = self._features(title, url)
+        if not features:
+            return None
+        hashes = np.fromiter(map(self._feature_hash, features), dtype=np.uint64, count=len(features))
+        # (a*x + b) mod p bleibt mit p < 2^31 im uint64-Bereich
+        return ((np.outer(hashes, self.a) + self.b) % self.PRIME).min(axis=0)
+    
+    def _rows_per_band(self, threshold: float) -> int:
+        for rows in self.ROW_OPTIONS:
+            bands = self.NUM_PERM // rows
+            if (1 / bands) ** (1 / rows) <= threshold * 0.9:
+                return rows
+        return self.ROW_OPTIONS[-1]
+    
+    def _similar_pairs(self, docs: List[Dict[str, Any]], threshold: float) -> Dict[str, Any]:
+        """Kandidaten über LSH-Buckets sammeln und per Signatur-Übereinstimmung prüfen (CPU, im Thread)"""
+        indexed = []
+        signatures = []
+        for doc in docs:
+            signature = self.signature(doc.get("title", ""), doc.get("url", ""))
+            if signature is not None:
+                indexed.append(doc)
+                signatures.append(signature)
+        if len(signatures) < 2:
+            return {"candidates_checked": 0, "pairs": []}
+        matrix = np.vstack(signatures)
+        
+        rows = self._rows_per_band(threshold)
+        candidates = set()
+        for start in range(0, self.NUM_PERM, rows):
+            buckets = {}
+            for index, band in enumerate(matrix[:, start:start + rows]):
+                buckets.setdefault(band.tobytes(), []).append(index)
+            for members in buckets.values():
+                if 1 < len(members) <= self.MAX_BUCKET_SIZE:
+                    candidates.update(
+                        (members[i], members[j]) for i in range(len(members)) for j in range(i + 1, len(members))
+                    )
+        
+        pairs = []
+        for first, second in candidates:
+            # Exakte Duplikate (gleicher url_key) übernimmt der DuplicateDetector
+            if indexed[first].get("url_key") and indexed[first].get("url_key") == indexed[second].get("url_key"):
+                continue
+            similarity = float(np.mean(matrix[first] == matrix[second]))
+            if similarity >= threshold:
+                pairs.append((similarity, first, second))
+        
+        pairs.sort(key=lambda pair: (-pair[0], indexed[pair[1]]["id"], indexed[pair[2]]["id"]))
+        return {
+            "candidates_checked": len(candidates),
+            "pairs": [
+                {"similarity": round(similarity, 3), "bookmarks": [indexed[first], indexed[second]]}
+                for similarity, first, second in pairs
+            ]
+        }
+    
+    async def find_near_duplicates(self, threshold: float = 0.7, limit: int = 100) -> Dict[str, Any]:
+        """Ähnliche Bookmark-Paare oberhalb der Schwelle (geschätzte Jaccard-Ähnlichkeit)"""
+        projection = {"_id": 0, "id": 1, "title": 1, "url": 1, "url_key": 1, "category": 1, "subcategory": 1}
+        docs = [doc async for doc in self.db.bookmarks.find({}, projection)]
+        
+        result = await asyncio.to_thread(self._similar_pairs, docs, threshold)
+        return {
+            "threshold": threshold,
+            "bookmarks_scanned": len(docs),
+            "candidates_checked": result["candidates_checked"],
+            "pair_count": len(result["pairs"]),
+            "pairs": result["pairs"][:limit]
+        }
+
+class _ChunkSink:
+    """Nicht-seekbares Schreibziel für zipfile, dessen Inhalt blockweise abgeholt wird"""
+    
+    def __init__(self):
+        self._chunks: List[bytes] = []
+    
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self):
+        pass
+    
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+class ExportManager:
+    """Klasse für Export-Funktionen - alle Exporter sind Generatoren über den Motor-Cursor"""
+    
+    # Format -> (Methode, Media-Type, Dateiendung)
+    FORMATS = {
+        "xml": ("export_to_xml", "application/xml", "xml"),
+        "csv": ("export_to_csv", "text/csv", "csv"),
+        "html": ("export_to_html", "text/html", "html"),
+        "json": ("export_to_json", "application/json", "json"),
+    }
+    # Kompression -> (Media-Type, Dateiendung)
+    COMPRESSIONS = {
+        "gzip": ("application/gzip", "gz"),
+        "zstd": ("application/zstd", "zst"),
+    }
+    PROJECTION = {"_id": 0, "id": 1, "title": 1, "url": 1, "category": 1, "subcategory": 1,
+                  "date_added": 1, "is_dead_link": 1, "last_checked": 1}
+    SPOOL_BLOCK_SIZE = 1024 * 1024
+    
+    def __init__(self, database=None):
+        self.db = database
+    
+    def export_cursor(self, category: Optional[str] = None):
+        """Cursor nach Kategorie sortiert, damit HTML/JSON Ordner ohne Zwischenspeicher schreiben können"""
+        if category:
+            query, sort = {"category": category}, [("date_added", 1), ("id", 1)]
+        else:
+            query, sort = {}, [("category", 1), ("date_added", 1), ("id", 1)]
+        return self.db.bookmarks.find(query, self.PROJECTION, batch_size=STREAM_BATCH_SIZE).sort(sort)
+    
+    def stream(self, export_format: str, category: Optional[str] = None, compression: Optional[str] = None):
+        """(Chunk-Generator, Media-Type, Dateiendung) für ein Format; ungültige Optionen -> 400"""
+        export_format = export_format.lower()
+        compression = compression.lower() if compression else None
+        if compression and compression not in self.COMPRESSIONS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unsupported compression: {compression}. Supported: gzip, zstd"
+            )
+        if compression == "zstd" and zstandard is None:
+            raise HTTPException(status_code=400, detail="zstd compression requires the zstandard package")
+        
+        if export_format == "bundle":
+            if compression:
+                raise HTTPException(status_code=400, detail="Bundle exports are already ZIP-compressed")
+            return self.export_bundle(category), "application/zip", "zip"
+        
+        spec = self.FORMATS.get(export_format)
+        if not spec:
+            raise HTTPException(
+                status_code=400, 
+                detail=f"Unsupported export format: {export_format}. Supported formats: XML, CSV, HTML, JSON, BUNDLE"
+            )
+        method, media_type, extension = spec
+        chunks = getattr(self, method)(self.export_cursor(category))
+        if not compression:
+            return chunks, media_type, extension
+        compressed_type, suffix = self.COMPRESSIONS[compression]
+        return self.compress(chunks, compression), compressed_type, f"{extension}.{suffix}"
+    
+    @staticmethod
+    async def compress(chunks, compression: str):
+        """Text-Chunks im Stream komprimieren (gzip über zlib, zstd über zstandard)"""
+        if compression == "zstd":
+            compressor = zstandard.ZstdCompressor(level=3).compressobj()
+        else:
+            compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31 = gzip-Header
+        async for chunk in chunks:
+            data = compressor.compress(chunk.encode("utf-8"))
+            if data:
+                yield data
+        yield compressor.flush()
+    
+    async def export_bundle(self, category: Optional[str] = None):
+        """Alle vier Formate in einem Durchlauf über den Cursor als ZIP streamen.
+        
+        Die Exporter laufen nebeneinander über begrenzte Queues und schreiben in temporäre
+        Dateien; ein ZIP-Stream kann nur einen Eintrag zur Zeit schreiben, deshalb folgen
+        die Einträge danach nacheinander."""
+        spools = {}
+        try:
+            queues = {}
+            for export_format in self.FORMATS:
+                spools[export_format] = tempfile.TemporaryFile()
+                queues[export_format] = asyncio.Queue(maxsize=4)
+            
+            async def produce():
+                # Blockweise verteilen, damit die Queues nicht pro Dokument umschalten
+                batch = []
+                async for bookmark in self.export_cursor(category):
+                    batch.append(bookmark)
+                    if len(batch) >= STREAM_FLUSH_LINES:
+                        for queue in queues.values():
+                            await queue.put(batch)
+                        batch = []
+                for queue in queues.values():
+                    if batch:
+                        await queue.put(batch)
+                    await queue.put(None)
+            
+            async def consume(export_format: str):
+                async def documents():
+                    while (batch := await queues[export_format].get()) is not None:
+                        for bookmark in batch:
+                            yield bookmark
+                
+                spool = spools[export_format]
+                async for chunk in getattr(self, self.FORMATS[export_format][0])(documents()):
+                    spool.write(chunk.encode("utf-8"))
+            
+            tasks = [asyncio.ensure_future(produce())]
+            tasks += [asyncio.ensure_future(consume(export_format)) for export_format in self.FORMATS]
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                # Bei Fehler oder Abbruch nicht an vollen Queues hängen bleiben
+                for task in tasks:
+                    task.cancel()
+            
+            sink = _ChunkSink()
+            with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as zip_file:
+                for export_format, spool in spools.items():
+                    spool.seek(0)
+                    with zip_file.open(f"bookmarks.{self.FORMATS[export_format][2]}", "w", force_zip64=True) as entry:
+                        while block := spool.read(self.SPOOL_BLOCK_SIZE):
+                            entry.write(block)
+                            yield sink.drain()
+            yield sink.drain()
+        finally:
+            for spool in spools.values():
+                spool.close()
+    
+    @staticmethod
+    def _date(value) -> Optional[datetime]:
+        if isinstance(value, str):
+            try:
+                return datetime.fromisoformat(value)
+            except ValueError:
+                return None
+        return value if isinstance(value, datetime) else None
+    
+    @staticmethod
+    async def _grouped(bookmarks, default_category: str):
+        """(Kategorie, Bookmark) - setzt voraus, dass der Cursor nach Kategorie sortiert ist"""
+        async for bookmark in bookmarks:
+            yield bookmark.get("category") or default_category, bookmark
+    
+    async def export_to_xml(self, bookmarks):
+        """Exportiert Bookmarks zu XML"""
+        generated = html.escape(datetime.now(timezone.utc).isoformat())
+        yield f"<?xml version='1.0' encoding='UTF-8'?>\n<bookmarks version=\"1.0\" generated=\"{generated}\">"
+        
+        chunk = []
+        async for bookmark in bookmarks:
+            bookmark_elem = ET.Element("bookmark")
+            bookmark_elem.set("id", str(bookmark.get("id", "")))
+            
+            ET.SubElement(bookmark_elem, "title").text = bookmark.get("title")
+            ET.SubElement(bookmark_elem, "url").text = bookmark.get("url")
+            ET.SubElement(bookmark_elem, "category").text = bookmark.get("category")
+            if bookmark.get("subcategory"):
+                ET.SubElement(bookmark_elem, "subcategory").text = bookmark["subcategory"]
+            date_added = self._date(bookmark.get("date_added"))
+            if date_added:
+                ET.SubElement(bookmark_elem, "date_added").text = date_added.isoformat()
+            ET.SubElement(bookmark_elem, "is_dead_link").text = str(bool(bookmark.get("is_dead_link"))).lower()
+            last_checked = self._date(bookmark.get("last_checked"))
+            if last_checked:
+                ET.SubElement(bookmark_elem, "last_checked").text = last_checked.isoformat()
+            
+            chunk.append(ET.tostring(bookmark_elem, encoding='unicode'))
+            if len(chunk) >= STREAM_FLUSH_LINES:
+                yield "".join(chunk)
+                chunk = []
+        
+        chunk.append("</bookmarks>")
+        yield "".join(chunk)
+    
+    async def export_to_csv(self, bookmarks):
         """Exportiert Bookmarks zu CSV"""
         output = io.StringIO()
         writer = csv.writer(output)
@@ -601,136 +1663,841 @@ class ExportManager:
         ])
         
         # Data
-        for bookmark in bookmarks:
+        rows = 0
+        async for bookmark in bookmarks:
+            date_added = self._date(bookmark.get("date_added"))
+            last_checked = self._date(bookmark.get("last_checked"))
             writer.writerow([
-                bookmark.id,
-                bookmark.title,
-                bookmark.url,
-                bookmark.category,
-                bookmark.subcategory or '',
-                bookmark.date_added.isoformat(),
-                bookmark.is_dead_link,
-                bookmark.last_checked.isoformat() if bookmark.last_checked else ''
+                bookmark.get("id", ""),
+                bookmark.get("title", ""),
+                bookmark.get("url", ""),
+                bookmark.get("category", ""),
+                bookmark.get("subcategory") or '',
+                date_added.isoformat() if date_added else '',
+                bool(bookmark.get("is_dead_link")),
+                last_checked.isoformat() if last_checked else ''
             ])
+            rows += 1
+            if rows % STREAM_FLUSH_LINES == 0:
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
         
-        output.seek(0)
-        return output.getvalue()
+        yield output.getvalue()
     
-    def export_to_html(self, bookmarks: List[Bookmark]) -> str:
+    async def export_to_html(self, bookmarks):
         """Exportiert Bookmarks zu HTML (Browser-kompatibel)"""
-        html_template = '''<!DOCTYPE NETSCAPE-Bookmark-file-1>
+        yield '''<!DOCTYPE NETSCAPE-Bookmark-file-1>
 <META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">
 <TITLE>Bookmarks</TITLE>
 <H1>Bookmarks</H1>
 <DL><p>
-{folders}
-</DL><p>'''
-        
-        # Organisiere Bookmarks nach Kategorien
-        categories = {}
-        for bookmark in bookmarks:
-            category = bookmark.category or "Andere"
-            if category not in categories:
-                categories[category] = []
-            categories[category].append(bookmark)
-        
-        folders_html = ""
-        for category_name, category_bookmarks in categories.items():
-            folders_html += f'    <DT><H3>{category_name}</H3>\n'
-            folders_html += '    <DL><p>\n'
-            
-            for bookmark in category_bookmarks:
-                # Zeitstempel in Unix-Format für Browser-Kompatibilität
-                timestamp = int(bookmark.date_added.timestamp())
-                folders_html += f'        <DT><A HREF="{bookmark.url}" ADD_DATE="{timestamp}">{bookmark.title}</A>\n'
+'''
+        
+        # Ordner werden beim Kategoriewechsel im sortierten Cursor geschlossen
+        chunk = []
+        current = None
+        async for category_name, bookmark in self._grouped(bookmarks, "Andere"):
+            if category_name != current:
+                if current is not None:
+                    chunk.append('    </DL><p>\n')
+                chunk.append(f'    <DT><H3>{html.escape(category_name)}</H3>\n')
+                chunk.append('    <DL><p>\n')
+                current = category_name
             
-            folders_html += '    </DL><p>\n'
-        
-        return html_template.format(folders=folders_html)
+            # Zeitstempel in Unix-Format für Browser-Kompatibilität
+            date_added = self._date(bookmark.get("date_added"))
+            timestamp = int(date_added.timestamp()) if date_added else 0
+            chunk.append(f'        <DT><A HREF="{html.escape(bookmark.get("url") or "")}" ADD_DATE="{timestamp}">'
+                         f'{html.escape(bookmark.get("title") or "")}</A>\n')
+            if len(chunk) >= STREAM_FLUSH_LINES:
+                yield "".join(chunk)
+                chunk = []
+        
+        if current is not None:
+            chunk.append('    </DL><p>\n')
+        chunk.append('</DL><p>')
+        yield "".join(chunk)
     
-    def export_to_json(self, bookmarks: List[Bookmark]) -> str:
+    @staticmethod
+    def _json_block(value: Dict[str, Any], depth: int) -> List[str]:
+        """Eingerücktes JSON, am children-Platzhalter geteilt (Kopf, Ende)"""
+        text = json.dumps(value, indent=2, ensure_ascii=False)
+        text = "\n".join(" " * depth + line if i else line for i, line in enumerate(text.split("\n")))
+        return text.split('"__children__"')
+    
+    async def export_to_json(self, bookmarks):
         """Exportiert Bookmarks zu JSON (Chrome-kompatibel)"""
-        # Chrome Bookmarks JSON-Struktur
+        now = str(int(datetime.now(timezone.utc).timestamp() * 1000000))
+        
+        def folder(folder_id: str, name: str, children="__children__") -> Dict[str, Any]:
+            return {"children": children, "date_added": now, "date_modified": now,
+                    "id": folder_id, "name": name, "type": "folder"}
+        
+        # Chrome Bookmarks JSON-Struktur; Kategorie-Ordner landen in "bookmark_bar" (Hauptbereich)
         root = {
             "checksum": "generated_by_favorg",
             "roots": {
-                "bookmark_bar": {
-                    "children": [],
-                    "date_added": str(int(datetime.now(timezone.utc).timestamp() * 1000000)),
-                    "date_modified": str(int(datetime.now(timezone.utc).timestamp() * 1000000)),
-                    "id": "1",
-                    "name": "Bookmarks bar",
-                    "type": "folder"
-                },
-                "other": {
-                    "children": [],
-                    "date_added": str(int(datetime.now(timezone.utc).timestamp() * 1000000)),
-                    "date_modified": str(int(datetime.now(timezone.utc).timestamp() * 1000000)),
-                    "id": "2",
-                    "name": "Other bookmarks",
-                    "type": "folder"
-                },
-                "synced": {
-                    "children": [],
-                    "date_added": str(int(datetime.now(timezone.utc).timestamp() * 1000000)),
-                    "date_modified": str(int(datetime.now(timezone.utc).timestamp() * 1000000)),
-                    "id": "3",
-                    "name": "Mobile bookmarks",
-                    "type": "folder"
-                }
+                "bookmark_bar": folder("1", "Bookmarks bar"),
+                "other": folder("2", "Other bookmarks", []),
+                "synced": folder("3", "Mobile bookmarks", [])
             },
             "version": 1
         }
-        
-        # Organisiere Bookmarks nach Kategorien für Chrome-Ordner
-        categories = {}
-        for bookmark in bookmarks:
-            category = bookmark.category or "Other bookmarks"
-            if category not in categories:
-                categories[category] = []
-            categories[category].append(bookmark)
-        
-        folder_id = 4  # Start-ID für neue Ordner
-        
-        for category_name, category_bookmarks in categories.items():
-            # Erstelle Ordner für Kategorie
-            folder = {
-                "children": [],
-                "date_added": str(int(datetime.now(timezone.utc).timestamp() * 1000000)),
-                "date_modified": str(int(datetime.now(timezone.utc).timestamp() * 1000000)),
-                "id": str(folder_id),
-                "name": category_name,
-                "type": "folder"
-            }
-            
-            bookmark_id = folder_id + 1000  # Bookmark-IDs beginnen bei 1000+ der Folder-ID
-            
-            for bookmark in category_bookmarks:
-                bookmark_entry = {
-                    "date_added": str(int(bookmark.date_added.timestamp() * 1000000)),
-                    "id": str(bookmark_id),
-                    "name": bookmark.title,
-                    "type": "url",
-                    "url": bookmark.url
-                }
-                folder["children"].append(bookmark_entry)
-                bookmark_id += 1
+        root_head, root_tail = self._json_block(root, 0)
+        yield root_head + "["
+        
+        chunk = []
+        current = None
+        folder_id = 3  # Start-ID für neue Ordner ist 4
+        folder_tail = ""
+        bookmark_id = 0
+        async for category_name, bookmark in self._grouped(bookmarks, "Other bookmarks"):
+            if category_name != current:
+                if current is not None:
+                    chunk.append("\n" + " " * 10 + "]" + folder_tail + ",")
+                folder_id += 1
+                folder_head, folder_tail = self._json_block(folder(str(folder_id), category_name), 8)
+                chunk.append("\n" + " " * 8 + folder_head + "[")
+                bookmark_id = folder_id + 1000  # Bookmark-IDs beginnen bei 1000+ der Folder-ID
+                current = category_name
+            else:
+                chunk.append(",")
             
-            # Füge Ordner zu "bookmark_bar" hinzu (Hauptbereich)
-            root["roots"]["bookmark_bar"]["children"].append(folder)
-            folder_id += 1
+            date_added = self._date(bookmark.get("date_added"))
+            bookmark_entry = {
+                "date_added": str(int(date_added.timestamp() * 1000000)) if date_added else now,
+                "id": str(bookmark_id),
+                "name": bookmark.get("title", ""),
+                "type": "url",
+                "url": bookmark.get("url", "")
+            }
+            chunk.append("\n" + " " * 12 + self._json_block(bookmark_entry, 12)[0])
+            bookmark_id += 1
+            if len(chunk) >= STREAM_FLUSH_LINES:
+                yield "".join(chunk)
+                chunk = []
+        
+        if current is not None:
+            chunk.append("\n" + " " * 10 + "]" + folder_tail + "\n" + " " * 6)
+        chunk.append("]" + root_tail)
+        yield "".join(chunk)
+
+# Rang-Schlüssel: Ziffern in ASCII-Reihenfolge, damit MongoDB sie als Strings korrekt sortiert
+RANK_DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+RANK_MAX_LENGTH = int(os.environ.get('RANK_MAX_LENGTH', 24))
+
+def rank_between(lower: Optional[str], upper: Optional[str]) -> str:
+    """Schlüssel echt zwischen lower und upper (None = offenes Ende).
+    
+    Erzeugte Schlüssel enden nie auf "0", daher passt zwischen zwei Schlüssel immer ein weiterer."""
+    if lower is not None and upper is not None and lower >= upper:
+        raise ValueError(f"Invalid rank interval: {lower!r} >= {upper!r}")
+    digits = []
+    position = 0
+    while True:
+        low = RANK_DIGITS.index(lower[position]) if lower and position < len(lower) else 0
+        high = RANK_DIGITS.index(upper[position]) if upper is not None and position < len(upper) else len(RANK_DIGITS)
+        if high - low > 1:
+            digits.append(RANK_DIGITS[(low + high) // 2])
+            return "".join(digits)
+        digits.append(RANK_DIGITS[low])
+        if high > low:
+            # Präfix liegt jetzt unter upper - ab hier begrenzt nur noch lower
+            upper = None
+        position += 1
+
+def ranks_between(lower: Optional[str], upper: Optional[str], count: int) -> List[str]:
+    """count aufsteigende Schlüssel zwischen lower und upper, durch Halbierung möglichst kurz"""
+    if count <= 0:
+        return []
+    middle = rank_between(lower, upper)
+    half = count // 2
+    return ranks_between(lower, middle, half) + [middle] + ranks_between(middle, upper, count - half - 1)
+
+def spaced_ranks(count: int) -> List[str]:
+    """count gleichmäßig verteilte Schlüssel fester Breite (für den Rebalance-Job)"""
+    base = len(RANK_DIGITS)
+    width = 1
+    while base ** width <= count:
+        width += 1
+    ranks = []
+    for index in range(count):
+        value = (index + 1) * base ** width // (count + 1)
+        digits = []
+        for _ in range(width):
+            value, digit = divmod(value, base)
+            digits.append(RANK_DIGITS[digit])
+        # Abschließende Nullen entfernen ändert die Sortierung nicht
+        ranks.append("".join(reversed(digits)).rstrip("0"))
+    return ranks
+
+def _increasing_positions(ranks: List[Optional[str]]) -> set:
+    """Positionen einer längsten streng steigenden Teilfolge - diese Einträge behalten ihren Rang"""
+    tails: List[str] = []
+    tail_positions: List[int] = []
+    previous: Dict[int, int] = {}
+    for position, rank in enumerate(ranks):
+        if rank is None:
+            continue
+        slot = bisect.bisect_left(tails, rank)
+        if slot == len(tails):
+            tails.append(rank)
+            tail_positions.append(position)
+        else:
+            tails[slot] = rank
+            tail_positions[slot] = position
+        previous[position] = tail_positions[slot - 1] if slot else -1
+    kept = set()
+    position = tail_positions[-1] if tail_positions else -1
+    while position >= 0:
+        kept.add(position)
+        position = previous[position]
+    return kept
+
+class RankManager:
+    """Reihenfolge über lexikographische Rang-Schlüssel: ein Verschieben schreibt genau ein Dokument"""
+    
+    # Collection -> Felder, die eine Geschwistergruppe bilden
+    GROUPS = {
+        "categories": ("parent_category",),
+        "bookmarks": ("category",),
+    }
+    WRITE_CHUNK_SIZE = 1000
+    
+    def __init__(self, database):
+        self.db = database
+        self._rebalance_tasks: Dict[str, asyncio.Task] = {}
+        self.changes: Optional[ChangeTracker] = None
+    
+    def group_of(self, collection_name: str, doc: Dict[str, Any]) -> Dict[str, Any]:
+        return {field: doc.get(field) for field in self.GROUPS[collection_name]}
+    
+    async def rank_at(self, collection_name: str, group: Dict[str, Any], position: Optional[int] = None,
+                      after_id: Optional[str] = None, exclude_id: Optional[str] = None) -> str:
+        """Rang für eine Listenposition (position) oder direkt hinter dem Eintrag after_id innerhalb der Gruppe.
+        
+        Ohne beide Angaben wird ans Ende der Gruppe einsortiert."""
+        collection = self.db[collection_name]
+        # Ungerankte Einträge (Importe, Altbestand) zuerst einsortieren
+        if await collection.find_one({**group, "rank": None}, {"_id": 1}):
+            await self.rebalance_group(collection_name, group)
+        
+        query = {**group}
+        if exclude_id:
+            query["id"] = {"$ne": exclude_id}
+        for attempt in range(2):
+            lower, upper = await self._neighbours(collection, query, position, after_id)
+            try:
+                rank = rank_between(lower, upper)
+                break
+            except ValueError:
+                # Doppelte Ränge (z.B. paralleles Verschieben) - Gruppe neu verteilen und erneut versuchen
+                if attempt:
+                    raise
+                await self.rebalance_group(collection_name, group)
+        
+        if len(rank) > RANK_MAX_LENGTH:
+            self.schedule_rebalance(collection_name)
+        return rank
+    
+    async def ranks_at_end(self, collection_name: str, group: Dict[str, Any], count: int,
+                           exclude_ids: Optional[List[str]] = None) -> List[str]:
+        """count aufeinanderfolgende Ränge hinter dem letzten Eintrag der Gruppe (z.B. für verschobene Bookmarks)"""
+        collection = self.db[collection_name]
+        if await collection.find_one({**group, "rank": None}, {"_id": 1}):
+            await self.rebalance_group(collection_name, group)
+        query = {**group}
+        if exclude_ids:
+            query["id"] = {"$nin": exclude_ids}
+        last = await collection.find(query, {"_id": 0, "rank": 1}).sort("rank", -1).limit(1).to_list(1)
+        ranks = ranks_between(last[0]["rank"] if last else None, None, count)
+        if any(len(rank) > RANK_MAX_LENGTH for rank in ranks):
+            self.schedule_rebalance(collection_name)
+        return ranks
+    
+    @staticmethod
+    async def _neighbours(collection, query: Dict[str, Any], position: Optional[int],
+                          after_id: Optional[str]) -> tuple:
+        """(lower, upper) Ränge um die Zielstelle; ohne passende Stelle ans Ende der Gruppe"""
+        ranks = collection.find(query, {"_id": 0, "rank": 1})
+        lower = None
+        if position is not None:
+            neighbours = await ranks.sort("rank", 1).skip(max(position - 1, 0)).limit(2).to_list(2)
+            if position == 0:
+                return None, (neighbours[0]["rank"] if neighbours else None)
+            if neighbours:
+                return neighbours[0]["rank"], (neighbours[1]["rank"] if len(neighbours) > 1 else None)
+        elif after_id is not None:
+            anchor = await collection.find_one({"id": after_id}, {"_id": 0, "rank": 1})
+            lower = anchor.get("rank") if anchor else None
+        
+        if lower is None:
+            last = await collection.find(query, {"_id": 0, "rank": 1}).sort("rank", -1).limit(1).to_list(1)
+            return (last[0]["rank"] if last else None), None
+        following = await collection.find({**query, "rank": {"$gt": lower}}, {"_id": 0, "rank": 1}) \
+            .sort("rank", 1).limit(1).to_list(1)
+        return lower, (following[0]["rank"] if following else None)
+    
+    async def reorder(self, collection_name: str, key_field: str, ordered_keys: List[str],
+                      set_fields: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Vollständige Reihenfolge übernehmen - ein bulk_write nur für Einträge, deren Rang sich ändern muss.
+        
+        Die längste bereits korrekt sortierte Teilfolge behält ihre Ränge; set_fields (z.B. parent_category)
+        wird mitgeschrieben und zählt ebenfalls als Änderung."""
+        collection = self.db[collection_name]
+        set_fields = set_fields or {}
+        projection = {"_id": 0, key_field: 1, "rank": 1, **{field: 1 for field in set_fields}}
+        current = {}
+        async for doc in collection.find({key_field: {"$in": ordered_keys}}, projection):
+            # Bei mehrfach vorhandenen Schlüsseln wie update_one nur den ersten Treffer berücksichtigen
+            current.setdefault(doc[key_field], doc)
+        
+        present = [key for key in dict.fromkeys(ordered_keys) if key in current]
+        old_ranks = [current[key].get("rank") for key in present]
+        kept = _increasing_positions(old_ranks)
+        
+        new_ranks = list(old_ranks)
+        run_start = 0
+        for position in range(len(present) + 1):
+            if position < len(present) and position not in kept:
+                continue
+            # Lücke zwischen zwei behaltenen Einträgen neu belegen
+            lower = new_ranks[run_start - 1] if run_start else None
+            upper = new_ranks[position] if position < len(present) else None
+            new_ranks[run_start:position] = ranks_between(lower, upper, position - run_start)
+            run_start = position + 1
+        
+        operations = []
+        now = datetime.utcnow()
+        for key, rank in zip(present, new_ranks):
+            changes = {"rank": rank, **set_fields}
+            if all(current[key].get(field) == value for field, value in changes.items()):
+                continue
+            operations.append(UpdateOne({key_field: key}, {"$set": {**changes, "updated_at": now}}))
         
-        return json.dumps(root, indent=2, ensure_ascii=False)
+        if operations:
+            await collection.bulk_write(operations, ordered=False)
+        if any(len(rank) > RANK_MAX_LENGTH for rank in new_ranks):
+            self.schedule_rebalance(collection_name)
+        return {
+            "reordered_count": len(ordered_keys),
+            "changed_count": len(operations),
+            "missing": [key for key in ordered_keys if key not in current]
+        }
+    
+    async def rebalance_group(self, collection_name: str, group: Dict[str, Any]) -> int:
+        """Ränge einer Gruppe gleichmäßig neu verteilen (bisherige Reihenfolge, Ungerankte nach order_index am Ende)"""
+        docs = await self.db[collection_name].find(
+            group, {"_id": 1, "id": 1, "rank": 1, "order_index": 1}
+        ).to_list(None)
+        return await self._write_ranks(collection_name, docs)
+    
+    async def _write_ranks(self, collection_name: str, docs: List[Dict[str, Any]]) -> int:
+        # Über _id schreiben - Altbestand aus den früheren Upserts hat kein id-Feld
+        docs.sort(key=lambda doc: (doc.get("rank") is None, doc.get("rank") or "", doc.get("order_index") or 0,
+                                   doc.get("id") or "", str(doc["_id"])))
+        operations = [
+            # Nur schreiben, wenn der Rang inzwischen nicht durch ein Verschieben geändert wurde
+            UpdateOne({"_id": doc["_id"], "rank": doc.get("rank")}, {"$set": {"rank": rank}})
+            for doc, rank in zip(docs, spaced_ranks(len(docs)))
+            if doc.get("rank") != rank
+        ]
+        for start in range(0, len(operations), self.WRITE_CHUNK_SIZE):
+            await self.db[collection_name].bulk_write(operations[start:start + self.WRITE_CHUNK_SIZE], ordered=False)
+        if operations and self.changes:
+            self.changes.bump(collection_name)
+        return len(operations)
+    
+    async def rebalance(self, collection_name: str, full: bool = False) -> Dict[str, Any]:
+        """Wartungsjob: Gruppen mit fehlenden oder zu langen Rängen (full=True: alle) neu verteilen"""
+        fields = self.GROUPS[collection_name]
+        await self.backfill_ids(collection_name)
+        groups: Dict[tuple, List[Dict[str, Any]]] = {}
+        projection = {"_id": 1, "id": 1, "rank": 1, "order_index": 1, **{field: 1 for field in fields}}
+        async for doc in self.db[collection_name].find({}, projection):
+            groups.setdefault(tuple(doc.get(field) for field in fields), []).append(doc)
+        
+        rebalanced = 0
+        written = 0
+        for docs in groups.values():
+            if full or any(doc.get("rank") is None or len(doc["rank"]) > RANK_MAX_LENGTH for doc in docs):
+                written += await self._write_ranks(collection_name, docs)
+                rebalanced += 1
+        if written:
+            logging.info(f"Rebalanced ranks in {collection_name}: {rebalanced} groups, {written} documents")
+        return {"collection": collection_name, "groups": len(groups), "rebalanced_groups": rebalanced, "written": written}
+    
+    async def backfill_ids(self, collection_name: str) -> int:
+        """Dokumenten ohne id (Upserts älterer Versionen) eine id vergeben - Verschieben und Umhängen adressieren über id"""
+        operations = [
+            UpdateOne({"_id": doc["_id"], "id": None}, {"$set": {"id": str(uuid.uuid4())}})
+            async for doc in self.db[collection_name].find({"id": None}, {"_id": 1})
+        ]
+        for start in range(0, len(operations), self.WRITE_CHUNK_SIZE):
+            await self.db[collection_name].bulk_write(operations[start:start + self.WRITE_CHUNK_SIZE], ordered=False)
+        if operations:
+            logging.info(f"Backfilled missing ids in {collection_name}: {len(operations)} documents")
+        return len(operations)
+    
+    async def ensure_id(self, collection_name: str, doc: Dict[str, Any]) -> str:
+        """id eines bereits geladenen Dokuments, bei Altbestand ohne id wird sie jetzt vergeben"""
+        if not doc.get("id"):
+            doc["id"] = str(uuid.uuid4())
+            await self.db[collection_name].update_one({"_id": doc["_id"]}, {"$set": {"id": doc["id"]}})
+        return doc["id"]
+    
+    def schedule_rebalance(self, collection_name: str):
+        """Rebalance im Hintergrund starten, falls für die Collection nicht schon einer läuft"""
+        task = self._rebalance_tasks.get(collection_name)
+        if task is None or task.done():
+            self._rebalance_tasks[collection_name] = asyncio.create_task(self.rebalance(collection_name))
+    
+    async def shutdown(self):
+        tasks = [task for task in self._rebalance_tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+class ChangeTracker:
+    """Änderungs-Versionen je Collection (prozesslokal) für schwache ETags und Cache-Invalidierung.
+    
+    Schreibende API-Requests erhöhen die Versionen über die track_changes-Middleware,
+    Hintergrund-Jobs (Link-Validierung, Rang-Rebalance) direkt per bump()."""
+    
+    COLLECTIONS = ("bookmarks", "categories", "statistics")
+    # Lesende Pfade (Präfixe, erster Treffer gilt) -> Collections, von denen die Antwort abhängt
+    READ_DEPENDENCIES = (
+        ("/api/bookmarks/validate", ()),  # Job-Fortschritt ändert sich ohne Versionssprung
+        ("/api/bookmarks/download-bookmarkbox", ()),
+        ("/api/bookmarks", ("bookmarks",)),
+        ("/api/categories", ("categories",)),
+        ("/api/statistics", ("bookmarks", "categories", "statistics")),
+    )
+    # Schreibende Requests ("METHODE /pfad", reguläre Ausdrücke, erster Treffer gilt) -> geänderte Collections.
+    # bookmark_count der Kategorien und die Baum-Summen folgen den Bookmarks; Umbenennen/Löschen einer
+    # Kategorie schreibt die Bookmarks um. Nicht aufgeführte Schreibpfade erhöhen alle Versionen.
+    WRITE_DEPENDENCIES = tuple((re.compile(pattern), collections) for pattern, collections in (
+        # Nur Felder der Bookmarks selbst (Status, Sperre, Reihenfolge, Duplikat-Markierung)
+        (r"PUT /api/bookmarks/[^/]+/(status|lock|unlock|position)", ("bookmarks",)),
+        (r"PUT /api/bookmarks/reorder", ("bookmarks",)),
+        (r"POST /api/bookmarks/(validate(/.*)?|find-duplicates)", ("bookmarks",)),
+        (r"(POST|PUT|DELETE) /api/bookmarks(/.*)?", ("bookmarks", "categories")),
+        (r"PUT /api/categories/([^/]+/)?(lock|unlock|reorder|reparent|cross-level-sort|update-protected)",
+         ("categories",)),
+        (r"POST /api/categories(/(initialize|recount|cleanup|create-with-lock))?", ("categories",)),
+        (r"(PUT|DELETE) /api/categories/.*", ("categories", "bookmarks")),
+        (r"POST /api/statistics/reconcile", ("statistics",)),
+        (r"POST /api/admin/url-keys", ("bookmarks",)),
+        # Rebalance erhöht selbst nur bei tatsächlich geschriebenen Rängen
+        (r"POST /api/admin/ranks/rebalance", ()),
+    ))
+    # Endpunkte ohne Schreibzugriff trotz POST/PUT
+    READ_ONLY_WRITES = ("/api/export", "/api/documentation/download-nomenklatur")
+    
+    def __init__(self):
+        # Epoche verhindert, dass ETags nach einem Neustart (Zähler wieder bei 0) fälschlich passen
+        self.epoch = uuid.uuid4().hex[:8]
+        self.versions = {collection: 0 for collection in self.COLLECTIONS}
+        self._listeners = []
+    
+    def subscribe(self, callback):
+        """callback(collections) nach jeder Versionserhöhung aufrufen"""
+        self._listeners.append(callback)
+    
+    def bump(self, *collections: str):
+        """Versionen erhöhen; ohne Angabe alle Collections"""
+        collections = collections or self.COLLECTIONS
+        for collection in collections:
+            self.versions[collection] += 1
+        for callback in self._listeners:
+            callback(collections)
+    
+    def dependencies(self, path: str) -> tuple:
+        for prefix, collections in self.READ_DEPENDENCIES:
+            if path == prefix or path.startswith(prefix + "/"):
+                return collections
+        return ()
+    
+    def written(self, method: str, path: str) -> tuple:
+        """Collections, die ein schreibender Request ändern kann"""
+        request_line = f"{method} {path}"
+        for pattern, collections in self.WRITE_DEPENDENCIES:
+            if pattern.fullmatch(request_line):
+                return collections
+        return self.COLLECTIONS
+    
+    def is_write(self, method: str, path: str) -> bool:
+        return method not in ("GET", "HEAD", "OPTIONS") and path.startswith("/api/") and path not in self.READ_ONLY_WRITES
+    
+    def etag(self, collections: tuple) -> str:
+        return f'W/"{self.epoch}-' + "-".join(str(self.versions[collection]) for collection in collections) + '"'
+    
+    @staticmethod
+    def matches(etag: str, if_none_match: Optional[str]) -> bool:
+        """Schwacher Vergleich nach RFC 9110 (W/-Präfix wird ignoriert)"""
+        if not if_none_match:
+            return False
+        candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+        return "*" in candidates or etag.removeprefix("W/") in (candidate.removeprefix("W/") for candidate in candidates)
+
+class ChangeFeed:
+    """Änderungs-Feed für /api/events (Server-Sent Events).
+    
+    Mit Replica-Set liefert ein MongoDB Change Stream alle Änderungen (auch anderer Prozesse);
+    sonst veröffentlichen die Mutationspfade ihre Diffs selbst (prozessinterner Pub/Sub).
+    Die letzten Ereignisse bleiben in einem Ringpuffer, damit Clients nach einem Reconnect per
+    Last-Event-ID nur die verpassten Ereignisse erhalten statt komplett neu zu laden."""
+    
+    COLLECTIONS = ("bookmarks", "categories")
+    BUFFER_SIZE = int(os.environ.get('EVENT_BUFFER_SIZE', 1000))
+    HEARTBEAT_SECONDS = 15
+    WATCH_RETRIES = 3
+    
+    # Markiert pro Request, ob bereits ein konkretes Ereignis veröffentlicht wurde
+    _request_marker: "contextvars.ContextVar[Optional[list]]" = contextvars.ContextVar("change_feed_marker", default=None)
+    
+    def __init__(self, database):
+        self.db = database
+        self.epoch = uuid.uuid4().hex[:8]
+        self.mode = "memory"  # oder "change_stream"
+        self._seq = 0
+        self._events: deque = deque(maxlen=self.BUFFER_SIZE)  # (seq, SSE-Text)
+        self._wakeup = asyncio.Event()
+        self._closed = False
+        self._watch_task: Optional[asyncio.Task] = None
+        self._resume_token = None
+    
+    # ---- Veröffentlichen ----
+    
+    @staticmethod
+    def _encode(value):
+        return value.isoformat() if isinstance(value, datetime) else str(value)
+    
+    def _emit(self, event: str, payload: Dict[str, Any]):
+        self._seq += 1
+        data = json.dumps(payload, default=self._encode, ensure_ascii=False)
+        self._events.append((self._seq, f"id: {self.epoch}-{self._seq}\nevent: {event}\ndata: {data}\n\n"))
+        # Wartende Streams wecken; neues Event für die nächste Runde
+        self._wakeup.set()
+        self._wakeup = asyncio.Event()
+    
+    def publish(self, collection: str, op: str, ids: Optional[List[str]] = None,
+                fields: Optional[Dict[str, Any]] = None, doc: Optional[Dict[str, Any]] = None,
+                items: Optional[List[Dict[str, Any]]] = None):
+        """Kompakten Diff aus einem Mutationspfad veröffentlichen (nur ohne Change Stream).
+        
+        items: unterschiedliche Felder je Dokument in einem Ereignis ([{"id": ..., "fields": {...}}])"""
+        marker = self._request_marker.get()
+        if marker is not None:
+            marker.append(collection)
+        if self.mode != "memory":
+            # Der Change Stream liefert dieselbe Änderung
+            return
+        payload = {"coll": collection, "op": op}
+        if ids is not None:
+            payload["ids"] = ids
+        if fields is not None:
+            payload["fields"] = {key: value for key, value in fields.items() if key != "_id"}
+        if doc is not None:
+            payload["doc"] = {key: value for key, value in doc.items() if key != "_id"}
+        if items is not None:
+            payload["items"] = items
+        self._emit("change", payload)
+    
+    def begin_request(self) -> list:
+        marker = []
+        self._request_marker.set(marker)
+        return marker
+    
+    def finish_request(self, path: str, marker: list):
+        """Schreibender Request ohne konkreten Diff (Import, Bulk-Operationen, ...) -> Reload-Hinweis"""
+        if self.mode != "memory" or marker:
+            return
+        if path.startswith("/api/categories"):
+            collections = ["categories"]
+        elif path.startswith("/api/bookmarks"):
+            collections = ["bookmarks", "categories"]
+        else:
+            collections = list(self.COLLECTIONS)
+        self._emit("reload", {"collections": collections, "path": path})
+    
+    # ---- Change Stream ----
+    
+    async def start(self):
+        """Change Stream öffnen, falls der Server ihn unterstützt (Replica Set / Sharded Cluster)"""
+        try:
+            stream, first = await self._open_stream()
+        except Exception as e:
+            logging.info(f"Change streams unavailable, using in-process change feed: {e}")
+            return
+        self.mode = "change_stream"
+        self._watch_task = asyncio.create_task(self._watch(stream, first))
+        logging.info("Change feed backed by MongoDB change streams")
+    
+    async def _open_stream(self) -> tuple:
+        """(Stream, erste Änderung oder None) - try_next prüft, ob der Server Change Streams kann"""
+        pipeline = [{"$match": {"ns.coll": {"$in": list(self.COLLECTIONS)}}}]
+        options = {"full_document": "updateLookup", "resume_after": self._resume_token}
+        try:
+            # Pre-Images (MongoDB 6+) liefern die id gelöschter Dokumente
+            stream = self.db.watch(pipeline, full_document_before_change="whenAvailable", **options)
+            first = await stream.try_next()
+        except OperationFailure:
+            stream = self.db.watch(pipeline, **options)
+            first = await stream.try_next()
+        return stream, first
+    
+    async def _watch(self, stream, first: Optional[Dict[str, Any]]):
+        retries = 0
+        while not self._closed:
+            try:
+                async with stream:
+                    if first is not None:
+                        self._publish_change(first)
+                        first = None
+                    self._resume_token = stream.resume_token
+                    async for change in stream:
+                        self._resume_token = stream.resume_token
+                        self._publish_change(change)
+                        retries = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                retries += 1
+                if retries > self.WATCH_RETRIES:
+                    logging.error(f"Change stream failed, falling back to in-process change feed: {e}")
+                    self.mode = "memory"
+                    self._emit("reload", {"collections": list(self.COLLECTIONS), "path": None})
+                    return
+                logging.warning(f"Change stream interrupted, resuming: {e}")
+                await asyncio.sleep(retries)
+                try:
+                    stream, first = await self._open_stream()
+                except Exception as open_error:
+                    logging.warning(f"Could not reopen change stream: {open_error}")
+    
+    def _publish_change(self, change: Dict[str, Any]):
+        collection = change.get("ns", {}).get("coll")
+        op = change.get("operationType")
+        if op == "insert":
+            doc = change.get("fullDocument") or {}
+            self._emit("change", {"coll": collection, "op": "insert", "ids": [doc.get("id")],
+                                  "doc": {key: value for key, value in doc.items() if key != "_id"}})
+            return
+        
+        ident = None
+        fields = None
+        if op in ("update", "replace"):
+            ident = (change.get("fullDocument") or {}).get("id")
+            if op == "update":
+                description = change.get("updateDescription") or {}
+                fields = dict(description.get("updatedFields") or {})
+                fields.update({field: None for field in description.get("removedFields") or []})
+            else:
+                fields = {key: value for key, value in (change.get("fullDocument") or {}).items() if key != "_id"}
+        elif op == "delete":
+            ident = (change.get("fullDocumentBeforeChange") or {}).get("id")
+        
+        if ident is None:
+            # drop/rename/invalidate oder fehlende id (Dokument inzwischen gelöscht, keine Pre-Images)
+            self._emit("reload", {"collections": [collection] if collection else list(self.COLLECTIONS), "path": None})
+            return
+        payload = {"coll": collection, "op": op if op != "replace" else "update", "ids": [ident]}
+        if fields is not None:
+            payload["fields"] = {key: value for key, value in fields.items() if key != "_id"}
+        self._emit("change", payload)
+    
+    async def stop(self):
+        self._closed = True
+        self._wakeup.set()
+        if self._watch_task and not self._watch_task.done():
+            self._watch_task.cancel()
+            await asyncio.gather(self._watch_task, return_exceptions=True)
+    
+    # ---- Abonnieren ----
+    
+    def _after(self, seq: int) -> Optional[List[str]]:
+        """Gepufferte Ereignisse nach seq; None wenn der Puffer sie nicht mehr vollständig enthält"""
+        if seq >= self._seq:
+            return []
+        first = self._events[0][0] if self._events else self._seq + 1
+        if seq < first - 1:
+            return None
+        return [text for _, text in islice(self._events, seq - first + 1, None)]
+    
+    def _resume_seq(self, last_event_id: Optional[str]) -> Optional[int]:
+        """Sequenz aus dem Resume-Token "<epoch>-<seq>"; None wenn unbrauchbar (z.B. nach Neustart)"""
+        epoch, _, seq = (last_event_id or "").partition("-")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        return int(seq)
+    
+    async def subscribe(self, last_event_id: Optional[str] = None):
+        """SSE-Text: verpasste Ereignisse ab dem Resume-Token, danach live; Heartbeat gegen Proxy-Timeouts"""
+        yield "retry: 3000\n\n"
+        seq = self._resume_seq(last_event_id) if last_event_id else None
+        if seq is None:
+            # Position vor dem yield festhalten, sonst gehen zwischenzeitliche Ereignisse verloren
+            seq = self._seq
+            if last_event_id:
+                # Token abgelaufen oder aus einem früheren Prozess -> Client muss einmal komplett laden
+                yield f"id: {self.epoch}-{seq}\nevent: reset\ndata: {json.dumps({'reason': 'resume token expired'})}\n\n"
+            else:
+                yield f"id: {self.epoch}-{seq}\nevent: ready\ndata: {json.dumps({'mode': self.mode})}\n\n"
+        
+        while not self._closed:
+            wakeup = self._wakeup
+            pending = self._after(seq)
+            if pending is None:
+                seq = self._seq
+                yield f"id: {self.epoch}-{seq}\nevent: reset\ndata: {json.dumps({'reason': 'client fell behind'})}\n\n"
+                continue
+            if pending:
+                seq += len(pending)
+                yield "".join(pending)
+                continue
+            try:
+                await asyncio.wait_for(wakeup.wait(), self.HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+
+class CategoryTreeCache:
+    """Fertig aufgebauter Kategorie-Baum im Speicher, nach Änderungen neu aufgebaut.
+    
+    Jede Erhöhung der categories-Version im ChangeTracker invalidiert den Cache; der nächste
+    Lesezugriff baut ihn einmalig neu auf. Ein Aufbau, der während einer Invalidierung lief, wird verworfen."""
+    
+    NODE_FIELDS = ("id", "name", "parent_category", "is_locked", "lock_reason", "bookmark_count", "subcategory_count")
+    
+    def __init__(self, database):
+        self.db = database
+        self._version = 0
+        self._lock = asyncio.Lock()
+        self._categories: Optional[List[Category]] = None
+        self._body: Optional[bytes] = None
+        self.etag: Optional[str] = None
+    
+    def invalidate(self, collections: tuple = ChangeTracker.COLLECTIONS):
+        if "categories" not in collections:
+            return
+        self._version += 1
+        self._categories = None
+        self._body = None
+        self.etag = None
+    
+    async def categories(self) -> List[Category]:
+        """Flache Kategorieliste wie get_all_categories, aus dem Cache"""
+        await self._ensure()
+        return self._categories
+    
+    async def tree(self) -> tuple:
+        """(serialisierter Baum, ETag)"""
+        await self._ensure()
+        return self._body, self.etag
+    
+    async def _ensure(self):
+        if self._body is not None:
+            return
+        async with self._lock:
+            while self._body is None:
+                version = self._version
+                categories, body = await self._build()
+                if version == self._version:
+                    self._categories, self._body = categories, body
+                    self.etag = f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+    
+    async def _build(self) -> tuple:
+        docs = await self.db.categories.find({}, {"_id": 0}).sort("rank", 1).to_list(None)
+        for doc in docs:
+            doc["is_locked"] = doc.get("is_locked", False)
+            doc["lock_reason"] = doc.get("lock_reason", "")
+        categories = [Category(**doc) for doc in docs]
+        
+        # Bookmarks je (Kategorie, Unterkategorie) - Grundlage für direkte und Teilbaum-Summen
+        pipeline = [{"$group": {"_id": {"category": "$category", "subcategory": "$subcategory"}, "count": {"$sum": 1}}}]
+        pair_counts: Dict[tuple, int] = {}
+        total_bookmarks = 0
+        async for row in self.db.bookmarks.aggregate(pipeline):
+            key = (row["_id"].get("category"), row["_id"].get("subcategory") or None)
+            pair_counts[key] = pair_counts.get(key, 0) + row["count"]
+            total_bookmarks += row["count"]
+        
+        # Adjazenz über Namen; bei doppelten Namen hängen Kinder am ersten Knoten
+        nodes = []
+        by_name: Dict[str, Dict[str, Any]] = {}
+        for category in categories:
+            node = {field: getattr(category, field) for field in self.NODE_FIELDS}
+            node["children"] = []
+            nodes.append(node)
+            by_name.setdefault(category.name, node)
+        
+        roots = []
+        attached = set()
+        for node in nodes:
+            parent = by_name.get(node["parent_category"]) if node["parent_category"] else None
+            if parent is None or parent is node:
+                roots.append(node)
+            else:
+                parent["children"].append(node)
+                attached.add(id(node))
+        
+        # Teilbaum-Summen iterativ (Post-Order)
+        visited = set()
+        
+        def aggregate(root):
+            stack = [(root, False)]
+            while stack:
+                node, done = stack.pop()
+                if done:
+                    if id(node) in attached:
+                        direct = pair_counts.get((node["parent_category"], node["name"]), 0)
+                    else:
+                        # Wurzel: alle Bookmarks der Kategorie ohne eigene Unterkategorie-Knoten
+                        child_names = {child["name"] for child in node["children"]}
+                        direct = sum(count for (category, subcategory), count in pair_counts.items()
+                                     if category == node["name"] and subcategory not in child_names)
+                    node["direct_bookmark_count"] = direct
+                    node["total_bookmark_count"] = direct + sum(child["total_bookmark_count"] for child in node["children"])
+                    node["descendant_count"] = sum(1 + child["descendant_count"] for child in node["children"])
+                    continue
+                visited.add(id(node))
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(node["children"]))
+        
+        for root in roots:
+            aggregate(root)
+        # Nicht erreichbare Knoten liegen in einem parent_category-Zyklus: Kante kappen, als Wurzel führen
+        for node in nodes:
+            if id(node) not in visited:
+                parent = by_name[node["parent_category"]]
+                parent["children"] = [child for child in parent["children"] if child is not node]
+                attached.discard(id(node))
+                node["parent_category"] = None
+                roots.append(node)
+                aggregate(node)
+        
+        payload = {
+            "tree": roots,
+            "total_categories": len(nodes),
+            "total_bookmarks": total_bookmarks,
+            "uncategorized_bookmarks": sum(count for (category, _), count in pair_counts.items() if category not in by_name)
+        }
+        body = orjson.dumps(payload) if orjson else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        return categories, body
 
 class ModularCategoryManager:
     """Phase 2: Objektorientierte Kategorie-Verwaltung mit Lock-Funktionalität"""
     
-    def __init__(self, database):
+    def __init__(self, database, statistics_manager: Optional["StatisticsManager"] = None):
         self.db = database
+        self.statistics_manager = statistics_manager
+        self.rank_manager: Optional[RankManager] = None
+        self.change_feed: Optional[ChangeFeed] = None
     
     async def get_all_categories(self) -> List[Category]:
-        """Alle Kategorien mit Hierarchie und Lock-Status abrufen"""
-        categories = await self.db.categories.find().to_list(100000)
+        """Alle Kategorien mit Hierarchie und Lock-Status abrufen (Geschwister in Rang-Reihenfolge)"""
+        categories = await self.db.categories.find().sort("rank", 1).to_list(100000)
         
         # Erweitere jede Kategorie um Lock-Informationen
         enhanced_categories = []
@@ -742,6 +2509,31 @@ class ModularCategoryManager:
         
         return enhanced_categories
     
+    # Felder, die ein Client für den Kategorie-Baum braucht (Diff nach Zähler-/Hierarchie-Änderungen)
+    CHANGE_PROJECTION = {"_id": 0, "id": 1, "name": 1, "parent_category": 1, "rank": 1,
+                         "bookmark_count": 1, "subcategory_count": 1, "is_locked": 1, "lock_reason": 1}
+    
+    async def publish_categories(self, names: Iterable[Optional[str]], children_of: Iterable[Optional[str]] = ()):
+        """Aktuellen Stand der betroffenen Kategorien (nach Name) und der Unterkategorien von children_of
+        als ein kompaktes update-Ereignis veröffentlichen - z.B. Kategorie, alter und neuer Parent"""
+        if not self.change_feed:
+            return
+        if self.change_feed.mode != "memory":
+            # Change Stream liefert die Dokumente selbst - nur den Request als "mit Diff" markieren
+            self.change_feed.publish("categories", "update")
+            return
+        names = [name for name in set(names) if name]
+        parents = [name for name in set(children_of) if name]
+        conditions = ([{"name": {"$in": names}}] if names else []) + \
+                     ([{"parent_category": {"$in": parents}}] if parents else [])
+        if not conditions:
+            return
+        docs = await self.db.categories.find({"$or": conditions}, self.CHANGE_PROJECTION).to_list(None)
+        items = [{"id": doc.get("id"), "fields": {key: value for key, value in doc.items() if key != "id"}}
+                 for doc in docs]
+        if items:
+            self.change_feed.publish("categories", "update", items=items)
+    
     async def create_category(self, name: str, parent_category: Optional[str] = None, is_locked: bool = False, lock_reason: str = "") -> Category:
         """Neue Kategorie oder Unterkategorie mit Lock-Option erstellen"""
         category_dict = {
@@ -753,8 +2545,14 @@ class ModularCategoryManager:
             "created_at": datetime.now(timezone.utc),
             "updated_at": datetime.now(timezone.utc)
         }
+        if self.rank_manager:
+            category_dict["rank"] = await self.rank_manager.rank_at("categories", {"parent_category": parent_category})
         category = Category(**category_dict)
         await self.db.categories.insert_one(category.dict())
+        category.bookmark_count = await self.category_added(name, parent_category)
+        if self.change_feed:
+            self.change_feed.publish("categories", "insert", [category.id], doc=category.dict())
+            await self.publish_categories([parent_category])
         return category
     
     async def update_category(self, category_id: str, update_data: dict) -> dict:
@@ -782,6 +2580,18 @@ class ModularCategoryManager:
         if result.modified_count == 0:
             raise HTTPException(status_code=404, detail="Category not found or no changes made")
         
+        # Zähler nur bei geändertem Namen oder Parent neu bestimmen
+        old_parent = existing_category.get("parent_category")
+        new_name = update_doc.get("name", existing_category["name"])
+        new_parent = update_doc.get("parent_category", old_parent)
+        if new_parent != old_parent:
+            await self.category_reparented(new_name, old_parent, new_parent)
+        elif new_name != existing_category["name"]:
+            await self.refresh_category_count(new_name, new_parent)
+        
+        if self.change_feed:
+            self.change_feed.publish("categories", "update", [category_id], fields=update_doc)
+            await self.publish_categories([old_parent, new_parent])
         return {"message": "Category updated successfully", "modified_count": result.modified_count}
     
     async def delete_category(self, category_id: str) -> dict:
@@ -800,6 +2610,10 @@ class ModularCategoryManager:
         category_name = existing_category["name"]
         
         # Verschiebe Bookmarks zu "Uncategorized"
+        if self.statistics_manager:
+            await self.statistics_manager.record_update(
+                {"category": category_name}, {"category": "Uncategorized", "subcategory": ""}
+            )
         moved_bookmarks = await self.db.bookmarks.update_many(
             {"category": category_name},
             {"$set": {"category": "Uncategorized", "subcategory": ""}}
@@ -807,9 +2621,14 @@ class ModularCategoryManager:
         
         # Lösche Kategorie
         await self.db.categories.delete_one({"id": category_id})
-        
-        # Update Counts
-        await self.update_bookmark_counts()
+        await self.adjust_subcategory_count(existing_category.get("parent_category"), -1)
+        if self.change_feed:
+            self.change_feed.publish("categories", "delete", [category_id])
+            await self.publish_categories([existing_category.get("parent_category")])
+            if moved_bookmarks.modified_count:
+                self.change_feed.publish("bookmarks", "reassign", fields={
+                    "from_category": category_name, "category": "Uncategorized", "subcategory": ""
+                })
         
         return {
             "message": f"Category '{category_name}' deleted and {moved_bookmarks.modified_count} bookmarks moved to Uncategorized",
@@ -818,19 +2637,23 @@ class ModularCategoryManager:
     
     async def lock_category(self, category_id: str, lock_reason: str = "") -> dict:
         """Sperre Kategorie vor Änderungen"""
+        lock_fields = {
+            "is_locked": True,
+            "lock_reason": lock_reason or "Kategorie administrativ gesperrt",
+            "locked_at": datetime.now(timezone.utc),
+            "updated_at": datetime.now(timezone.utc)
+        }
         result = await self.db.categories.update_one(
             {"id": category_id},
-            {"$set": {
-                "is_locked": True,
-                "lock_reason": lock_reason or "Kategorie administrativ gesperrt",
-                "locked_at": datetime.now(timezone.utc),
-                "updated_at": datetime.now(timezone.utc)
-            }}
+            {"$set": lock_fields}
         )
         
         if result.modified_count == 0:
             raise HTTPException(status_code=404, detail="Category not found")
         
+        if self.change_feed:
+            self.change_feed.publish("categories", "update", [category_id], fields=lock_fields)
+        
         return {"message": f"Category successfully locked: {lock_reason}", "is_locked": True}
     
     async def unlock_category(self, category_id: str) -> dict:
@@ -841,15 +2664,18 @@ class ModularCategoryManager:
             raise HTTPException(status_code=404, detail="Category not found")
         
         # Update durchführen
+        unlock_fields = {
+            "is_locked": False,
+            "lock_reason": "",
+            "locked_at": None,
+            "updated_at": datetime.now(timezone.utc)
+        }
         result = await self.db.categories.update_one(
             {"id": category_id},
-            {"$set": {
-                "is_locked": False,
-                "lock_reason": "",
-                "locked_at": None,
-                "updated_at": datetime.now(timezone.utc)
-            }}
+            {"$set": unlock_fields}
         )
+        if self.change_feed:
+            self.change_feed.publish("categories", "update", [category_id], fields=unlock_fields)
         
         # Erfolgreiche Entsperrung bestätigen
         return {
@@ -858,76 +2684,530 @@ class ModularCategoryManager:
             "category_name": existing_category['name']
         }
     
-    async def update_bookmark_counts(self):
-        """Bookmark-Anzahl für alle Kategorien und Unterkategorien aktualisieren"""
-        # Hauptkategorien
+    async def apply_count_delta(self, delta: Dict[str, int]):
+        """bookmark_count per $inc aus den Bookmark-Deltas des StatisticsManager nachführen"""
+        operations = []
+        upsert_parents = set()
+        
+        for key, value in delta.items():
+            parts = key.split(".")
+            if parts[0] == "categories" and len(parts) == 2:
+                parent, name = None, StatisticsManager._decode_key(parts[1])
+            elif parts[0] == "subcategories" and len(parts) == 3:
+                parent, name = StatisticsManager._decode_key(parts[1]), StatisticsManager._decode_key(parts[2])
+                if not parent:
+                    continue
+            else:
+                continue
+            
+            if not name or value == 0:
+                continue
+            
+            if value > 0:
+                # Fehlende Kategorie anlegen (wie bisher per Upsert), aber mit id
+                operations.append(UpdateOne(
+                    {"name": name, "parent_category": parent},
+                    {
+                        "$inc": {"bookmark_count": value},
+                        "$setOnInsert": {
+                            "id": str(uuid.uuid4()),
+                            "subcategory_count": 0,
+                            "created_at": datetime.now(timezone.utc),
+                            "is_locked": False,
+                            "lock_reason": ""
+                        }
+                    },
+                    upsert=True
+                ))
+                if parent:
+                    upsert_parents.add(parent)
+            else:
+                operations.append(UpdateOne(
+                    {"name": name, "parent_category": parent},
+                    {"$inc": {"bookmark_count": value}}
+                ))
+        
+        if not operations:
+            return
+        
+        # Hauptkategorien stehen vor den Unterkategorien - geordnet ausführen
+        result = await self.db.categories.bulk_write(operations, ordered=True)
+        
+        # Neu angelegte Unterkategorien beim Parent mitzählen (indizierte Zählung über parent_rank)
+        if result.upserted_count:
+            for parent in upsert_parents:
+                count = await self.db.categories.count_documents({"parent_category": parent})
+                await self.db.categories.update_many(
+                    {"name": parent},
+                    {"$set": {"subcategory_count": count}}
+                )
+    
+    async def adjust_subcategory_count(self, parent_name: Optional[str], delta: int):
+        """subcategory_count einer Kategorie um delta verändern"""
+        if not parent_name or delta == 0:
+            return
+        await self.db.categories.update_one(
+            {"name": parent_name},
+            {"$inc": {"subcategory_count": delta}}
+        )
+    
+    async def refresh_category_count(self, name: str, parent_category: Optional[str],
+                                     category_id: Optional[str] = None) -> int:
+        """bookmark_count einer einzelnen Kategorie per indiziertem count_documents setzen"""
+        if parent_category:
+            query = {"category": parent_category, "subcategory": name}
+        else:
+            query = {"category": name}
+        count = await self.db.bookmarks.count_documents(query)
+        target = {"id": category_id} if category_id else {"name": name, "parent_category": parent_category}
+        await self.db.categories.update_one(target, {"$set": {"bookmark_count": count}})
+        return count
+    
+    async def category_added(self, name: str, parent_category: Optional[str]) -> int:
+        """Zähler nach dem Anlegen einer Kategorie setzen"""
+        count = await self.refresh_category_count(name, parent_category)
+        await self.adjust_subcategory_count(parent_category, 1)
+        return count
+    
+    async def reorder_categories(self, names: List[str], parent_category: Optional[str] = None) -> Dict[str, Any]:
+        """Reihenfolge per Rang-Schlüssel setzen; Zähler nur bei Ebenenwechsel anpassen, nicht neu berechnen"""
+        if parent_category is None:
+            result = await self.rank_manager.reorder("categories", "name", names)
+            await self.publish_categories(names)
+            return result
+        
+        new_parent = parent_category if parent_category != "root" else None
+        # Bisherige Parents merken, um Zähler bei Ebenenwechsel anzupassen
+        existing = await self.db.categories.find(
+            {"name": {"$in": names}}, {"_id": 0, "name": 1, "parent_category": 1}
+        ).to_list(None)
+        old_parents = {}
+        for doc in existing:
+            old_parents.setdefault(doc["name"], doc.get("parent_category"))
+        
+        result = await self.rank_manager.reorder("categories", "name", names, {"parent_category": new_parent})
+        for name, old_parent in old_parents.items():
+            await self.category_reparented(name, old_parent, new_parent)
+        await self.publish_categories([*names, *old_parents.values(), new_parent])
+        return result
+    
+    async def category_reparented(self, name: str, old_parent: Optional[str], new_parent: Optional[str]):
+        """Zähler nach einem Wechsel der Hierarchie-Ebene anpassen"""
+        if old_parent == new_parent:
+            return
+        await self.refresh_category_count(name, new_parent)
+        await self.adjust_subcategory_count(old_parent, -1)
+        await self.adjust_subcategory_count(new_parent, 1)
+    
+    async def recompute_bookmark_counts(self) -> Dict[str, Any]:
+        """Wartungsjob: bookmark_count und subcategory_count komplett neu berechnen"""
+        # Hauptkategorien (leere Namen werden wie in apply_count_delta nicht als Kategorie geführt)
         pipeline = [
+            {"$match": {"category": {"$nin": [None, ""]}}},
             {"$group": {"_id": "$category", "count": {"$sum": 1}}}
         ]
         counts = await self.db.bookmarks.aggregate(pipeline).to_list(None)
         
-        for count_doc in counts:
-            await self.db.categories.update_one(
-                {"name": count_doc["_id"], "parent_category": None},
-                {"$set": {"bookmark_count": count_doc["count"]}},
-                upsert=True
-            )
-        
         # Unterkategorien
         subcategory_pipeline = [
-            {"$match": {"subcategory": {"$ne": None}}},
+            {"$match": {"category": {"$nin": [None, ""]}, "subcategory": {"$nin": [None, ""]}}},
             {"$group": {"_id": {"category": "$category", "subcategory": "$subcategory"}, "count": {"$sum": 1}}}
         ]
         subcounts = await self.db.bookmarks.aggregate(subcategory_pipeline).to_list(None)
         
-        for count_doc in subcounts:
-            category_name = count_doc["_id"]["category"]
-            subcategory_name = count_doc["_id"]["subcategory"]
-            
-            await self.db.categories.update_one(
-                {"name": subcategory_name, "parent_category": category_name},
-                {"$set": {"bookmark_count": count_doc["count"]}},
+        # Anzahl direkter Unterkategorien
+        children_pipeline = [
+            {"$match": {"parent_category": {"$nin": [None, ""]}}},
+            {"$group": {"_id": "$parent_category", "count": {"$sum": 1}}}
+        ]
+        children = await self.db.categories.aggregate(children_pipeline).to_list(None)
+        
+        operations = [
+            UpdateOne(
+                {"name": doc["_id"], "parent_category": None},
+                {"$set": {"bookmark_count": doc["count"]}, "$setOnInsert": {"id": str(uuid.uuid4())}},
                 upsert=True
             )
+            for doc in counts
+        ] + [
+            UpdateOne(
+                {"name": doc["_id"]["subcategory"], "parent_category": doc["_id"]["category"]},
+                {"$set": {"bookmark_count": doc["count"]}, "$setOnInsert": {"id": str(uuid.uuid4())}},
+                upsert=True
+            )
+            for doc in subcounts
+        ] + [
+            UpdateOne({"name": doc["_id"]}, {"$set": {"subcategory_count": doc["count"]}})
+            for doc in children
+        ]
+        
+        # Vorher alle Zähler zurücksetzen, damit leere Kategorien nicht stehen bleiben
+        await self.db.categories.update_many({}, {"$set": {"bookmark_count": 0, "subcategory_count": 0}})
+        if operations:
+            await self.db.categories.bulk_write(operations, ordered=False)
+        
+        return {
+            "message": f"Recomputed counts for {len(counts)} categories and {len(subcounts)} subcategories",
+            "categories": len(counts),
+            "subcategories": len(subcounts)
+        }
+
+class IndexManager:
+    """Legt die MongoDB-Indizes beim Start idempotent an und liefert Nutzungsstatistiken"""
+    
+    # Upserts aus älteren Versionen haben Kategorien ohne "id" angelegt - daher partieller Unique-Index
+    UNIQUE_ID = {"unique": True, "partialFilterExpression": {"id": {"$exists": True}}}
+    
+    # collection -> [(name, keys, options)]
+    INDEX_SPECS = {
+        "bookmarks": [
+            ("id_unique", [("id", 1)], UNIQUE_ID),
+            ("category_subcategory", [("category", 1), ("subcategory", 1)], {}),
+            ("status_type", [("status_type", 1)], {}),
+            ("last_checked", [("last_checked", 1)], {}),
+            # Keyset-Pagination; deckt als Präfix auch Bereichsabfragen auf date_added ab
+            ("date_added_id", [("date_added", 1), ("id", 1)], {}),
+            ("url_key", [("url_key", 1)], {}),
+            # Export: nach Kategorie gruppiert streamen
+            ("category_date_added", [("category", 1), ("date_added", 1), ("id", 1)], {}),
+            # Kategorie-Listen in Rang-Reihenfolge, id als eindeutiger Keyset-Schlüssel
+            ("category_rank_id", [("category", 1), ("rank", 1), ("id", 1)], {}),
+            # Volltextsuche; ohne Stemming, da Titel gemischt deutsch/englisch und URLs enthalten
+            ("text_search", [("title", "text"), ("url", "text"), ("description", "text"),
+                             ("category", "text"), ("subcategory", "text")], {
+                "weights": {"title": 10, "url": 5, "description": 3, "category": 2, "subcategory": 2},
+                "default_language": "none"
+            }),
+        ],
+        "categories": [
+            ("id_unique", [("id", 1)], UNIQUE_ID),
+            ("name_parent", [("name", 1), ("parent_category", 1)], {}),
+            ("parent_rank", [("parent_category", 1), ("rank", 1)], {}),
+        ],
+        "validation_jobs": [
+            ("id_unique", [("id", 1)], UNIQUE_ID),
+            ("status_created", [("status", 1), ("created_at", -1)], {}),
+        ],
+    }
+    
+    def __init__(self, database):
+        self.db = database
+    
+    async def ensure_indexes(self) -> Dict[str, List[str]]:
+        """Alle Indizes anlegen - bereits vorhandene werden von MongoDB ignoriert"""
+        created = {}
+        for collection_name, specs in self.INDEX_SPECS.items():
+            collection = self.db[collection_name]
+            created[collection_name] = []
+            for name, keys, options in specs:
+                try:
+                    await collection.create_index(keys, name=name, **options)
+                    created[collection_name].append(name)
+                except Exception as e:
+                    # z.B. doppelte ids bei unique oder abweichende Optionen - Start nicht blockieren
+                    logging.error(f"Could not create index {collection_name}.{name}: {e}")
+        
+        logging.info(f"Ensured MongoDB indexes: {created}")
+        return created
+    
+    async def get_index_stats(self) -> Dict[str, Any]:
+        """Index-Nutzung pro Collection über $indexStats"""
+        collections = {}
+        for collection_name in self.INDEX_SPECS:
+            stats = await self.db[collection_name].aggregate([{"$indexStats": {}}]).to_list(None)
+            collections[collection_name] = [
+                {
+                    "name": stat["name"],
+                    "key": dict(stat["key"]),
+                    "ops": stat.get("accesses", {}).get("ops", 0),
+                    "since": stat.get("accesses", {}).get("since"),
+                    "expected": any(stat["name"] == name for name, _, _ in self.INDEX_SPECS[collection_name]) or stat["name"] == "_id_"
+                }
+                for stat in stats
+            ]
+        
+        return {
+            "collections": collections,
+            "missing": {
+                collection_name: [
+                    name for name, _, _ in specs
+                    if name not in {stat["name"] for stat in collections[collection_name]}
+                ]
+                for collection_name, specs in self.INDEX_SPECS.items()
+            }
+        }
 
 class StatisticsManager:
     """Klasse für erweiterte Statistik-Verwaltung"""
     
     def __init__(self, database):
         self.db = database
+        self.category_manager: Optional["ModularCategoryManager"] = None  # für bookmark_count Deltas
     
-    async def generate_statistics(self) -> Statistics:
-        """Generiert umfassende Statistiken mit Unterkategorien"""
+    # Materialisiertes Statistik-Dokument (Collection "stats"), per $inc gepflegt
+    STATS_ID = "bookmarks"
+    NONE_KEY = "__none__"
+    EMPTY_KEY = "__empty__"
+    TRACKED_FIELDS = ("status_type", "is_locked", "category", "subcategory")
+    
+    @classmethod
+    def _encode_key(cls, name: Optional[str]) -> str:
+        """Kategorie-/Statusnamen als MongoDB-Feldnamen kodieren ('.' und '$' sind nicht erlaubt)"""
+        if name is None:
+            return cls.NONE_KEY
+        if name == "":
+            return cls.EMPTY_KEY
+        name = name.replace(".", "．")
+        return "＄" + name[1:] if name.startswith("$") else name
+    
+    @classmethod
+    def _decode_key(cls, key: str) -> Optional[str]:
+        if key == cls.NONE_KEY:
+            return None
+        if key == cls.EMPTY_KEY:
+            return ""
+        key = key.replace("．", ".")
+        return "$" + key[1:] if key.startswith("＄") else key
+    
+    @classmethod
+    def _group_delta(cls, group: dict, count: int) -> Dict[str, int]:
+        """$inc-Beitrag einer Gruppe gleicher (status_type, is_locked, category, subcategory)"""
+        status = group.get("status_type")
+        category = cls._encode_key(group.get("category"))
+        delta = {
+            "total": count,
+            f"status.{cls._encode_key(status)}": count,
+            f"categories.{category}": count
+        }
+        if status == "locked" or group.get("is_locked", False):
+            delta["locked"] = count
+        if group.get("subcategory"):
+            delta[f"subcategories.{category}.{cls._encode_key(group['subcategory'])}"] = count
+        return delta
+    
+    @classmethod
+    def _merge_delta(cls, target: Dict[str, int], delta: Dict[str, int], sign: int = 1):
+        for key, value in delta.items():
+            target[key] = target.get(key, 0) + sign * value
+    
+    async def _grouped(self, query: dict) -> List[dict]:
+        """Betroffene Bookmarks nach den statistikrelevanten Feldern gruppieren"""
+        pipeline = [
+            {"$match": query},
+            {"$group": {
+                "_id": {field: f"${field}" for field in self.TRACKED_FIELDS},
+                "count": {"$sum": 1}
+            }}
+        ]
+        return await self.db.bookmarks.aggregate(pipeline).to_list(None)
+    
+    async def apply_delta(self, delta: Dict[str, int], category_counts: bool = True):
+        """Deltas per $inc auf das Statistik-Dokument und die Kategorie-Zähler anwenden"""
+        delta = {key: value for key, value in delta.items() if value != 0}
+        if not delta:
+            return
+        await self.db.stats.update_one(
+            {"_id": self.STATS_ID},
+            {"$inc": delta, "$set": {"updated_at": datetime.now(timezone.utc)}},
+            upsert=True
+        )
+        if category_counts and self.category_manager is not None:
+            await self.category_manager.apply_count_delta(delta)
+    
+    async def record_insert(self, docs: List[dict]):
+        """Neu eingefügte Bookmarks zählen"""
+        delta = {}
+        for doc in docs:
+            self._merge_delta(delta, self._group_delta(doc, 1))
+        await self.apply_delta(delta)
+    
+    async def record_change(self, before_docs: List[dict], after_docs: List[dict]):
+        """Differenz zwischen altem und neuem Zustand derselben Bookmarks zählen"""
+        delta = {}
+        for doc in before_docs:
+            self._merge_delta(delta, self._group_delta(doc, 1), -1)
+        for doc in after_docs:
+            self._merge_delta(delta, self._group_delta(doc, 1))
+        await self.apply_delta(delta)
+    
+    async def record_update(self, query: dict, set_fields: dict, category_counts: bool = True):
+        """Vor einem update_one/update_many aufrufen: Delta aus dem $set ableiten"""
+        if not any(field in set_fields for field in self.TRACKED_FIELDS):
+            return
+        delta = {}
+        for group in await self._grouped(query):
+            before = group["_id"]
+            after = {**before, **{k: v for k, v in set_fields.items() if k in self.TRACKED_FIELDS}}
+            self._merge_delta(delta, self._group_delta(before, group["count"]), -1)
+            self._merge_delta(delta, self._group_delta(after, group["count"]))
+        await self.apply_delta(delta, category_counts)
+    
+    async def record_delete(self, query: dict):
+        """Vor einem delete_one/delete_many aufrufen"""
+        delta = {}
+        for group in await self._grouped(query):
+            self._merge_delta(delta, self._group_delta(group["_id"], group["count"]), -1)
+        await self.apply_delta(delta)
+    
+    async def reset(self):
+        """Statistik-Dokument leeren (nach dem Löschen aller Bookmarks)"""
+        await self.db.stats.replace_one(
+            {"_id": self.STATS_ID},
+            {"total": 0, "locked": 0, "status": {}, "categories": {}, "subcategories": {},
+             "initialized": True, "updated_at": datetime.now(timezone.utc)},
+            upsert=True
+        )
+    
+    @classmethod
+    def _flatten(cls, doc: Optional[dict]) -> Dict[str, int]:
+        """Statistik-Dokument in "pfad -> wert" umwandeln (für den Drift-Vergleich)"""
+        flat = {}
+        if not doc:
+            return flat
+        flat["total"] = doc.get("total", 0)
+        flat["locked"] = doc.get("locked", 0)
+        for section in ("status", "categories"):
+            for key, value in doc.get(section, {}).items():
+                flat[f"{section}.{key}"] = value
+        for category, subcategories in doc.get("subcategories", {}).items():
+            for key, value in subcategories.items():
+                flat[f"subcategories.{category}.{key}"] = value
+        return {key: value for key, value in flat.items() if value != 0}
+    
+    async def reconcile(self) -> Dict[str, Any]:
+        """Statistik-Dokument komplett neu berechnen und Abweichungen melden"""
+        counters = await self.aggregate_counters(default_category=None)
+        
+        new_doc = {"total": counters["total_bookmarks"], "locked": counters["locked_links"],
+                   "status": {}, "categories": {}, "subcategories": {}}
+        for status, count in counters["status_counts"].items():
+            key = self._encode_key(status)
+            new_doc["status"][key] = new_doc["status"].get(key, 0) + count
+        for category, count in counters["categories_distribution"].items():
+            new_doc["categories"][self._encode_key(category)] = count
+        for category, subcategories in counters["subcategories_distribution"].items():
+            new_doc["subcategories"][self._encode_key(category)] = {
+                self._encode_key(sub): count for sub, count in subcategories.items()
+            }
+        
+        old_flat = self._flatten(await self.db.stats.find_one({"_id": self.STATS_ID}))
+        new_flat = self._flatten(new_doc)
+        drift = {
+            key: {"stored": old_flat.get(key, 0), "actual": new_flat.get(key, 0)}
+            for key in set(old_flat) | set(new_flat)
+            if old_flat.get(key, 0) != new_flat.get(key, 0)
+        }
         
-        bookmarks = await self.db.bookmarks.find().to_list(100000)
-        categories = await self.db.categories.find().to_list(100000)
+        new_doc["initialized"] = True
+        new_doc["updated_at"] = datetime.now(timezone.utc)
+        await self.db.stats.replace_one({"_id": self.STATS_ID}, new_doc, upsert=True)
         
-        total_bookmarks = len(bookmarks)
-        total_categories = len(categories)
+        if drift:
+            logging.warning(f"Statistics drift corrected for {len(drift)} counters")
         
-        # Status-basierte Zählung
-        active_links = sum(1 for b in bookmarks if b.get('status_type') == 'active')
-        dead_links = sum(1 for b in bookmarks if b.get('status_type') == 'dead')
-        localhost_links = sum(1 for b in bookmarks if b.get('status_type') == 'localhost')
-        duplicate_links = sum(1 for b in bookmarks if b.get('status_type') == 'duplicate')
-        locked_links = sum(1 for b in bookmarks if b.get('status_type') == 'locked' or b.get('is_locked', False))
-        timeout_links = sum(1 for b in bookmarks if b.get('status_type') == 'timeout')
-        unchecked_links = sum(1 for b in bookmarks if not b.get('status_type') or b.get('status_type') == 'unchecked')
+        return {
+            "drift_count": len(drift),
+            "drift": drift,
+            "total_bookmarks": counters["total_bookmarks"],
+            "message": f"Statistics reconciled, {len(drift)} counters corrected"
+        }
+    
+    async def get_counters(self, default_category: str = "Nicht zugeordnet") -> Dict[str, Any]:
+        """Zähler aus dem materialisierten Dokument lesen (Punktabfrage)"""
+        doc = await self.db.stats.find_one({"_id": self.STATS_ID})
+        if not doc or not doc.get("initialized"):
+            await self.reconcile()
+            doc = await self.db.stats.find_one({"_id": self.STATS_ID})
+        
+        def category_name(key):
+            name = self._decode_key(key)
+            return default_category if name is None else name
+        
+        status_counts = {}
+        for key, count in doc.get("status", {}).items():
+            if count > 0:
+                status = self._decode_key(key)
+                status_counts[status] = status_counts.get(status, 0) + count
         
-        # Kategorien-Verteilung
         categories_distribution = {}
+        for key, count in doc.get("categories", {}).items():
+            if count > 0:
+                name = category_name(key)
+                categories_distribution[name] = categories_distribution.get(name, 0) + count
+        
         subcategories_distribution = {}
+        for key, subcategories in doc.get("subcategories", {}).items():
+            for sub_key, count in subcategories.items():
+                if count > 0:
+                    subcategories_distribution.setdefault(category_name(key), {})[self._decode_key(sub_key)] = count
         
-        for bookmark in bookmarks:
-            category = bookmark.get('category', 'Nicht zugeordnet')
-            subcategory = bookmark.get('subcategory')
-            
-            categories_distribution[category] = categories_distribution.get(category, 0) + 1
-            
-            if subcategory:
-                if category not in subcategories_distribution:
-                    subcategories_distribution[category] = {}
-                subcategories_distribution[category][subcategory] = subcategories_distribution[category].get(subcategory, 0) + 1
+        seven_days_ago = datetime.now(timezone.utc) - timedelta(days=7)
+        
+        return {
+            "total_bookmarks": doc.get("total", 0),
+            "total_categories": await self.db.categories.estimated_document_count(),
+            "status_counts": status_counts,
+            "locked_links": doc.get("locked", 0),
+            "recent_bookmarks": await self.db.bookmarks.count_documents({"date_added": {"$gt": seven_days_ago}}),
+            "categories_distribution": categories_distribution,
+            "subcategories_distribution": subcategories_distribution
+        }
+    
+    async def aggregate_counters(self, default_category: str = "Nicht zugeordnet") -> Dict[str, Any]:
+        """Alle Zähler in einer einzigen $facet-Aggregation auf dem Server berechnen"""
+        seven_days_ago = datetime.now(timezone.utc) - timedelta(days=7)
+        category_expr = {"$ifNull": ["$category", default_category]}
+        
+        pipeline = [
+            {"$facet": {
+                "total": [{"$count": "count"}],
+                "status": [{"$group": {"_id": "$status_type", "count": {"$sum": 1}}}],
+                "locked": [
+                    {"$match": {"$or": [{"status_type": "locked"}, {"is_locked": True}]}},
+                    {"$count": "count"}
+                ],
+                "categories": [{"$group": {"_id": category_expr, "count": {"$sum": 1}}}],
+                "subcategories": [
+                    {"$match": {"subcategory": {"$nin": [None, ""]}}},
+                    {"$group": {"_id": {"category": category_expr, "subcategory": "$subcategory"}, "count": {"$sum": 1}}}
+                ],
+                "recent": [
+                    {"$match": {"date_added": {"$gt": seven_days_ago}}},
+                    {"$count": "count"}
+                ]
+            }}
+        ]
+        
+        facets = (await self.db.bookmarks.aggregate(pipeline).to_list(1))[0]
+        
+        def single_count(facet):
+            return facets[facet][0]["count"] if facets[facet] else 0
+        
+        status_counts = {doc["_id"]: doc["count"] for doc in facets["status"]}
+        
+        categories_distribution = {doc["_id"]: doc["count"] for doc in facets["categories"]}
+        subcategories_distribution = {}
+        for doc in facets["subcategories"]:
+            category = doc["_id"]["category"]
+            subcategories_distribution.setdefault(category, {})[doc["_id"]["subcategory"]] = doc["count"]
+        
+        return {
+            "total_bookmarks": single_count("total"),
+            "total_categories": await self.db.categories.count_documents({}),
+            "status_counts": status_counts,
+            "locked_links": single_count("locked"),
+            "recent_bookmarks": single_count("recent"),
+            "categories_distribution": categories_distribution,
+            "subcategories_distribution": subcategories_distribution
+        }
+    
+    async def generate_statistics(self) -> Statistics:
+        """Generiert umfassende Statistiken mit Unterkategorien"""
+        counters = await self.get_counters()
+        status_counts = counters["status_counts"]
+        total_bookmarks = counters["total_bookmarks"]
+        categories_distribution = counters["categories_distribution"]
+        subcategories_distribution = counters["subcategories_distribution"]
         
         # Top Kategorien
         top_categories = [
@@ -940,33 +3220,222 @@ class StatisticsManager:
             for cat, count in sorted(categories_distribution.items(), key=lambda x: x[1], reverse=True)
         ]
         
-        # Kürzlich hinzugefügte Bookmarks
-        from datetime import timedelta
-        seven_days_ago = datetime.now(timezone.utc) - timedelta(days=7)
-        recent_bookmarks = sum(
-            1 for b in bookmarks 
-            if b.get('date_added') and 
-            (datetime.fromisoformat(b['date_added'].replace('Z', '+00:00')).replace(tzinfo=timezone.utc) if isinstance(b['date_added'], str) 
-             else (b['date_added'].replace(tzinfo=timezone.utc) if b['date_added'].tzinfo is None else b['date_added'])) > seven_days_ago
-        )
-        
         return Statistics(
             total_bookmarks=total_bookmarks,
-            total_categories=total_categories,
-            active_links=active_links,
-            dead_links=dead_links,
-            localhost_links=localhost_links,
-            duplicate_links=duplicate_links,
-            locked_links=locked_links,
-            timeout_links=timeout_links,
-            unchecked_links=unchecked_links,
+            total_categories=counters["total_categories"],
+            active_links=status_counts.get('active', 0),
+            dead_links=status_counts.get('dead', 0),
+            localhost_links=status_counts.get('localhost', 0),
+            duplicate_links=status_counts.get('duplicate', 0),
+            locked_links=counters["locked_links"],
+            timeout_links=status_counts.get('timeout', 0),
+            unchecked_links=status_counts.get(None, 0) + status_counts.get('', 0) + status_counts.get('unchecked', 0),
             categories_distribution=categories_distribution,
             subcategories_distribution=subcategories_distribution,
             top_categories=top_categories,
-            recent_bookmarks=recent_bookmarks,
+            recent_bookmarks=counters["recent_bookmarks"],
             last_updated=datetime.now(timezone.utc)
         )
 
+# NDJSON-Streaming: Batchgröße des Motor-Cursors und Zeilen pro gesendetem Block
+STREAM_BATCH_SIZE = int(os.environ.get('BOOKMARK_STREAM_BATCH', 500))
+STREAM_FLUSH_LINES = 100
+
+class BookmarkPaginator:
+    """Keyset-Pagination über (date_added, id), (rank, id) bzw. (score, id) mit opakem Cursor und optionaler Feld-Projektion"""
+    
+    DEFAULT_LIMIT = int(os.environ.get('BOOKMARK_PAGE_SIZE', 200))
+    MAX_LIMIT = 1000
+    SORT = [("date_added", 1), ("id", 1)]
+    # Innerhalb einer Kategorie: vom Nutzer festgelegte Reihenfolge (RankManager)
+    RANK_SORT = [("rank", 1), ("id", 1)]
+    
+    def __init__(self, database):
+        self.db = database
+    
+    @staticmethod
+    def _pack(payload: Dict[str, Any]) -> str:
+        raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+    
+    @staticmethod
+    def _unpack(cursor: str) -> Dict[str, Any]:
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            if not isinstance(payload, dict) or "i" not in payload:
+                raise ValueError(cursor)
+            return payload
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    @classmethod
+    def encode_cursor(cls, doc: dict, ranked: bool = False) -> str:
+        """Position hinter dem letzten Dokument einer Seite als opaken Cursor kodieren"""
+        if ranked:
+            return cls._pack({"r": doc.get("rank"), "i": doc.get("id")})
+        date_added = doc.get("date_added")
+        return cls._pack({
+            "d": date_added.isoformat() if isinstance(date_added, datetime) else date_added,
+            "i": doc.get("id")
+        })
+    
+    @classmethod
+    def decode_cursor(cls, cursor: str, ranked: bool = False) -> Dict[str, Any]:
+        """Cursor in eine Keyset-Bedingung umwandeln"""
+        payload = cls._unpack(cursor)
+        if ranked:
+            if "r" not in payload:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            rank, last_id = payload["r"], payload["i"]
+            if rank is None:
+                # Ungerankte (Import vor dem nächsten Rebalance) sortiert MongoDB vor alle Ränge
+                return {"$or": [{"rank": None, "id": {"$gt": last_id}}, {"rank": {"$type": "string"}}]}
+            return {"$or": [{"rank": {"$gt": rank}}, {"rank": rank, "id": {"$gt": last_id}}]}
+        try:
+            date_added = datetime.fromisoformat(payload["d"]) if payload.get("d") else None
+        except (ValueError, KeyError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        last_id = payload["i"]
+        if date_added is None:
+            # Bookmarks ohne Datum sortiert MongoDB vor alle datierten
+            return {"$or": [{"date_added": None, "id": {"$gt": last_id}}, {"date_added": {"$ne": None}}]}
+        
+        return {"$or": [
+            {"date_added": {"$gt": date_added}},
+            {"date_added": date_added, "id": {"$gt": last_id}}
+        ]}
+    
+    @staticmethod
+    def projection(fields: Optional[str]) -> Optional[Dict[str, int]]:
+        """fields=title,url,... in eine Projektion übersetzen (id und date_added immer für den Cursor)"""
+        if not fields:
+            return None
+        requested = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [field for field in requested if field not in Bookmark.__fields__]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        projection = {"_id": 0, "id": 1, "date_added": 1}
+        projection.update({field: 1 for field in requested})
+        return projection
+    
+    def _limit(self, limit: Optional[int]) -> int:
+        return min(limit or self.DEFAULT_LIMIT, self.MAX_LIMIT)
+    
+    @staticmethod
+    def _items(docs: List[dict], projection: Optional[Dict[str, int]]) -> list:
+        if projection is None:
+            return [Bookmark(**doc) for doc in docs]
+        return docs
+    
+    async def fetch_page(self, query: Dict[str, Any], limit: Optional[int] = None,
+                         cursor: Optional[str] = None, fields: Optional[str] = None,
+                         ranked: bool = False) -> Dict[str, Any]:
+        """Eine Seite laden; next_cursor ist None auf der letzten Seite
+        
+        ranked=True sortiert nach Rang (Listen innerhalb einer Kategorie)."""
+        limit = self._limit(limit)
+        projection = self.projection(fields)
+        if projection is not None and ranked:
+            projection["rank"] = 1
+        if cursor:
+            keyset = self.decode_cursor(cursor, ranked)
+            query = {"$and": [query, keyset]} if query else keyset
+        
+        # Ein Dokument mehr lesen, um das Ende ohne zusätzliche Zählung zu erkennen
+        sort = self.RANK_SORT if ranked else self.SORT
+        docs = await self.db.bookmarks.find(query, projection).sort(sort).limit(limit + 1).to_list(limit + 1)
+        has_more = len(docs) > limit
+        docs = docs[:limit]
+        
+        return {
+            "items": self._items(docs, projection),
+            "next_cursor": self.encode_cursor(docs[-1], ranked) if has_more and docs else None
+        }
+    
+    # Höchstens so viele Textindex-Treffer (nach Relevanz); die Teilwortsuche schließt genau diese aus
+    TEXT_HIT_LIMIT = 1000
+    
+    @staticmethod
+    def text_terms(text: str) -> str:
+        """Eingabe für $search ohne Operatoren: keine Phrasen ("...") und keine Negation (-wort)"""
+        return " ".join(term.lstrip("-") for term in text.replace('"', " ").split() if term.lstrip("-"))
+    
+    def _text_pipeline(self, terms: str) -> List[Dict[str, Any]]:
+        return [
+            {"$match": {"$text": {"$search": terms}}},
+            {"$addFields": {"score": {"$meta": "textScore"}}},
+            {"$sort": {"score": -1, "id": 1}},
+            {"$limit": self.TEXT_HIT_LIMIT},
+        ]
+    
+    async def _substring_query(self, text: str, terms: str) -> Dict[str, Any]:
+        """Teilwortsuche ohne die Bookmarks, die bereits über den Textindex geliefert werden"""
+        query = BookmarkManager.search_query(text)
+        if not terms:
+            return query
+        try:
+            hits = await self.db.bookmarks.aggregate(
+                self._text_pipeline(terms) + [{"$project": {"_id": 0, "id": 1}}]
+            ).to_list(None)
+        except OperationFailure:
+            return query
+        return {"$and": [query, {"id": {"$nin": [hit["id"] for hit in hits]}}]} if hits else query
+    
+    async def search_page(self, text: str, limit: Optional[int] = None,
+                          cursor: Optional[str] = None, fields: Optional[str] = None) -> Dict[str, Any]:
+        """Suche für die Eingabe beim Tippen: zuerst die Treffer des gewichteten Textindex nach Relevanz
+        (Keyset auf score, id), danach die escapte Teilwortsuche ohne diese Treffer (Keyset auf date_added, id).
+        
+        Der Textindex findet nur ganze Wörter, die Teilwortsuche ergänzt z.B. "GitHub" zu "git".
+        Der Cursor trägt in der ersten Phase "s", in der zweiten "d". Fehlt der Textindex
+        (Indexaufbau fehlgeschlagen), bleibt nur die Teilwortsuche.
+        """
+        terms = self.text_terms(text)
+        position = self._unpack(cursor) if cursor else None
+        if position is not None and "s" not in position:
+            return await self.fetch_page(await self._substring_query(text, terms), limit, cursor, fields)
+        
+        limit = self._limit(limit)
+        projection = self.projection(fields)
+        
+        docs = []
+        if terms:
+            pipeline = self._text_pipeline(terms)
+            if position is not None:
+                pipeline.append({"$match": {"$or": [
+                    {"score": {"$lt": position["s"]}},
+                    {"score": position["s"], "id": {"$gt": position["i"]}}
+                ]}})
+            pipeline += [
+                {"$limit": limit + 1},
+                {"$project": dict(projection, score=1) if projection else {"_id": 0}},
+            ]
+            try:
+                docs = await self.db.bookmarks.aggregate(pipeline).to_list(limit + 1)
+            except OperationFailure as e:
+                logging.warning(f"Text search unavailable, using substring search: {e}")
+                terms = ""
+        
+        if len(docs) > limit:
+            docs = docs[:limit]
+            return {
+                "items": self._items(docs, projection),
+                "next_cursor": self._pack({"s": docs[-1]["score"], "i": docs[-1]["id"]})
+            }
+        
+        # Textindex-Treffer erschöpft - Seite mit der Teilwortsuche auffüllen
+        query = await self._substring_query(text, terms)
+        remaining = limit - len(docs)
+        if remaining:
+            page = await self.fetch_page(query, remaining, None, fields)
+            return {"items": self._items(docs, projection) + page["items"], "next_cursor": page["next_cursor"]}
+        # Seite voll: die Folgeseite beginnt am Anfang der Teilwortsuche (Cursor vor allen Datumswerten)
+        has_more = await self.db.bookmarks.find_one(query, {"_id": 1}) is not None
+        return {
+            "items": self._items(docs, projection),
+            "next_cursor": self._pack({"d": None, "i": ""}) if has_more else None
+        }
+
 class BookmarkManager:
     """Hauptklasse für Bookmark-Verwaltung"""
     
@@ -974,10 +3443,27 @@ class BookmarkManager:
         self.db = database
         self.parser = BookmarkParser()
         self.validator = LinkValidator()
-        self.duplicate_detector = DuplicateDetector()
-        self.category_manager = ModularCategoryManager(database)
         self.statistics_manager = StatisticsManager(database)
-        self.export_manager = ExportManager()
+        self.validation_jobs = ValidationJobManager(database, self.validator, self.statistics_manager)
+        self.duplicate_detector = DuplicateDetector(database)
+        self.near_duplicate_detector = NearDuplicateDetector(database)
+        self.import_pipeline = ImportPipeline(database, self.duplicate_detector, self.statistics_manager)
+        self.category_manager = ModularCategoryManager(database, self.statistics_manager)
+        self.statistics_manager.category_manager = self.category_manager
+        self.rank_manager = RankManager(database)
+        self.category_manager.rank_manager = self.rank_manager
+        self.category_tree = CategoryTreeCache(database)
+        self.changes = ChangeTracker()
+        self.changes.subscribe(self.category_tree.invalidate)
+        self.validation_jobs.changes = self.changes
+        self.rank_manager.changes = self.changes
+        self.change_feed = ChangeFeed(database)
+        self.category_manager.change_feed = self.change_feed
+        self.validation_jobs.change_feed = self.change_feed
+        self.index_manager = IndexManager(database)
+        self.paginator = BookmarkPaginator(database)
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        self.export_manager = ExportManager(database)
     
     async def create_sample_bookmarks(self) -> Dict[str, Any]:
         """Erstellt 30 Beispiel-Bookmarks mit Unterkategorien"""
@@ -1036,12 +3522,14 @@ class BookmarkManager:
         ]
         
         created_count = 0
+        created_docs = []
         for bookmark_data in sample_bookmarks:
             bookmark = Bookmark(**bookmark_data)
             await self.db.bookmarks.insert_one(bookmark.dict())
+            created_docs.append(bookmark.dict())
             created_count += 1
         
-        await self.category_manager.update_bookmark_counts()
+        await self.statistics_manager.record_insert(created_docs)
         
         return {
             "created_count": created_count,
@@ -1053,6 +3541,7 @@ class BookmarkManager:
         # Bereinigung vor Neuerstellung
         await self.db.bookmarks.delete_many({})
         await self.db.categories.delete_many({})
+        await self.statistics_manager.reset()
         
         created_bookmarks = []
         
@@ -1190,7 +3679,8 @@ class BookmarkManager:
                     "is_dead_link": is_dead,
                     "is_locked": is_locked,
                     "status_type": status_type,
-                    "last_checked": None
+                    "last_checked": None,
+                    "url_key": canonicalize_url(bookmark_data["url"])
                 }
                 
                 await self.db.bookmarks.insert_one(bookmark_dict)
@@ -1198,8 +3688,7 @@ class BookmarkManager:
                 status_counts[status_type] += 1
                 total_created += 1
         
-        # Update categories
-        await self.category_manager.update_bookmark_counts()
+        await self.statistics_manager.record_insert(created_bookmarks)
         
         return {
             "message": f"Created {total_created} modular test bookmarks with exact status distribution",
@@ -1273,12 +3762,12 @@ class BookmarkManager:
                 for category in categories_to_insert:
                     await self.db.categories.update_one(
                         {"name": category["name"]},
-                        {"$set": category},
+                        {"$set": category, "$setOnInsert": {"id": str(uuid.uuid4())}},
                         upsert=True  # Erstelle nur wenn nicht vorhanden
                     )
             
-            # Update bookmark counts
-            await self.category_manager.update_bookmark_counts()
+            # Vollständige Neuberechnung (Wartungsjob)
+            await self.category_manager.recompute_bookmark_counts()
             
             return {
                 "message": f"Initialized {len(categories_to_insert)} categories",
@@ -1306,76 +3795,155 @@ class BookmarkManager:
         else:
             raise HTTPException(status_code=400, detail="Unsupported file type")
         
-        logging.info(f"Parsed {len(bookmark_data)} bookmarks from {file_type} file")
+        report = await self.import_pipeline.run(bookmark_data)
+        return self._import_result(report, f"{file_type} file", f"{len(content)} characters")
+    
+    async def import_upload(self, upload: UploadFile, file_type: str) -> Dict[str, Any]:
+        """Upload blockweise lesen und inkrementell parsen - Speicherbedarf proportional zur Blockgröße"""
+        parser = self.parser.incremental_parser(file_type)
+        if parser is None:
+            if file_type.lower() != 'json':
+                raise HTTPException(status_code=400, detail="Unsupported file type")
+            # JSON braucht das vollständige Dokument - direkt aus bytes dekodieren
+            content = await upload.read()
+            report = await self.import_pipeline.run(self.parser.parse_json_bookmarks(content))
+            return self._import_result(report, f"{file_type} file", f"{len(content)} bytes")
+        
+        logging.info(f"Importing bookmarks: file_type={file_type}, chunked upload")
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        received = {"bytes": 0}
+        
+        async def records():
+            while True:
+                chunk = await upload.read(IMPORT_CHUNK_SIZE)
+                if not chunk:
+                    break
+                received["bytes"] += len(chunk)
+                for record in parser.feed(decoder.decode(chunk)):
+                    yield record
+            for record in parser.feed(decoder.decode(b"", final=True)) + parser.close():
+                yield record
+        
+        report = await self.import_pipeline.run(records())
+        report["bytes_read"] = received["bytes"]
+        return self._import_result(report, f"{file_type} file", f"{received['bytes']} bytes")
+    
+    def _get_parse_pool(self) -> ProcessPoolExecutor:
+        if self._parse_pool is None:
+            # Kein fork: der Elternprozess hat Threads (Motor/pymongo-Monitore, aiohttp) - geforkte Worker
+            # könnten auf deren Locks hängen bleiben. Der Forkserver startet Worker aus einem sauberen Prozess.
+            self._parse_pool = ProcessPoolExecutor(
+                max_workers=IMPORT_PARSE_WORKERS, mp_context=multiprocessing.get_context("forkserver")
+            )
+        return self._parse_pool
+    
+    def close_parse_pool(self):
+        """Worker-Prozesse beim Herunterfahren beenden"""
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=False, cancel_futures=True)
+            self._parse_pool = None
+    
+    async def import_files(self, uploads: List[UploadFile]) -> Dict[str, Any]:
+        """Mehrere Exporte parallel im Prozess-Pool parsen und dateiübergreifend dedupliziert importieren
         
-        if not bookmark_data:
-            return {
-                "imported_count": 0,
-                "message": f"No valid bookmarks found in {file_type} file",
-                "details": f"File contained {len(content)} characters but no bookmarks were extracted"
-            }
+        Der Event-Loop parst nichts selbst; Dateien werden in Upload-Reihenfolge eingefügt,
+        sobald ihr Parse-Ergebnis vorliegt, während die übrigen noch im Pool laufen.
+        """
+        loop = asyncio.get_running_loop()
+        pool = self._get_parse_pool()
+        files = []
+        
+        for upload in uploads:
+            file_type = (upload.filename or '').split('.')[-1].lower()
+            entry = {"filename": upload.filename, "file_type": file_type, "parsed": 0, "error": None}
+            if file_type in self.parser.supported_formats:
+                content = await upload.read()
+                entry["task"] = loop.run_in_executor(pool, parse_bookmark_file, content, file_type)
+            else:
+                entry["error"] = "Unsupported file type"
+            files.append(entry)
         
-        # Convert to Bookmark objects
-        valid_bookmarks = []
-        for data in bookmark_data:
-            try:
-                # Ensure required fields
-                if not data.get('title') or not data.get('url'):
+        async def records():
+            for entry in files:
+                task = entry.pop("task", None)
+                if task is None:
                     continue
-                    
-                bookmark = Bookmark(
-                    id=str(uuid.uuid4()),
-                    title=data['title'],
-                    url=data['url'],
-                    category=data.get('category', 'Imported'),
-                    subcategory=data.get('subcategory', ''),
-                    created_at=datetime.utcnow(),
-                    is_dead_link=False
-                )
-                valid_bookmarks.append(bookmark)
-            except Exception as e:
-                logging.warning(f"Failed to create bookmark from data {data}: {e}")
-                continue
-        
-        logging.info(f"Created {len(valid_bookmarks)} valid bookmark objects")
-        
-        # Remove duplicates
-        unique_bookmarks = self.duplicate_detector.remove_duplicates(valid_bookmarks)
-        logging.info(f"After duplicate removal: {len(unique_bookmarks)} bookmarks")
-        
-        # Insert into database
-        inserted_count = 0
-        for bookmark in unique_bookmarks:
-            try:
-                await self.db.bookmarks.insert_one(bookmark.dict())
-                inserted_count += 1
-            except Exception as e:
-                logging.error(f"Failed to insert bookmark {bookmark.title}: {e}")
+                try:
+                    parsed = await task
+                except BrokenProcessPool as e:
+                    # Abgestürzter Worker macht den Pool unbrauchbar - beim nächsten Import neu anlegen
+                    self._parse_pool = None
+                    entry["error"] = f"Parser process failed: {e}"
+                    continue
+                except Exception as e:
+                    entry["error"] = str(e)
+                    continue
+                entry["parsed"] = len(parsed)
+                for record in parsed:
+                    yield record
         
-        logging.info(f"Successfully inserted {inserted_count} bookmarks into database")
+        report = await self.import_pipeline.run(records())
+        report["files"] = files
+        return self._import_result(report, f"{len(files)} files", "no parsable content")
+    
+    def _import_result(self, report: Dict[str, Any], source: str, size: str) -> Dict[str, Any]:
+        """Import-Bericht loggen und um die Meldung ergänzen"""
+        logging.info(
+            f"Imported {report['imported_count']} of {report['total_parsed']} bookmarks from {source} "
+            f"in {report['duration_seconds']}s ({report['rows_per_second']} rows/s, {report['failed_count']} failed)"
+        )
         
-        await self.category_manager.update_bookmark_counts()
+        if not report["total_parsed"]:
+            result = {
+                "imported_count": 0,
+                "message": f"No valid bookmarks found in {source}",
+                "details": f"File contained {size} but no bookmarks were extracted"
+            }
+            if "files" in report:
+                result["files"] = report["files"]
+            return result
         
-        return {
-            "imported_count": inserted_count,
-            "total_parsed": len(bookmark_data),
-            "valid_bookmarks": len(valid_bookmarks),
-            "after_deduplication": len(unique_bookmarks),
-            "message": f"Successfully imported {inserted_count} bookmarks from {file_type} file"
-        }
+        report["message"] = f"Successfully imported {report['imported_count']} bookmarks from {source}"
+        return report
     
     async def get_all_bookmarks(self) -> List[Bookmark]:
-        """Alle Bookmarks abrufen"""
-        bookmarks = await self.db.bookmarks.find().to_list(100000)
+        """Alle Bookmarks abrufen (je Kategorie in Rang-Reihenfolge)"""
+        bookmarks = await self.db.bookmarks.find().sort([("category", 1), *BookmarkPaginator.RANK_SORT]).to_list(100000)
         return [Bookmark(**bookmark) for bookmark in bookmarks]
     
-    async def get_bookmarks_by_category(self, category: str, subcategory: Optional[str] = None) -> List[Bookmark]:
-        """Bookmarks nach Kategorie und optional Unterkategorie filtern"""
+    async def stream_bookmarks(self, query: Optional[Dict[str, Any]] = None,
+                               projection: Optional[Dict[str, int]] = None):
+        """Bookmarks als NDJSON direkt aus dem Motor-Cursor liefern (ohne to_list und Pydantic)"""
+        def encode(value):
+            return value.isoformat() if isinstance(value, datetime) else str(value)
+        
+        cursor = self.db.bookmarks.find(
+            query or {}, projection or {"_id": 0}, batch_size=STREAM_BATCH_SIZE
+        ).sort(BookmarkPaginator.SORT)
+        
+        lines = []
+        async for doc in cursor:
+            lines.append(json.dumps(doc, default=encode, ensure_ascii=False))
+            # Kleine Blöcke senden, damit die ersten Bytes vor dem Ende der Abfrage ankommen
+            if len(lines) >= STREAM_FLUSH_LINES:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if lines:
+            yield "\n".join(lines) + "\n"
+    
+    @staticmethod
+    def category_query(category: str, subcategory: Optional[str] = None) -> Dict[str, Any]:
+        """Filter für Kategorie und optional Unterkategorie"""
         query = {"category": category}
         if subcategory:
             query["subcategory"] = subcategory
+        return query
+    
+    async def get_bookmarks_by_category(self, category: str, subcategory: Optional[str] = None) -> List[Bookmark]:
+        """Bookmarks nach Kategorie und optional Unterkategorie filtern"""
+        query = self.category_query(category, subcategory)
             
-        bookmarks = await self.db.bookmarks.find(query).to_list(100000)
+        bookmarks = await self.db.bookmarks.find(query).sort(BookmarkPaginator.RANK_SORT).to_list(100000)
         return [Bookmark(**bookmark) for bookmark in bookmarks]
     
     async def create_bookmark(self, bookmark_data: BookmarkCreate) -> Bookmark:
@@ -1388,15 +3956,27 @@ class BookmarkManager:
         elif bookmark_dict.get("status_type") == "locked":
             bookmark_dict["is_locked"] = True
             
+        bookmark_dict["rank"] = await self.rank_manager.rank_at("bookmarks", {"category": bookmark_dict["category"]})
         bookmark = Bookmark(**bookmark_dict)
         await self.db.bookmarks.insert_one(bookmark.dict())
-        await self.category_manager.update_bookmark_counts()
+        await self.statistics_manager.record_insert([bookmark.dict()])
+        self.change_feed.publish("bookmarks", "insert", [bookmark.id], doc=bookmark.dict())
         return bookmark
     
     async def update_bookmark(self, bookmark_id: str, update_data: BookmarkUpdate) -> Bookmark:
         """Bookmark aktualisieren"""
         update_dict = {k: v for k, v in update_data.dict().items() if v is not None}
+        if "url" in update_dict:
+            update_dict["url_key"] = canonicalize_url(update_dict["url"])
+        if "category" in update_dict:
+            existing = await self.db.bookmarks.find_one({"id": bookmark_id}, {"_id": 0, "category": 1})
+            if existing and existing.get("category") != update_dict["category"]:
+                # Neue Kategorie: ans Ende der neuen Geschwister einsortieren
+                update_dict["rank"] = await self.rank_manager.rank_at(
+                    "bookmarks", {"category": update_dict["category"]}, exclude_id=bookmark_id
+                )
         
+        await self.statistics_manager.record_update({"id": bookmark_id}, update_dict)
         result = await self.db.bookmarks.update_one(
             {"id": bookmark_id},
             {"$set": update_dict}
@@ -1404,8 +3984,7 @@ class BookmarkManager:
         
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Bookmark not found")
-        
-        await self.category_manager.update_bookmark_counts()
+        self.change_feed.publish("bookmarks", "update", [bookmark_id], fields=update_dict)
         
         # Return updated bookmark
         updated_bookmark = await self.db.bookmarks.find_one({"id": bookmark_id})
@@ -1413,61 +3992,59 @@ class BookmarkManager:
     
     async def move_bookmarks(self, move_data: BookmarkMove) -> Dict[str, Any]:
         """Bookmarks in andere Kategorie verschieben"""
-        result = await self.db.bookmarks.update_many(
-            {"id": {"$in": move_data.bookmark_ids}},
-            {"$set": {
-                "category": move_data.target_category,
-                "subcategory": move_data.target_subcategory
-            }}
-        )
-        
-        await self.category_manager.update_bookmark_counts()
-        
-        return {
-            "moved_count": result.modified_count,
-            "message": f"Moved {result.modified_count} bookmarks to {move_data.target_category}"
+        move_query = {"id": {"$in": move_data.bookmark_ids}}
+        move_fields = {
+            "category": move_data.target_category,
+            "subcategory": move_data.target_subcategory
         }
-    
-    async def validate_all_links(self) -> Dict[str, Any]:
-        """Alle Links validieren"""
-        bookmarks = await self.get_all_bookmarks()
-        validated_bookmarks = await self.validator.validate_bookmarks(bookmarks)
         
-        for bookmark in validated_bookmarks:
-            await self.db.bookmarks.update_one(
-                {"id": bookmark.id},
-                {"$set": bookmark.dict()}
-            )
+        # Verschobene Bookmarks in Auswahl-Reihenfolge hinter die bisherigen Einträge der Zielkategorie
+        bookmark_ids = list(dict.fromkeys(move_data.bookmark_ids))
+        ranks = await self.rank_manager.ranks_at_end(
+            "bookmarks", {"category": move_data.target_category}, len(bookmark_ids), exclude_ids=bookmark_ids
+        )
         
-        dead_links = [b for b in validated_bookmarks if b.is_dead_link]
+        await self.statistics_manager.record_update(move_query, move_fields)
+        modified_count = 0
+        if bookmark_ids:
+            result = await self.db.bookmarks.bulk_write([
+                UpdateOne({"id": bookmark_id}, {"$set": {**move_fields, "rank": rank}})
+                for bookmark_id, rank in zip(bookmark_ids, ranks)
+            ], ordered=False)
+            modified_count = result.modified_count
+            self.change_feed.publish("bookmarks", "update", items=[
+                {"id": bookmark_id, "fields": {**move_fields, "rank": rank}} for bookmark_id, rank in zip(bookmark_ids, ranks)
+            ])
         
         return {
-            "total_checked": len(validated_bookmarks),
-            "dead_links_found": len(dead_links),
-            "message": f"Validation complete. Found {len(dead_links)} dead links."
+            "moved_count": modified_count,
+            "message": f"Moved {modified_count} bookmarks to {move_data.target_category}"
         }
     
-    async def find_and_remove_duplicates(self) -> Dict[str, Any]:
-        """Duplikate finden und entfernen"""
-        bookmarks = await self.get_all_bookmarks()
-        duplicates = self.duplicate_detector.find_duplicates(bookmarks)
-        
-        removed_count = 0
-        for duplicate_group in duplicates:
-            # Fix datetime comparison issue by normalizing timezones
-            def get_comparable_date(bookmark):
-                date = bookmark.date_added
-                if date.tzinfo is None:
-                    # Make timezone-naive datetime timezone-aware (UTC)
-                    return date.replace(tzinfo=timezone.utc)
-                return date
-            
-            sorted_group = sorted(duplicate_group, key=get_comparable_date, reverse=True)
-            for bookmark in sorted_group[1:]:
-                await self.db.bookmarks.delete_one({"id": bookmark.id})
-                removed_count += 1
+    async def validate_all_links(self, mode: str = "all", max_age_hours: Optional[float] = None, write_chunk_size: Optional[int] = None) -> Dict[str, Any]:
+        """Link-Validierung als Hintergrund-Job starten"""
+        job = await self.validation_jobs.start_job(mode, max_age_hours, write_chunk_size)
+        job["message"] = f"Validation job {job['id']} started for {job['total']} bookmarks"
+        return job
+    
+    async def find_and_remove_duplicates(self, dry_run: bool = False) -> Dict[str, Any]:
+        """Duplikate finden und entfernen (das neueste Bookmark je Gruppe bleibt)"""
+        duplicates = await self.duplicate_detector.duplicate_groups()
+        # Gruppen sind aufsteigend nach date_added sortiert
+        removed = [bookmark for group in duplicates for bookmark in group[:-1]]
         
-        await self.category_manager.update_bookmark_counts()
+        if dry_run:
+            return {
+                "dry_run": True,
+                "duplicates_found": len(duplicates),
+                "bookmarks_removed": 0,
+                "would_remove": len(removed),
+                "groups": self.duplicate_detector.describe_groups(duplicates, keep_newest=True),
+                "message": f"Would remove {len(removed)} duplicate bookmarks"
+            }
+        
+        removed_count = await self.duplicate_detector.bulk_by_ids(DeleteMany, [b["id"] for b in removed])
+        await self.statistics_manager.record_change(removed, [])
         
         return {
             "duplicates_found": len(duplicates),
@@ -1479,16 +4056,18 @@ class BookmarkManager:
         """Alle Bookmarks löschen"""
         result = await self.db.bookmarks.delete_many({})
         await self.db.categories.delete_many({})
+        await self.statistics_manager.reset()
         
         return {
             "deleted_count": result.deleted_count,
             "message": f"Deleted {result.deleted_count} bookmarks"
         }
     
-    async def search_bookmarks(self, query: str) -> List[Bookmark]:
-        """Bookmarks durchsuchen - erweitert um Beschreibung"""
-        search_regex = {"$regex": query, "$options": "i"}
-        bookmarks = await self.db.bookmarks.find({
+    @staticmethod
+    def search_query(query: str) -> Dict[str, Any]:
+        """Teilwortsuche in Titel, URL, Kategorie, Unterkategorie und Beschreibung - Eingabe wird escaped, nicht als Regex interpretiert"""
+        search_regex = {"$regex": re.escape(query), "$options": "i"}
+        return {
             "$or": [
                 {"title": search_regex},
                 {"url": search_regex},
@@ -1496,9 +4075,12 @@ class BookmarkManager:
                 {"subcategory": search_regex},
                 {"description": search_regex}
             ]
-        }).to_list(100000)
-        
-        return [Bookmark(**bookmark) for bookmark in bookmarks]
+        }
+    
+    async def search_bookmarks(self, query: str, limit: Optional[int] = None) -> List[Bookmark]:
+        """Bookmarks durchsuchen - nach Relevanz sortiert (erste Seite)"""
+        page = await self.paginator.search_page(query, limit)
+        return page["items"]
 
 # Globale BookmarkManager Instanz
 bookmark_manager = BookmarkManager(db)
@@ -1519,38 +4101,14 @@ async def create_test_data():
 @api_router.get("/statistics", response_model=Statistics)
 async def get_statistics():
     """Erweiterte Statistiken mit Unterkategorien abrufen"""
-    # Get all bookmarks
-    bookmarks = await db.bookmarks.find().to_list(100000)
-    categories = await db.categories.find().to_list(100000)
-    
-    # Count by status_type
-    total_bookmarks = len(bookmarks)
-    active_links = len([b for b in bookmarks if b.get('status_type') == 'active'])
-    dead_links = len([b for b in bookmarks if b.get('status_type') == 'dead'])
-    localhost_links = len([b for b in bookmarks if b.get('status_type') == 'localhost'])
-    duplicate_links = len([b for b in bookmarks if b.get('status_type') == 'duplicate'])
-    locked_links = len([b for b in bookmarks if b.get('status_type') == 'locked' or b.get('is_locked', False)])
-    timeout_links = len([b for b in bookmarks if b.get('status_type') == 'timeout'])
-    unchecked_links = len([b for b in bookmarks if b.get('status_type') == 'unchecked'])
-    
-    # Categories distribution
-    categories_distribution = {}
-    subcategories_distribution = {}
+    # Punktabfrage auf das materialisierte Statistik-Dokument
+    counters = await bookmark_manager.statistics_manager.get_counters(default_category='Uncategorized')
+    status_counts = counters["status_counts"]
+    total_bookmarks = counters["total_bookmarks"]
+    categories_distribution = counters["categories_distribution"]
+    subcategories_distribution = counters["subcategories_distribution"]
     top_categories = []
     
-    for bookmark in bookmarks:
-        category = bookmark.get('category', 'Uncategorized')
-        subcategory = bookmark.get('subcategory')
-        
-        # Count categories
-        categories_distribution[category] = categories_distribution.get(category, 0) + 1
-        
-        # Count subcategories
-        if subcategory:
-            if category not in subcategories_distribution:
-                subcategories_distribution[category] = {}
-            subcategories_distribution[category][subcategory] = subcategories_distribution[category].get(subcategory, 0) + 1
-    
     # Generate top categories
     for cat, count in sorted(categories_distribution.items(), key=lambda x: x[1], reverse=True)[:6]:
         top_categories.append({
@@ -1562,21 +4120,29 @@ async def get_statistics():
     
     return {
         "total_bookmarks": total_bookmarks,
-        "total_categories": len(categories),
-        "active_links": active_links,
-        "dead_links": dead_links,
-        "localhost_links": localhost_links,
-        "duplicate_links": duplicate_links,
-        "locked_links": locked_links,
-        "timeout_links": timeout_links,
-        "unchecked_links": unchecked_links,
+        "total_categories": counters["total_categories"],
+        "active_links": status_counts.get('active', 0),
+        "dead_links": status_counts.get('dead', 0),
+        "localhost_links": status_counts.get('localhost', 0),
+        "duplicate_links": status_counts.get('duplicate', 0),
+        "locked_links": counters["locked_links"],
+        "timeout_links": status_counts.get('timeout', 0),
+        "unchecked_links": status_counts.get('unchecked', 0),
         "categories_distribution": categories_distribution,
         "subcategories_distribution": subcategories_distribution,
         "top_categories": top_categories,
-        "recent_bookmarks": 0,
+        "recent_bookmarks": counters["recent_bookmarks"],
         "last_updated": datetime.now(timezone.utc).isoformat()
     }
 
+@api_router.post("/statistics/reconcile")
+async def reconcile_statistics():
+    """Statistik-Dokument komplett neu berechnen und Abweichungen (Drift) melden"""
+    try:
+        return await bookmark_manager.statistics_manager.reconcile()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error reconciling statistics: {str(e)}")
+
 @api_router.get("/download/collector")
 async def download_collector():
     """Download des Sammelprogramms als ZIP"""
@@ -1601,43 +4167,17 @@ async def download_collector():
 
 @api_router.post("/export")
 async def export_bookmarks(export_request: ExportRequest):
-    """Exportiert Bookmarks in XML, CSV, HTML oder JSON Format"""
-    # Hole Bookmarks basierend auf Filter
-    if export_request.category:
-        bookmarks = await bookmark_manager.get_bookmarks_by_category(export_request.category)
-    else:
-        bookmarks = await bookmark_manager.get_all_bookmarks()
-    
-    # Exportiere basierend auf Format
-    format_lower = export_request.format.lower()
+    """Exportiert Bookmarks in XML, CSV, HTML, JSON oder alle vier als ZIP (gestreamt, optional gzip/zstd)"""
+    # Optionen vor dem Streamen prüfen, damit Fehler noch als 400 ankommen
+    content, media_type, extension = bookmark_manager.export_manager.stream(
+        export_request.format, export_request.category, export_request.compression
+    )
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     
-    if format_lower == "xml":
-        content = bookmark_manager.export_manager.export_to_xml(bookmarks)
-        media_type = "application/xml"
-        filename = f"bookmarks_{timestamp}.xml"
-    elif format_lower == "csv":
-        content = bookmark_manager.export_manager.export_to_csv(bookmarks)
-        media_type = "text/csv"
-        filename = f"bookmarks_{timestamp}.csv"
-    elif format_lower == "html":
-        content = bookmark_manager.export_manager.export_to_html(bookmarks)
-        media_type = "text/html"
-        filename = f"bookmarks_{timestamp}.html"
-    elif format_lower == "json":
-        content = bookmark_manager.export_manager.export_to_json(bookmarks)
-        media_type = "application/json"
-        filename = f"bookmarks_{timestamp}.json"
-    else:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Unsupported export format: {export_request.format}. Supported formats: XML, CSV, HTML, JSON"
-        )
-    
     return StreamingResponse(
-        io.StringIO(content),
+        content,
         media_type=media_type,
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
+        headers={"Content-Disposition": f"attachment; filename=bookmarks_{timestamp}.{extension}"}
     )
 
 @api_router.post("/bookmarks/import")
@@ -1646,48 +4186,165 @@ async def import_bookmarks_endpoint(file: UploadFile = File(...)):
     if not file.filename:
         raise HTTPException(status_code=400, detail="No file provided")
     
-    content = await file.read()
-    content_str = content.decode('utf-8')
-    
     file_extension = file.filename.split('.')[-1].lower()
     
     try:
-        result = await bookmark_manager.import_bookmarks(content_str, file_extension)
+        # Blockweise lesen statt die ganze Datei mehrfach im Speicher zu halten
+        result = await bookmark_manager.import_upload(file, file_extension)
         return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.post("/bookmarks/import-multiple")
+async def import_multiple_bookmarks_endpoint(files: List[UploadFile] = File(...)):
+    """Mehrere Favoriten-Dateien parallel parsen und gemeinsam importieren (Duplikate dateiübergreifend entfernt)"""
+    if not files:
+        raise HTTPException(status_code=400, detail="No file provided")
+    
+    try:
+        return await bookmark_manager.import_files(files)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@api_router.get("/bookmarks", response_model=List[Bookmark])
-async def get_bookmarks():
-    """Alle Bookmarks abrufen"""
+async def paginated_bookmarks(response: Response, query: Dict[str, Any], limit: Optional[int],
+                              cursor: Optional[str], fields: Optional[str], ranked: bool = False):
+    """Seite laden und den Cursor der Folgeseite im Header X-Next-Cursor liefern"""
+    page = await bookmark_manager.paginator.fetch_page(query, limit, cursor, fields, ranked)
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
+    return page["items"]
+
+def wants_page(limit: Optional[int], cursor: Optional[str], fields: Optional[str]) -> bool:
+    """Ohne limit/cursor/fields bleibt die bisherige Vollausgabe erhalten"""
+    return limit is not None or cursor is not None or fields is not None
+
+@api_router.get("/bookmarks")
+async def get_bookmarks(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=BookmarkPaginator.MAX_LIMIT),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None
+):
+    """Alle Bookmarks abrufen (optional seitenweise per limit/cursor und mit fields-Projektion)"""
+    if wants_page(limit, cursor, fields):
+        return await paginated_bookmarks(response, {}, limit, cursor, fields)
     return await bookmark_manager.get_all_bookmarks()
 
-@api_router.get("/bookmarks/category/{category}", response_model=List[Bookmark])
-async def get_bookmarks_by_category(category: str, subcategory: Optional[str] = None):
+@api_router.get("/bookmarks/stream")
+async def stream_bookmarks(category: Optional[str] = None, subcategory: Optional[str] = None,
+                           fields: Optional[str] = None):
+    """Bookmarks als NDJSON streamen (für Sync-Werkzeuge), optional gefiltert und projiziert"""
+    # Projektion vor dem Streamen prüfen, damit Fehler noch als 400 ankommen
+    projection = BookmarkPaginator.projection(fields)
+    query = bookmark_manager.category_query(category, subcategory) if category else {}
+    return StreamingResponse(
+        bookmark_manager.stream_bookmarks(query, projection),
+        media_type="application/x-ndjson"
+    )
+
+@api_router.get("/bookmarks/category/{category}")
+async def get_bookmarks_by_category(
+    category: str,
+    response: Response,
+    subcategory: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=BookmarkPaginator.MAX_LIMIT),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None
+):
     """Bookmarks nach Kategorie und optional Unterkategorie filtern"""
+    if wants_page(limit, cursor, fields):
+        query = bookmark_manager.category_query(category, subcategory)
+        return await paginated_bookmarks(response, query, limit, cursor, fields, ranked=True)
     return await bookmark_manager.get_bookmarks_by_category(category, subcategory)
 
 @api_router.get("/categories", response_model=List[Category])
 async def get_categories():
     """Alle Kategorien mit Hierarchie abrufen"""
-    return await bookmark_manager.category_manager.get_all_categories()
+    return await bookmark_manager.category_tree.categories()
+
+@api_router.get("/categories/tree")
+async def get_category_tree(request: Request):
+    """Kategorien als fertiger Baum mit Teilbaum-Summen (ETag / If-None-Match -> 304)"""
+    body, etag = await bookmark_manager.category_tree.tree()
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if ChangeTracker.matches(etag, request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @api_router.post("/bookmarks/validate")
-async def validate_links():
-    """Alle Links auf Dead Links überprüfen"""
-    return await bookmark_manager.validate_all_links()
+async def validate_links(validation_request: Optional[ValidationRequest] = None):
+    """Link-Validierung als Hintergrund-Job starten (mode: all oder stale)"""
+    validation_request = validation_request or ValidationRequest()
+    return await bookmark_manager.validate_all_links(
+        validation_request.mode,
+        validation_request.max_age_hours,
+        validation_request.write_chunk_size
+    )
+
+@api_router.get("/bookmarks/validate/jobs")
+async def list_validation_jobs():
+    """Letzte Validierungs-Jobs abrufen"""
+    return await bookmark_manager.validation_jobs.list_jobs()
+
+@api_router.get("/bookmarks/validate/jobs/{job_id}")
+async def get_validation_job(job_id: str):
+    """Fortschritt und Teilergebnisse eines Validierungs-Jobs abrufen"""
+    return await bookmark_manager.validation_jobs.get_job(job_id)
+
+@api_router.get("/bookmarks/validate/jobs/{job_id}/stream")
+async def stream_validation_job(job_id: str):
+    """Fortschritt eines Validierungs-Jobs als Server-Sent Events streamen"""
+    job = await bookmark_manager.validation_jobs.get_job(job_id)
+    
+    async def event_stream():
+        current = job
+        last_update = None
+        while True:
+            if current["updated_at"] != last_update:
+                last_update = current["updated_at"]
+                yield f"data: {json.dumps(current, default=str)}\n\n"
+            if current["status"] != "running":
+                break
+            await asyncio.sleep(1)
+            current = await bookmark_manager.validation_jobs.get_job(job_id)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+@api_router.post("/bookmarks/validate/jobs/{job_id}/resume")
+async def resume_validation_job(job_id: str):
+    """Unterbrochenen Validierungs-Job ab dem Checkpoint fortsetzen"""
+    return await bookmark_manager.validation_jobs.resume_job(job_id)
 
 @api_router.post("/bookmarks/remove-duplicates")
-async def remove_duplicates():
-    """Duplikate finden und entfernen"""
-    return await bookmark_manager.find_and_remove_duplicates()
+async def remove_duplicates(dry_run: bool = False):
+    """Duplikate finden und entfernen (dry_run=true: nur Gruppen anzeigen)"""
+    return await bookmark_manager.find_and_remove_duplicates(dry_run)
+
+@api_router.get("/bookmarks/near-duplicates")
+async def find_near_duplicates(
+    threshold: float = Query(0.7, ge=0.1, le=1.0),
+    limit: int = Query(100, ge=1, le=1000)
+):
+    """Ähnliche, aber nicht identische Bookmarks (MinHash/LSH über Titel und URL-Pfad) finden"""
+    try:
+        return await bookmark_manager.near_duplicate_detector.find_near_duplicates(threshold, limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to find near duplicates: {str(e)}")
 
 @api_router.delete("/bookmarks/dead-links")
 async def remove_dead_links():
     """Alle toten Links entfernen (außer localhost)"""
     # Nur Links mit status_type="dead" löschen, localhost verschonen
+    await bookmark_manager.statistics_manager.record_delete({"status_type": "dead"})
     result = await db.bookmarks.delete_many({"status_type": "dead"})
-    await bookmark_manager.category_manager.update_bookmark_counts()
     
     return {
         "removed_count": result.deleted_count,
@@ -1712,6 +4369,7 @@ async def update_bookmark_status(bookmark_id: str, status: dict):
         elif status_type == "unchecked":
             update_data = {"is_dead_link": False, "status_type": "unchecked", "last_checked": None}
         
+        await bookmark_manager.statistics_manager.record_update({"id": bookmark_id}, update_data)
         result = await db.bookmarks.update_one(
             {"id": bookmark_id},
             {"$set": update_data}
@@ -1719,8 +4377,7 @@ async def update_bookmark_status(bookmark_id: str, status: dict):
         
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Bookmark not found")
-        
-        await bookmark_manager.category_manager.update_bookmark_counts()
+        bookmark_manager.change_feed.publish("bookmarks", "update", [bookmark_id], fields=update_data)
         
         return {
             "message": f"Bookmark status updated to {status_type}",
@@ -1731,12 +4388,27 @@ async def update_bookmark_status(bookmark_id: str, status: dict):
         raise HTTPException(status_code=500, detail=f"Failed to update bookmark status: {str(e)}")
 
 @api_router.post("/bookmarks/find-duplicates")
-async def find_duplicates():
-    """Duplikate finden und mit 'duplicate' Status markieren"""
+async def find_duplicates(dry_run: bool = False):
+    """Duplikate finden und mit 'duplicate' Status markieren (dry_run=true: nur Gruppen anzeigen)"""
     try:
-        duplicate_groups = await bookmark_manager.duplicate_detector.find_and_mark_duplicates()
+        duplicate_groups = await bookmark_manager.duplicate_detector.find_and_mark_duplicates(dry_run)
         marked_count = sum(len(group) - 1 for group in duplicate_groups)  # Alle außer dem ersten pro Gruppe
         
+        if dry_run:
+            return {
+                "dry_run": True,
+                "duplicate_groups": len(duplicate_groups),
+                "marked_count": 0,
+                "would_mark": marked_count,
+                "groups": bookmark_manager.duplicate_detector.describe_groups(duplicate_groups, keep_newest=False),
+                "message": f"Found {len(duplicate_groups)} duplicate groups, would mark {marked_count} duplicates"
+            }
+        
+        marked_docs = [doc for group in duplicate_groups for doc in group[1:]]
+        await bookmark_manager.statistics_manager.record_change(
+            marked_docs, [{**doc, "status_type": "duplicate"} for doc in marked_docs]
+        )
+        
         return {
             "duplicate_groups": len(duplicate_groups),
             "marked_count": marked_count,
@@ -1749,8 +4421,8 @@ async def find_duplicates():
 async def remove_duplicates():
     """Alle als Duplikat markierte Bookmarks löschen"""
     try:
+        await bookmark_manager.statistics_manager.record_delete({"status_type": "duplicate"})
         result = await db.bookmarks.delete_many({"status_type": "duplicate"})
-        await bookmark_manager.category_manager.update_bookmark_counts()
         
         return {
             "removed_count": result.deleted_count,
@@ -1764,16 +4436,63 @@ async def delete_all_bookmarks():
     """Alle Bookmarks löschen"""
     return await bookmark_manager.delete_all_bookmarks()
 
-@api_router.get("/bookmarks/search/{query}", response_model=List[Bookmark])
-async def search_bookmarks(query: str):
-    """Bookmarks durchsuchen"""
-    return await bookmark_manager.search_bookmarks(query)
+@api_router.get("/bookmarks/search/{query}")
+async def search_bookmarks(
+    query: str,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=BookmarkPaginator.MAX_LIMIT),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None
+):
+    """Bookmarks per Textindex durchsuchen - nach Relevanz sortiert, seitenweise über cursor"""
+    page = await bookmark_manager.paginator.search_page(query, limit, cursor, fields)
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
+    return page["items"]
 
 @api_router.post("/bookmarks", response_model=Bookmark)
 async def create_bookmark(bookmark: BookmarkCreate):
     """Einzelnes Bookmark erstellen"""
     return await bookmark_manager.create_bookmark(bookmark)
 
+@api_router.put("/bookmarks/reorder")
+async def reorder_bookmarks(reorder_data: dict):
+    """Bookmarks in neuer Reihenfolge sortieren (vor /bookmarks/{bookmark_id} registriert)"""
+    try:
+        bookmark_ids = reorder_data.get('bookmark_ids', [])
+        
+        if not bookmark_ids:
+            raise HTTPException(status_code=400, detail="Bookmark IDs list is required")
+        
+        result = await bookmark_manager.rank_manager.reorder("bookmarks", "id", bookmark_ids)
+        return {"message": f"Reordered {len(bookmark_ids)} bookmarks", **result}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error reordering bookmarks: {str(e)}")
+
+@api_router.put("/bookmarks/{bookmark_id}/position")
+async def move_bookmark_position(bookmark_id: str, position_data: dict):
+    """Einzelnes Bookmark innerhalb seiner Kategorie verschieben (after_id oder position) - schreibt nur dieses Dokument"""
+    try:
+        bookmark = await db.bookmarks.find_one({"id": bookmark_id}, {"_id": 0, "category": 1})
+        if not bookmark:
+            raise HTTPException(status_code=404, detail="Bookmark not found")
+        
+        rank = await bookmark_manager.rank_manager.rank_at(
+            "bookmarks", {"category": bookmark.get("category")},
+            position=position_data.get('position'), after_id=position_data.get('after_id'), exclude_id=bookmark_id
+        )
+        await db.bookmarks.update_one({"id": bookmark_id}, {"$set": {"rank": rank, "updated_at": datetime.utcnow()}})
+        bookmark_manager.change_feed.publish("bookmarks", "update", [bookmark_id], fields={"rank": rank})
+        return {"message": "Bookmark moved", "bookmark_id": bookmark_id, "rank": rank}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error moving bookmark: {str(e)}")
+
 @api_router.put("/bookmarks/{bookmark_id}", response_model=Bookmark)
 async def update_bookmark(bookmark_id: str, update_data: BookmarkUpdate):
     """Bookmark aktualisieren"""
@@ -1789,6 +4508,9 @@ async def lock_bookmark(bookmark_id: str):
             raise HTTPException(status_code=404, detail="Bookmark not found")
         
         # Update to locked status
+        await bookmark_manager.statistics_manager.record_update(
+            {"id": bookmark_id}, {"is_locked": True, "status_type": "locked"}
+        )
         result = await db.bookmarks.update_one(
             {"id": bookmark_id},
             {"$set": {"is_locked": True, "status_type": "locked"}}
@@ -1796,6 +4518,9 @@ async def lock_bookmark(bookmark_id: str):
         
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Bookmark not found")
+        bookmark_manager.change_feed.publish(
+            "bookmarks", "update", [bookmark_id], fields={"is_locked": True, "status_type": "locked"}
+        )
         
         # Return updated bookmark
         updated_bookmark = await db.bookmarks.find_one({"id": bookmark_id})
@@ -1816,6 +4541,9 @@ async def unlock_bookmark(bookmark_id: str):
             raise HTTPException(status_code=404, detail="Bookmark not found")
         
         # Update to unlocked status (set to active)
+        await bookmark_manager.statistics_manager.record_update(
+            {"id": bookmark_id}, {"is_locked": False, "status_type": "active"}
+        )
         result = await db.bookmarks.update_one(
             {"id": bookmark_id},
             {"$set": {"is_locked": False, "status_type": "active"}}
@@ -1823,6 +4551,9 @@ async def unlock_bookmark(bookmark_id: str):
         
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Bookmark not found")
+        bookmark_manager.change_feed.publish(
+            "bookmarks", "update", [bookmark_id], fields={"is_locked": False, "status_type": "active"}
+        )
         
         # Return updated bookmark
         updated_bookmark = await db.bookmarks.find_one({"id": bookmark_id})
@@ -2009,31 +4740,16 @@ async def reorder_categories(reorder_data: dict):
         if not category_ids:
             raise HTTPException(status_code=400, detail="Category IDs list is required")
         
-        # Update die Reihenfolge der Kategorien
-        for index, category_name in enumerate(category_ids):
-            update_data = {
-                "order_index": index, 
-                "updated_at": datetime.utcnow()
-            }
-            
-            # Wenn parent_category gesetzt ist, update auch die Hierarchie
-            if parent_category is not None:
-                update_data["parent_category"] = parent_category if parent_category != "root" else None
-            
-            await db.categories.update_one(
-                {"name": category_name},
-                {"$set": update_data}
-            )
-        
-        # Update category counts
-        await bookmark_manager.category_manager.update_bookmark_counts()
+        result = await bookmark_manager.category_manager.reorder_categories(category_ids, parent_category)
         
         return {
             "message": f"Reordered {len(category_ids)} categories", 
-            "reordered_count": len(category_ids),
+            **result,
             "parent_category": parent_category
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error reordering categories: {str(e)}")
 
@@ -2053,23 +4769,32 @@ async def reparent_category(category_name: str, reparent_data: dict):
         if new_parent and new_parent == category_name:
             raise HTTPException(status_code=400, detail="Cannot make category its own parent")
         
-        # Update der Kategorie
+        # Update der Kategorie - nur dieses Dokument, Position über Rang-Schlüssel
+        rank_manager = bookmark_manager.rank_manager
+        category_id = await rank_manager.ensure_id("categories", category)
         update_data = {
             "parent_category": new_parent,
-            "order_index": target_position,
+            "rank": await rank_manager.rank_at(
+                "categories", {"parent_category": new_parent}, position=target_position, exclude_id=category_id
+            ),
             "updated_at": datetime.utcnow()
         }
         
         result = await db.categories.update_one(
-            {"name": category_name},
+            {"id": category_id},
             {"$set": update_data}
         )
         
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Category not found")
         
-        # Update category counts und Hierarchie
-        await bookmark_manager.category_manager.update_bookmark_counts()
+        # Zähler für die neue Hierarchie-Ebene anpassen
+        await bookmark_manager.category_manager.category_reparented(
+            category_name, category.get("parent_category"), new_parent
+        )
+        await bookmark_manager.category_manager.publish_categories(
+            [category_name, category.get("parent_category"), new_parent]
+        )
         
         # Rückgabe der aktualisierten Kategorie-Info
         return {
@@ -2110,112 +4835,61 @@ async def cross_level_sort_categories(sort_data: dict):
         if not dragged:
             raise HTTPException(status_code=404, detail=f"Dragged category '{dragged_category}' not found")
         
-        # Bestimme neue Hierarchie basierend auf target_level
+        # Bestimme neue Hierarchie basierend auf target_level; nur die verschobene Kategorie wird geschrieben
+        rank_manager = bookmark_manager.rank_manager
         new_parent = None
-        new_position = 0
+        after_id = None  # None = ERSTE Position
         
         if target_level == 'child':
             # Dragged wird Unterkategorie von Target - an ERSTE Position
             new_parent = target_category
-            new_position = 0  # ERSTE Position unter Parent
-            
-            # Verschiebe andere Unterkategorien nach unten
-            await db.categories.update_many(
-                {
-                    "parent_category": target_category,
-                    "name": {"$ne": dragged_category}  # Nicht die verschobene Kategorie
-                },
-                {"$inc": {"order_index": 1}}  # Alle anderen um 1 nach unten
-            )
-            
-        elif target_level == 'root':
-            # Dragged wird Root-Kategorie - an ERSTE Position
-            new_parent = None
-            new_position = 0  # ERSTE Position auf Root-Level
-            
-            # Verschiebe andere Root-Kategorien nach unten
-            await db.categories.update_many(
-                {
-                    "parent_category": None,
-                    "name": {"$ne": dragged_category}  # Nicht die verschobene Kategorie
-                },
-                {"$inc": {"order_index": 1}}  # Alle anderen um 1 nach unten
-            )
             
-        elif target_level == 'same':
+        elif target_level == 'same' and target_category != "Alle":
             # Dragged bleibt auf gleicher Ebene wie Target
-            if target_category == "Alle":
-                # Wenn Target "Alle" ist, wird es Root-Level - ERSTE Position
-                new_parent = None
-                new_position = 0
-                
-                # Verschiebe andere Root-Kategorien nach unten
-                await db.categories.update_many(
-                    {
-                        "parent_category": None,
-                        "name": {"$ne": dragged_category}
-                    },
-                    {"$inc": {"order_index": 1}}
-                )
-            else:
-                new_parent = target.get("parent_category") if target else None
-                target_position = target.get("order_index", 0) if target else 0
-                
-                if operation_mode == 'insert':
-                    # Insert-Modus: Füge zwischen bestehende ein
-                    new_position = target_position + 1
-                    
-                    # Verschiebe Kategorien nach der Insert-Position nach unten
-                    await db.categories.update_many(
-                        {
-                            "parent_category": new_parent,
-                            "order_index": {"$gte": new_position},
-                            "name": {"$ne": dragged_category}
-                        },
-                        {"$inc": {"order_index": 1}}
-                    )
-                else:
-                    # Standard-Modus: Ersetze Position - aber an ERSTE Position
-                    new_position = 0  # ERSTE Position
-                    
-                    # Verschiebe alle anderen nach unten
-                    await db.categories.update_many(
-                        {
-                            "parent_category": new_parent,
-                            "name": {"$ne": dragged_category}
-                        },
-                        {"$inc": {"order_index": 1}}
-                    )
+            new_parent = target.get("parent_category") if target else None
+            if operation_mode == 'insert':
+                # Insert-Modus: direkt hinter Target einfügen
+                after_id = await rank_manager.ensure_id("categories", target)
+        # 'root' und "Alle" (UI-Element): Root-Level, ERSTE Position
+        
+        dragged_id = await rank_manager.ensure_id("categories", dragged)
+        new_rank = await rank_manager.rank_at(
+            "categories", {"parent_category": new_parent},
+            position=None if after_id else 0, after_id=after_id, exclude_id=dragged_id
+        )
         
         # Update der verschobenen Kategorie
         result = await db.categories.update_one(
-            {"name": dragged_category},
+            {"id": dragged_id},
             {"$set": {
                 "parent_category": new_parent,
-                "order_index": new_position,
+                "rank": new_rank,
                 "updated_at": datetime.utcnow()
             }}
         )
+        new_position = await db.categories.count_documents(
+            {"parent_category": new_parent, "rank": {"$lt": new_rank}}
+        )
         
-        # Debug: Log the operation
-        print(f"Cross-level sort operation:")
-        print(f"  Dragged: {dragged_category}")
-        print(f"  Target: {target_category}") 
-        print(f"  Target Level: {target_level}")
-        print(f"  New Parent: {new_parent}")
-        print(f"  New Position: {new_position}")
-        print(f"  Operation Mode: {operation_mode}")
-        print(f"  MongoDB Result: matched={result.matched_count}, modified={result.modified_count}")
+        logging.info(
+            f"Cross-level sort: {dragged_category} -> {target_category} (level={target_level}, mode={operation_mode}, "
+            f"parent={new_parent}, position={new_position}, rank={new_rank}, modified={result.modified_count})"
+        )
         
-        # Update category counts
-        await bookmark_manager.category_manager.update_bookmark_counts()
+        await bookmark_manager.category_manager.category_reparented(
+            dragged_category, dragged.get("parent_category"), new_parent
+        )
+        await bookmark_manager.category_manager.publish_categories(
+            [dragged_category, dragged.get("parent_category"), new_parent]
+        )
         
         return {
             "message": f"Category '{dragged_category}' moved successfully",
             "operation_mode": operation_mode,
             "target_level": target_level,
             "new_parent": new_parent,
-            "new_position": new_position
+            "new_position": new_position,
+            "new_rank": new_rank
         }
         
     except HTTPException:
@@ -2516,7 +5190,13 @@ async def move_bookmark_to_category(bookmark_id: str, move_data: dict):
             update_data["subcategory"] = target_subcategory
         else:
             update_data["subcategory"] = None
+        if bookmark.get("category") != target_category:
+            # Neue Kategorie: ans Ende der neuen Geschwister einsortieren
+            update_data["rank"] = await bookmark_manager.rank_manager.rank_at(
+                "bookmarks", {"category": target_category}, exclude_id=bookmark_id
+            )
         
+        await bookmark_manager.statistics_manager.record_update({"id": bookmark_id}, update_data)
         result = await db.bookmarks.update_one(
             {"id": bookmark_id},
             {"$set": update_data}
@@ -2524,9 +5204,7 @@ async def move_bookmark_to_category(bookmark_id: str, move_data: dict):
         
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Bookmark not found")
-        
-        # Update category counts
-        await bookmark_manager.category_manager.update_bookmark_counts()
+        bookmark_manager.change_feed.publish("bookmarks", "update", [bookmark_id], fields=update_data)
         
         # Rückgabe des aktualisierten Bookmarks
         updated_bookmark = await db.bookmarks.find_one({"id": bookmark_id})
@@ -2537,27 +5215,6 @@ async def move_bookmark_to_category(bookmark_id: str, move_data: dict):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error moving bookmark: {str(e)}")
 
-@api_router.put("/bookmarks/reorder")
-async def reorder_bookmarks(reorder_data: dict):
-    """Bookmarks in neuer Reihenfolge sortieren"""
-    try:
-        bookmark_ids = reorder_data.get('bookmark_ids', [])
-        
-        if not bookmark_ids:
-            raise HTTPException(status_code=400, detail="Bookmark IDs list is required")
-        
-        # Update die Reihenfolge der Bookmarks
-        for index, bookmark_id in enumerate(bookmark_ids):
-            await db.bookmarks.update_one(
-                {"id": bookmark_id},
-                {"$set": {"order_index": index, "updated_at": datetime.utcnow()}}
-            )
-        
-        return {"message": f"Reordered {len(bookmark_ids)} bookmarks", "reordered_count": len(bookmark_ids)}
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error reordering bookmarks: {str(e)}")
-
 @api_router.delete("/bookmarks/{bookmark_id}")
 async def delete_bookmark(bookmark_id: str):
     """Einzelnes Bookmark löschen"""
@@ -2570,11 +5227,12 @@ async def delete_bookmark(bookmark_id: str):
     if bookmark.get("is_locked", False):
         raise HTTPException(status_code=403, detail="Gesperrte Bookmarks können nicht gelöscht werden")
     
+    await bookmark_manager.statistics_manager.record_delete({"id": bookmark_id})
     result = await db.bookmarks.delete_one({"id": bookmark_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Bookmark not found")
+    bookmark_manager.change_feed.publish("bookmarks", "delete", [bookmark_id])
     
-    await bookmark_manager.category_manager.update_bookmark_counts()
     return {"message": "Bookmark deleted successfully"}
 
 # Category Management Endpoints
@@ -2602,7 +5260,11 @@ async def create_category(category_data: CategoryCreate):
     )
     
     await db.categories.insert_one(category.dict())
-    await bookmark_manager.category_manager.update_bookmark_counts()
+    category.bookmark_count = await bookmark_manager.category_manager.category_added(
+        category.name, category.parent_category
+    )
+    bookmark_manager.change_feed.publish("categories", "insert", [category.id], doc=category.dict())
+    await bookmark_manager.category_manager.publish_categories([category.parent_category])
     return category
 
 @api_router.put("/categories/{category_id}", response_model=Category)
@@ -2636,14 +5298,40 @@ async def update_category(category_id: str, update_data: CategoryUpdate):
     
     # Update Bookmark-Referenzen wenn Name geändert wurde
     if update_data.name and update_data.name != old_name:
+        # Zähler wandern mit dem Kategorie-Dokument - nur die Statistik braucht das Delta
+        await bookmark_manager.statistics_manager.record_update(
+            {"category": old_name}, {"category": update_data.name}, category_counts=False
+        )
         await db.bookmarks.update_many(
             {"category": old_name},
             {"$set": {"category": update_data.name}}
         )
+        # Unterkategorien verweisen über den Namen auf ihren Parent
+        await db.categories.update_many(
+            {"parent_category": old_name},
+            {"$set": {"parent_category": update_data.name}}
+        )
+    
+    # Zähler nur bei geändertem Namen oder Parent neu bestimmen
+    old_parent = category.get("parent_category")
+    new_parent = update_dict.get("parent_category", old_parent)
+    new_name = update_dict.get("name", old_name)
+    if new_parent != old_parent:
+        await bookmark_manager.category_manager.category_reparented(new_name, old_parent, new_parent)
+    elif new_name != old_name:
+        await bookmark_manager.category_manager.refresh_category_count(new_name, new_parent)
+    
+    # Kategorie, alter/neuer Parent und bei Umbenennung die Unterkategorien (neuer parent_category)
+    await bookmark_manager.category_manager.publish_categories(
+        [new_name, old_parent, new_parent], children_of=[new_name] if new_name != old_name else []
+    )
+    if new_name != old_name:
+        bookmark_manager.change_feed.publish("bookmarks", "reassign", fields={
+            "from_category": old_name, "category": new_name
+        })
     
     # Aktualisierte Kategorie zurückgeben
     updated_category = await db.categories.find_one({"id": category_id})
-    await bookmark_manager.category_manager.update_bookmark_counts()
     return Category(**updated_category)
 
 @api_router.delete("/categories/{category_id}")
@@ -2674,14 +5362,19 @@ async def delete_category(category_id: str):
         )
         await db.categories.insert_one(unassigned_cat.dict())
         print("Kategorie 'Nicht zugeordnet' wurde erstellt")
+        bookmark_manager.change_feed.publish("categories", "insert", [unassigned_cat.id], doc=unassigned_cat.dict())
     
     # Verschiebe alle Bookmarks zu "Nicht zugeordnet"
+    await bookmark_manager.statistics_manager.record_update(
+        {"category": category_name}, {"category": "Nicht zugeordnet", "subcategory": None}
+    )
     bookmark_result = await db.bookmarks.update_many(
         {"category": category_name},
         {"$set": {"category": "Nicht zugeordnet", "subcategory": None}}
     )
     
     # Verschiebe alle Unterkategorien zu Hauptkategorien (parent_category = null)
+    promoted_children = await db.categories.find({"parent_category": category_name}, {"id": 1, "name": 1}).to_list(None)
     subcategory_result = await db.categories.update_many(
         {"parent_category": category_name},
         {"$unset": {"parent_category": ""}}
@@ -2692,7 +5385,21 @@ async def delete_category(category_id: str):
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Kategorie nicht gefunden")
     
-    await bookmark_manager.category_manager.update_bookmark_counts()
+    # Ehemalige Unterkategorien zählen jetzt als Hauptkategorien
+    for child in promoted_children:
+        await bookmark_manager.category_manager.refresh_category_count(child["name"], None, child.get("id"))
+    await bookmark_manager.category_manager.adjust_subcategory_count(category.get("parent_category"), -1)
+    
+    change_feed = bookmark_manager.change_feed
+    change_feed.publish("categories", "delete", [category_id])
+    await bookmark_manager.category_manager.publish_categories(
+        [category.get("parent_category"), unassigned_category and "Nicht zugeordnet",
+         *(child["name"] for child in promoted_children)]
+    )
+    if bookmark_result.modified_count:
+        change_feed.publish("bookmarks", "reassign", fields={
+            "from_category": category_name, "category": "Nicht zugeordnet", "subcategory": None
+        })
     
     message = f"Kategorie '{category_name}' gelöscht"
     if bookmark_result.modified_count > 0:
@@ -2702,18 +5409,39 @@ async def delete_category(category_id: str):
     
     return {"message": message}
 
+@api_router.post("/categories/recount")
+async def recount_categories():
+    """Wartungsjob: bookmark_count und subcategory_count aller Kategorien neu berechnen"""
+    try:
+        return await bookmark_manager.category_manager.recompute_bookmark_counts()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error recounting categories: {str(e)}")
+
 @api_router.post("/categories/cleanup")
 async def cleanup_empty_categories():
     """Leere Kategorien mit Namen '' oder null entfernen"""
-    result = await db.categories.delete_many({
+    empty_query = {
         "$or": [
             {"name": ""},
             {"name": None},
             {"name": {"$exists": False}}
         ]
-    })
+    }
+    
+    # subcategory_count der Parents um die entfernten Unterkategorien verringern
+    parents = await db.categories.aggregate([
+        {"$match": {**empty_query, "parent_category": {"$nin": [None, ""]}}},
+        {"$group": {"_id": "$parent_category", "count": {"$sum": 1}}}
+    ]).to_list(None)
+    
+    removed_ids = [doc.get("id") for doc in await db.categories.find(empty_query, {"_id": 0, "id": 1}).to_list(None)]
+    result = await db.categories.delete_many(empty_query)
     
-    await bookmark_manager.category_manager.update_bookmark_counts()
+    for parent in parents:
+        await bookmark_manager.category_manager.adjust_subcategory_count(parent["_id"], -parent["count"])
+    if result.deleted_count:
+        bookmark_manager.change_feed.publish("categories", "delete", removed_ids)
+        await bookmark_manager.category_manager.publish_categories(parent["_id"] for parent in parents)
     return {"message": f"{result.deleted_count} leere Kategorien entfernt"}
 
 # ================================
@@ -2748,7 +5476,7 @@ async def unlock_category(category_id: str):
 async def get_categories_with_lock_status():
     """📋 Alle Kategorien mit Lock-Status abrufen - Phase 2"""
     try:
-        categories = await bookmark_manager.category_manager.get_all_categories()
+        categories = await bookmark_manager.category_tree.categories()
         
         # Erweitere um Lock-Informationen für das Frontend
         enhanced_categories = []
@@ -2822,15 +5550,82 @@ async def create_category_with_lock(category_data: dict = Body(...)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Fehler beim Erstellen der Kategorie: {str(e)}")
 
+@api_router.get("/admin/indexes")
+async def get_index_stats():
+    """MongoDB Index-Nutzung ($indexStats) für bookmarks und categories abrufen"""
+    try:
+        return await bookmark_manager.index_manager.get_index_stats()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error reading index stats: {str(e)}")
+
+@api_router.post("/admin/url-keys")
+async def rebuild_url_keys(rebuild: bool = False):
+    """url_key fehlender Bookmarks nachtragen (rebuild=true: alle neu berechnen, z.B. nach Regeländerungen)"""
+    try:
+        return await bookmark_manager.duplicate_detector.backfill_url_keys(rebuild)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error rebuilding url keys: {str(e)}")
+
+@api_router.get("/events")
+async def change_events(request: Request, last_event_id: Optional[str] = None):
+    """Server-Sent Events mit kompakten Diffs; Reconnect mit Last-Event-ID (Header oder Query) setzt fort"""
+    resume_token = request.headers.get("last-event-id") or last_event_id
+    return StreamingResponse(
+        bookmark_manager.change_feed.subscribe(resume_token),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@api_router.post("/admin/ranks/rebalance")
+async def rebalance_ranks(full: bool = False):
+    """Rang-Schlüssel neu verteilen (nur Gruppen mit fehlenden/zu langen Schlüsseln, full=true: alle)"""
+    try:
+        return [await bookmark_manager.rank_manager.rebalance(name, full) for name in RankManager.GROUPS]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error rebalancing ranks: {str(e)}")
+
 # Include the router in the main app
 app.include_router(api_router)
 
+@app.middleware("http")
+async def track_changes(request: Request, call_next):
+    """Lesend: schwaches ETag aus den Collection-Versionen, If-None-Match -> 304 ohne Datenbankzugriff.
+    Schreibend: Versionen danach erhöhen (auch bei Fehlern, evtl. Teiländerungen) und für Requests
+    ohne konkreten Diff einen Reload-Hinweis in den Change-Feed stellen."""
+    changes = bookmark_manager.changes
+    path = request.url.path
+    if request.method in ("GET", "HEAD"):
+        collections = changes.dependencies(path)
+        if not collections:
+            return await call_next(request)
+        # Version vor dem Lesen festhalten - eine parallele Änderung führt höchstens zu einem unnötigen Neuladen
+        etag = changes.etag(collections)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if changes.matches(etag, request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=headers)
+        response = await call_next(request)
+        if response.status_code == 200 and "etag" not in response.headers:
+            response.headers.update(headers)
+        return response
+    
+    if not changes.is_write(request.method, path):
+        return await call_next(request)
+    marker = bookmark_manager.change_feed.begin_request()
+    try:
+        return await call_next(request)
+    finally:
+        collections = changes.written(request.method, path)
+        if collections:
+            changes.bump(*collections)
+        bookmark_manager.change_feed.finish_request(path, marker)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 # Configure logging
@@ -2840,6 +5635,20 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def startup_tasks():
+    await bookmark_manager.index_manager.ensure_indexes()
+    await bookmark_manager.duplicate_detector.backfill_url_keys()
+    for collection_name in RankManager.GROUPS:
+        await bookmark_manager.rank_manager.rebalance(collection_name)
+    await bookmark_manager.validation_jobs.mark_interrupted_jobs()
+    await bookmark_manager.change_feed.start()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await bookmark_manager.validation_jobs.shutdown()
+    await bookmark_manager.rank_manager.shutdown()
+    await bookmark_manager.change_feed.stop()
+    await bookmark_manager.validator.close()
+    bookmark_manager.close_parse_pool()
     client.close()
\ No newline at end of file
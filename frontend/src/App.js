@@ -375,7 +375,17 @@ class FavoritesService {
   async validateLinks() {
     try {
       const response = await axios.post(`${this.baseURL}/api/bookmarks/validate`);
-      return response.data;
+      let job = response.data;
+      // Validierung läuft als Hintergrund-Job - Fortschritt abfragen bis zum Abschluss
+      while (job.status === 'running') {
+        await new Promise(resolve => setTimeout(resolve, 2000));
+        const progress = await axios.get(`${this.baseURL}/api/bookmarks/validate/jobs/${job.id}`);
+        job = progress.data;
+      }
+      if (job.status !== 'completed') {
+        throw new Error(job.error || 'Validation job did not complete');
+      }
+      return job;
     } catch (error) {
       throw new Error('Failed to validate links');
     }
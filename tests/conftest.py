@@ -0,0 +1,26 @@
+"""Gemeinsame Einstellungen für die Unit-Tests des Backends (ohne laufende MongoDB)"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# server.py liest die Verbindung beim Import; Motor verbindet sich erst bei der ersten Abfrage
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "favorg_test")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    """BookmarkManager auf einer In-Memory-MongoDB (mongomock-motor) statt der echten Datenbank"""
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    import server
+
+    database = mongomock_motor.AsyncMongoMockClient()["favorg_test"]
+    manager = server.BookmarkManager(database)
+    # Endpunkt-Funktionen greifen auf die Modul-Globals zu
+    monkeypatch.setattr(server, "db", database)
+    monkeypatch.setattr(server, "bookmark_manager", manager)
+    return manager
@@ -0,0 +1,64 @@
+"""Verschobene Bookmarks landen am Ende ihrer neuen Kategorie (Rang-Reihenfolge)"""
+import asyncio
+
+import server
+from server import BookmarkCreate, BookmarkMove, BookmarkUpdate
+
+
+async def create(category, *titles):
+    return [
+        await server.bookmark_manager.create_bookmark(
+            BookmarkCreate(title=title, url=f"https://example.com/{title}", category=category)
+        )
+        for title in titles
+    ]
+
+
+async def titles(category):
+    return [bookmark.title for bookmark in await server.bookmark_manager.get_bookmarks_by_category(category)]
+
+
+def test_update_bookmark_appends_to_new_category(manager):
+    async def scenario():
+        await create("Ziel", "z1", "z2", "z3")
+        moved, _ = await create("Quelle", "q1", "q2")
+        await manager.update_bookmark(moved.id, BookmarkUpdate(category="Ziel"))
+        return await titles("Ziel"), await titles("Quelle")
+
+    assert asyncio.run(scenario()) == (["z1", "z2", "z3", "q1"], ["q2"])
+
+
+def test_update_within_category_keeps_position(manager):
+    async def scenario():
+        first, _, _ = await create("Ziel", "z1", "z2", "z3")
+        await manager.update_bookmark(first.id, BookmarkUpdate(category="Ziel", title="z1*"))
+        return await titles("Ziel")
+
+    assert asyncio.run(scenario()) == ["z1*", "z2", "z3"]
+
+
+def test_move_to_category_endpoint_appends(manager):
+    async def scenario():
+        await create("Ziel", "z1", "z2")
+        moved, = await create("Quelle", "q1")
+        await server.move_bookmark_to_category(moved.id, {"category": "Ziel", "subcategory": "Sub"})
+        return await titles("Ziel")
+
+    assert asyncio.run(scenario()) == ["z1", "z2", "q1"]
+
+
+def test_move_bookmarks_keeps_selection_order_with_distinct_ranks(manager):
+    async def scenario():
+        await create("Ziel", "z1", "z2")
+        sources = await create("Quelle", "q1", "q2", "q3")
+        # Ein Bookmark der Zielkategorie mit verschieben: auch es rückt ans Ende
+        target_first = (await manager.get_bookmarks_by_category("Ziel"))[0]
+        ids = [sources[2].id, target_first.id, sources[0].id]
+        result = await manager.move_bookmarks(BookmarkMove(bookmark_ids=ids, target_category="Ziel"))
+        ranks = [bookmark.rank for bookmark in await manager.get_bookmarks_by_category("Ziel")]
+        return result["moved_count"], await titles("Ziel"), ranks
+
+    moved_count, order, ranks = asyncio.run(scenario())
+    assert moved_count == 3
+    assert order == ["z2", "q3", "z1", "q1"]
+    assert len(set(ranks)) == len(ranks)
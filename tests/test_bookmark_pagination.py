@@ -0,0 +1,43 @@
+"""Keyset-Pagination über (date_added, id): jede Seite schließt lückenlos an die vorige an"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from server import BookmarkPaginator
+
+
+async def insert(manager, dated, undated):
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    await manager.db.bookmarks.insert_many(
+        [{"id": f"d{index:03}", "title": f"d{index}", "url": f"https://example.com/d{index}", "category": "A",
+          "date_added": start + timedelta(minutes=index // 2)} for index in range(dated)] +
+        [{"id": f"n{index:03}", "title": f"n{index}", "url": f"https://example.com/n{index}", "category": "A",
+          "date_added": None} for index in range(undated)]
+    )
+
+
+async def all_pages(paginator, limit, **kwargs):
+    ids, cursor = [], None
+    while True:
+        page = await paginator.fetch_page({}, limit, cursor, fields="title", **kwargs)
+        ids += [doc["id"] for doc in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            return ids
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 5, 50])
+def test_pages_cover_undated_and_dated_bookmarks(manager, limit):
+    async def scenario():
+        await insert(manager, dated=7, undated=4)
+        return await all_pages(manager.paginator, limit)
+
+    ids = asyncio.run(scenario())
+    # Ohne Datum zuerst (wie MongoDB sortiert), danach nach Datum; keine Lücken, keine Wiederholungen
+    assert ids == [f"n{index:03}" for index in range(4)] + [f"d{index:03}" for index in range(7)]
+
+
+def test_cursor_after_undated_bookmark_reaches_dated_ones():
+    keyset = BookmarkPaginator.decode_cursor(BookmarkPaginator.encode_cursor({"id": "n1", "date_added": None}))
+    assert keyset == {"$or": [{"date_added": None, "id": {"$gt": "n1"}}, {"date_added": {"$ne": None}}]}
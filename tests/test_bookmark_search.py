@@ -0,0 +1,78 @@
+"""Suche: Textindex-Treffer zuerst, danach Teilwort-Treffer ohne Wiederholungen"""
+import asyncio
+import re
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from server import BookmarkPaginator
+
+BOOKMARKS = [
+    ("git", "Git - Dokumentation", "https://git-scm.com/doc"),
+    ("gh", "GitHub", "https://github.com/"),
+    ("gl", "Projekte", "https://gitlab.com/group/project"),
+    ("blog", "Blog über git und mehr", "https://blog.example.com/"),
+    ("news", "Nachrichten", "https://news.example.com/"),
+]
+
+
+@pytest.fixture
+def paginator(manager, monkeypatch):
+    def text_pipeline(terms):
+        # mongomock kennt kein $text - ganze Wörter im Titel als gleichwertiger Ersatz für die Index-Stufe
+        words = "|".join(re.escape(term) for term in terms.split())
+        return [
+            {"$match": {"title": {"$regex": rf"(^|\W)({words})(\W|$)", "$options": "i"}}},
+            {"$addFields": {"score": 1.0}},
+            {"$sort": {"score": -1, "id": 1}},
+            {"$limit": BookmarkPaginator.TEXT_HIT_LIMIT},
+        ]
+
+    monkeypatch.setattr(manager.paginator, "_text_pipeline", text_pipeline)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    asyncio.run(manager.db.bookmarks.insert_many([
+        {"id": bookmark_id, "title": title, "url": url, "category": "Dev", "date_added": start + timedelta(days=index)}
+        for index, (bookmark_id, title, url) in enumerate(BOOKMARKS)
+    ]))
+    return manager.paginator
+
+
+async def search(paginator, text, limit):
+    ids, cursor = [], None
+    while True:
+        page = await paginator.search_page(text, limit, cursor, fields="title")
+        ids += [doc["id"] for doc in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            return ids
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 10])
+def test_whole_word_hits_first_then_substring_hits(paginator, limit):
+    ids = asyncio.run(search(paginator, "git", limit))
+    assert ids[:2] == ["blog", "git"]
+    assert sorted(ids[2:]) == ["gh", "gl"]
+
+
+def test_substring_search_only_when_no_word_matches(paginator):
+    assert asyncio.run(search(paginator, "itla", 10)) == ["gl"]
+
+
+def test_substring_search_covers_category(paginator):
+    assert sorted(asyncio.run(search(paginator, "dev", 2))) == sorted(bookmark_id for bookmark_id, _, _ in BOOKMARKS)
+
+
+@pytest.mark.parametrize("text, terms", [
+    ("git", "git"),
+    ("-git", "git"),
+    ('"git hub"', "git hub"),
+    ("git -- -lab", "git lab"),
+    ("e-mail", "e-mail"),
+    ('-"', ""),
+])
+def test_text_operators_are_stripped(text, terms):
+    assert BookmarkPaginator.text_terms(text) == terms
+
+
+def test_operator_input_still_finds_substring_hits(paginator):
+    assert asyncio.run(search(paginator, "-", 10)) == ["git"]
@@ -0,0 +1,48 @@
+"""canonicalize_url: welche URLs sich einen url_key teilen (Duplikat-Erkennung)"""
+import pytest
+
+from server import canonicalize_url
+
+
+@pytest.mark.parametrize("first, second", [
+    ("http://example.com/page", "https://example.com/page"),
+    ("https://www.example.com/page", "https://example.com/page"),
+    ("https://EXAMPLE.com./page", "https://example.com/page"),
+    ("http://example.com:80/page", "http://example.com/page"),
+    ("https://example.com:443/page", "https://example.com/page"),
+    ("https://example.com/page/", "https://example.com/page"),
+    ("https://example.com/page#section", "https://example.com/page"),
+    ("https://example.com/page?utm_source=x&fbclid=y", "https://example.com/page"),
+    ("https://example.com/page?b=2&a=1", "https://example.com/page?a=1&b=2"),
+    ("https://example.com/%7Euser/a%2fb", "https://example.com/~user/a%2Fb"),
+    ("https://bücher.de/", "https://xn--bcher-kva.de/"),
+    ("  https://example.com/page  ", "https://example.com/page"),
+])
+def test_equivalent_urls_share_a_key(first, second):
+    assert canonicalize_url(first) == canonicalize_url(second)
+
+
+@pytest.mark.parametrize("first, second", [
+    # Port nur weglassen, wenn er der Standard des eigenen Schemas ist
+    ("http://example.com:443/page", "http://example.com/page"),
+    ("https://example.com:80/page", "https://example.com/page"),
+    ("https://example.com:8080/page", "https://example.com/page"),
+    # Pfad und Query bleiben case-sensitiv
+    ("https://example.com/Page", "https://example.com/page"),
+    ("https://example.com/page?q=A", "https://example.com/page?q=a"),
+    # Client-Routen im Fragment sind eigene Seiten
+    ("https://app.example.com/#/inbox", "https://app.example.com/#/settings"),
+    ("https://example.com/page?id=1", "https://example.com/page?id=2"),
+])
+def test_distinct_urls_keep_separate_keys(first, second):
+    assert canonicalize_url(first) != canonicalize_url(second)
+
+
+def test_key_format():
+    assert canonicalize_url("https://www.Example.com:8443/a/b/?x=1#top") == "example.com:8443/a/b?x=1"
+    assert canonicalize_url("http://[::1]:8080/") == "[::1]:8080"
+
+
+@pytest.mark.parametrize("url", ["ftp://example.com/file", "mailto:someone@example.com", "not a url", "", "http://host:99999/"])
+def test_non_web_urls_are_returned_unchanged(url):
+    assert canonicalize_url(url) == url.strip()
@@ -0,0 +1,111 @@
+"""track_changes-Middleware: schwache ETags aus den Collection-Versionen, 304 ohne Handler-Aufruf"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import server
+from server import ChangeTracker
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def client(monkeypatch, calls):
+    # Frische Versionen je Test; Handler zählen nur ihre Aufrufe statt die Datenbank zu lesen
+    monkeypatch.setattr(server.bookmark_manager, "changes", ChangeTracker())
+    app = FastAPI()
+    app.middleware("http")(server.track_changes)
+
+    @app.get("/api/bookmarks")
+    async def bookmarks():
+        calls.append("bookmarks")
+        return []
+
+    @app.get("/api/categories")
+    async def categories():
+        calls.append("categories")
+        return []
+
+    @app.get("/api/statistics")
+    async def statistics():
+        calls.append("statistics")
+        return {}
+
+    @app.get("/api/bookmarks/validate/jobs/{job_id}")
+    async def job(job_id: str):
+        return {"id": job_id}
+
+    @app.put("/api/bookmarks/{bookmark_id}/status")
+    @app.put("/api/bookmarks/{bookmark_id}")
+    @app.put("/api/categories/{category_id}")
+    @app.post("/api/export")
+    async def write(bookmark_id: str = "", category_id: str = ""):
+        return {}
+
+    return TestClient(app)
+
+
+def revalidate(client, path, etag):
+    return client.get(path, headers={"If-None-Match": etag}).status_code
+
+
+def test_matching_etag_returns_304_without_calling_the_handler(client, calls):
+    first = client.get("/api/bookmarks")
+    etag = first.headers["etag"]
+    assert first.status_code == 200 and etag.startswith('W/"')
+    assert first.headers["cache-control"] == "no-cache"
+
+    response = client.get("/api/bookmarks", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert calls == ["bookmarks"]
+
+
+@pytest.mark.parametrize("header", ['"other", {etag}', "{strong}", "*"])
+def test_if_none_match_forms(client, header):
+    etag = client.get("/api/bookmarks").headers["etag"]
+    header = header.format(etag=etag, strong=etag.removeprefix("W/"))
+    assert revalidate(client, "/api/bookmarks", header) == 304
+
+
+def test_prefix_of_etag_does_not_match(client):
+    etag = client.get("/api/bookmarks").headers["etag"]
+    assert revalidate(client, "/api/bookmarks", etag[:-2] + '"') == 200
+
+
+def test_write_invalidates_only_the_touched_collections(client):
+    etags = {path: client.get(path).headers["etag"] for path in ("/api/bookmarks", "/api/categories", "/api/statistics")}
+
+    client.put("/api/bookmarks/b1/status")
+    assert revalidate(client, "/api/bookmarks", etags["/api/bookmarks"]) == 200
+    assert revalidate(client, "/api/categories", etags["/api/categories"]) == 304
+    assert revalidate(client, "/api/statistics", etags["/api/statistics"]) == 200
+
+
+@pytest.mark.parametrize("path, stale", [
+    # Kategorie-Wechsel eines Bookmarks ändert bookmark_count der Kategorien
+    ("/api/bookmarks/b1", {"/api/bookmarks", "/api/categories"}),
+    # Umbenennen einer Kategorie schreibt die Bookmarks um
+    ("/api/categories/c1", {"/api/bookmarks", "/api/categories"}),
+])
+def test_writes_that_span_collections(client, path, stale):
+    etags = {path: client.get(path).headers["etag"] for path in ("/api/bookmarks", "/api/categories")}
+
+    client.put(path)
+    assert {read for read, etag in etags.items() if revalidate(client, read, etag) == 200} == stale
+
+
+def test_read_only_post_and_untracked_reads(client):
+    etag = client.get("/api/bookmarks").headers["etag"]
+    client.post("/api/export")
+    assert revalidate(client, "/api/bookmarks", etag) == 304
+    assert "etag" not in client.get("/api/bookmarks/validate/jobs/j1").headers
+
+
+def test_etag_changes_after_restart(client, monkeypatch):
+    etag = client.get("/api/bookmarks").headers["etag"]
+    monkeypatch.setattr(server.bookmark_manager, "changes", ChangeTracker())
+    assert revalidate(client, "/api/bookmarks", etag) == 200
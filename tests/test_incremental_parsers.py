@@ -0,0 +1,86 @@
+"""IncrementalXMLParser / IncrementalCSVParser: Ergebnis unabhängig davon, wo die Upload-Blöcke enden"""
+import codecs
+
+import pytest
+
+from server import BookmarkParser
+
+XML = """<?xml version="1.0" encoding="UTF-8"?>
+<bookmarks>
+  <bookmark>
+    <title>Übersicht &amp; Größen</title>
+    <url>https://example.com/über?a=1&amp;b=2</url>
+    <category>Entwicklung</category>
+    <subcategory>Python 🐍</subcategory>
+    <description>Mehrzeilige
+Beschreibung</description>
+  </bookmark>
+  <bookmark>
+    <title><![CDATA[Tags <im> Titel]]></title>
+    <url>https://example.org/</url>
+  </bookmark>
+  <bookmark><title>Ohne URL</title></bookmark>
+  <bookmark><title>日本語</title><url>https://example.jp/</url><category>Welt</category></bookmark>
+</bookmarks>
+""".encode("utf-8")
+
+CSV = (
+    'Title,URL,Category,Subcategory,Description\r\n'
+    'Einfach,https://example.com/,Entwicklung,,\r\n'
+    '"Komma, im Titel",example.org/pfad,News,Tech,"Zeile eins\nZeile zwei"\n'
+    '"Zitat ""innen""",https://example.net/,Größen,Ä🐍,"über\n""mehrere""\n Zeilen"\n'
+    '\n'
+    'Ohne URL,,News,,\n'
+    '日本語,https://example.jp/,Welt,,ende'
+).encode("utf-8")
+
+
+def parse(file_type, content, boundaries):
+    """Wie import_upload: Bytes blockweise dekodieren und in den Parser füttern"""
+    parser = BookmarkParser().incremental_parser(file_type)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    bookmarks = []
+    start = 0
+    for end in list(boundaries) + [len(content)]:
+        bookmarks += parser.feed(decoder.decode(content[start:end]))
+        start = end
+    return bookmarks + parser.feed(decoder.decode(b"", final=True)) + parser.close()
+
+
+def test_xml_whole_document():
+    assert parse("xml", XML, []) == [
+        {"title": "Übersicht & Größen", "url": "https://example.com/über?a=1&b=2", "category": "Entwicklung",
+         "subcategory": "Python 🐍", "description": "Mehrzeilige\nBeschreibung"},
+        {"title": "Tags <im> Titel", "url": "https://example.org/", "category": "Nicht zugeordnet",
+         "subcategory": None, "description": None},
+        {"title": "日本語", "url": "https://example.jp/", "category": "Welt", "subcategory": None, "description": None},
+    ]
+
+
+def test_csv_whole_document():
+    assert parse("csv", CSV, []) == [
+        {"title": "Einfach", "url": "https://example.com/", "category": "Entwicklung",
+         "subcategory": None, "description": None},
+        {"title": "Komma, im Titel", "url": "https://example.org/pfad", "category": "News",
+         "subcategory": "Tech", "description": "Zeile eins\nZeile zwei"},
+        {"title": 'Zitat "innen"', "url": "https://example.net/", "category": "Größen",
+         "subcategory": "Ä🐍", "description": 'über\n"mehrere"\n Zeilen'},
+        {"title": "日本語", "url": "https://example.jp/", "category": "Welt", "subcategory": None, "description": "ende"},
+    ]
+
+
+@pytest.mark.parametrize("split", range(1, len(XML)))
+def test_xml_every_split_position(split):
+    assert parse("xml", XML, [split]) == parse("xml", XML, [])
+
+
+@pytest.mark.parametrize("split", range(1, len(CSV)))
+def test_csv_every_split_position(split):
+    assert parse("csv", CSV, [split]) == parse("csv", CSV, [])
+
+
+@pytest.mark.parametrize("file_type, content", [("xml", XML), ("csv", CSV)])
+@pytest.mark.parametrize("size", [1, 2, 3, 5])
+def test_small_byte_chunks(file_type, content, size):
+    # Kleine Blöcke trennen auch jedes Mehrbyte-Zeichen (ä, 🐍, 日本語)
+    assert parse(file_type, content, range(size, len(content), size)) == parse(file_type, content, [])
@@ -0,0 +1,69 @@
+"""NearDuplicateDetector: MinHash-Signaturen und LSH-Buckets (fester Seed, daher deterministisch)"""
+import asyncio
+
+import numpy as np
+import pytest
+
+from server import NearDuplicateDetector, canonicalize_url
+
+MIRROR = (
+    {"id": "a", "title": "Python Tutorial: Listen und Dictionaries",
+     "url": "https://www.example.com/python/tutorial/listen-und-dictionaries"},
+    {"id": "b", "title": "Python Tutorial - Listen und Dictionaries",
+     "url": "https://m.example.com/python/tutorial/listen-und-dictionaries/amp"},
+)
+UNRELATED = (
+    {"id": "c", "title": "Wetterbericht Hamburg", "url": "https://wetter.example.org/hamburg"},
+    {"id": "d", "title": "Rezepte für Apfelkuchen", "url": "https://kochen.example.net/backen/apfelkuchen"},
+    {"id": "e", "title": "JavaScript Promises erklärt", "url": "https://developer.example.com/js/promises"},
+    {"id": "f", "title": "Steuererklärung 2024 Fristen", "url": "https://finanzen.example.de/steuer/fristen-2024"},
+)
+
+
+@pytest.fixture
+def detector():
+    return NearDuplicateDetector(None)
+
+
+def bands(detector, doc, threshold):
+    rows = detector._rows_per_band(threshold)
+    signature = detector.signature(doc["title"], doc["url"])
+    return {signature[start:start + rows].tobytes() for start in range(0, detector.NUM_PERM, rows)}
+
+
+def test_signature_is_deterministic():
+    first, second = NearDuplicateDetector(None), NearDuplicateDetector(None)
+    doc = MIRROR[0]
+    assert np.array_equal(first.signature(doc["title"], doc["url"]), second.signature(doc["title"], doc["url"]))
+    assert first.signature("", "") is None
+
+
+def test_near_identical_pair_shares_a_bucket(detector):
+    assert bands(detector, MIRROR[0], 0.7) & bands(detector, MIRROR[1], 0.7)
+
+
+def test_only_the_near_identical_pair_is_reported(detector):
+    result = detector._similar_pairs([*UNRELATED, *MIRROR], 0.7)
+
+    assert [[doc["id"] for doc in pair["bookmarks"]] for pair in result["pairs"]] == [["a", "b"]]
+    assert result["pairs"][0]["similarity"] >= 0.7
+
+
+def test_unrelated_bookmarks_are_not_reported(detector):
+    result = detector._similar_pairs(list(UNRELATED), 0.5)
+    assert result["pairs"] == []
+
+
+def test_exact_duplicates_are_left_to_the_duplicate_detector(detector):
+    docs = [{**doc, "url_key": canonicalize_url(MIRROR[0]["url"])} for doc in MIRROR]
+    assert detector._similar_pairs(docs, 0.7)["pairs"] == []
+
+
+def test_find_near_duplicates_reads_all_bookmarks(manager):
+    async def scenario():
+        await manager.db.bookmarks.insert_many([dict(doc) for doc in (*UNRELATED, *MIRROR)])
+        return await manager.near_duplicate_detector.find_near_duplicates(threshold=0.7)
+
+    result = asyncio.run(scenario())
+    assert result["bookmarks_scanned"] == 6
+    assert result["pair_count"] == 1
@@ -0,0 +1,72 @@
+"""NetscapeBookmarkTokenizer: blockweises Parsen muss unabhängig von den Blockgrenzen dasselbe liefern"""
+import pytest
+
+from server import NetscapeBookmarkTokenizer
+
+EXPORT = """<!DOCTYPE NETSCAPE-Bookmark-file-1>
+<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">
+<TITLE>Bookmarks</TITLE>
+<H1>Bookmarks</H1>
+<DL><p>
+    <DT><H3 ADD_DATE="1700000000" PERSONAL_TOOLBAR_FOLDER="true">Lesezeichenleiste</H3>
+    <DL><p>
+        <DT><H3>Entwicklung</H3>
+        <DL><p>
+            <DT><A HREF="https://github.com/" ADD_DATE="1700000001" TAGS="code, git">GitHub &amp; Co</A>
+            <DD>Quellcode-Hosting
+            <DT><H3>Python</H3>
+            <DL><p>
+                <DT><A HREF="https://docs.python.org/3/" ICON="data:image/png;base64,AAAA">Python <b>Docs</b></A>
+            </DL><p>
+        </DL><p>
+        <DT><A HREF="https://news.ycombinator.com/">Hacker News</A>
+    </DL><p>
+    <DT><H3>News → Tech</H3>
+    <DL><p>
+        <DT><A HREF='https://heise.de/'>heise
+        <DT><A HREF="javascript:void(0)">Bookmarklet</A>
+    </DL><p>
+</DL><p>
+"""
+
+
+def parse(chunks):
+    tokenizer = NetscapeBookmarkTokenizer()
+    bookmarks = []
+    for chunk in chunks:
+        bookmarks.extend(tokenizer.feed(chunk))
+    bookmarks.extend(tokenizer.close())
+    return bookmarks
+
+
+def test_folder_hierarchy_and_fields():
+    bookmarks = parse([EXPORT])
+
+    assert [(b["title"], b["category"], b["subcategory"]) for b in bookmarks] == [
+        ("GitHub & Co", "Entwicklung", None),
+        ("Python Docs", "Entwicklung", "Python"),
+        ("Hacker News", "Nicht zugeordnet", None),
+        ("heise", "News", "Tech"),
+    ]
+    github = bookmarks[0]
+    assert github["description"] == "Quellcode-Hosting"
+    assert github["tags"] == ["code", "git"]
+    assert github["date_added"].timestamp() == 1700000001
+    assert bookmarks[1]["favicon"] == "data:image/png;base64,AAAA"
+
+
+@pytest.mark.parametrize("split", range(1, len(EXPORT)))
+def test_every_split_position(split):
+    assert parse([EXPORT[:split], EXPORT[split:]]) == parse([EXPORT])
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64])
+def test_small_chunks(size):
+    chunks = [EXPORT[start:start + size] for start in range(0, len(EXPORT), size)]
+    assert parse(chunks) == parse([EXPORT])
+
+
+def test_unterminated_tags_at_end_of_input():
+    bookmarks = parse(['<DL><DT><H3>Tools</H3><DL><DT><A HREF="https://example.com/">Beispiel'])
+
+    assert [(b["title"], b["category"]) for b in bookmarks] == [("Beispiel", "Tools")]
@@ -0,0 +1,87 @@
+"""Rang-Schlüssel (RankManager): Ordnung, Dichte und minimale Umsortierung"""
+import random
+
+import pytest
+
+from server import RANK_DIGITS, _increasing_positions, rank_between, ranks_between, spaced_ranks
+
+
+def assert_valid(rank, lower=None, upper=None):
+    assert rank and set(rank) <= set(RANK_DIGITS)
+    assert not rank.endswith("0")
+    assert lower is None or lower < rank
+    assert upper is None or rank < upper
+
+
+@pytest.mark.parametrize("lower, upper", [
+    (None, None), (None, "V"), ("V", None), ("A", "B"), ("A", "A1"), ("Az", "B"),
+    ("1", "2"), (None, "01"), ("zz", None), ("V", "V1"), ("Vzzz", "W"),
+])
+def test_rank_between_is_strictly_inside(lower, upper):
+    assert_valid(rank_between(lower, upper), lower, upper)
+
+
+@pytest.mark.parametrize("lower, upper", [("B", "A"), ("A", "A")])
+def test_rank_between_rejects_empty_interval(lower, upper):
+    with pytest.raises(ValueError):
+        rank_between(lower, upper)
+
+
+def test_repeated_insertion_at_the_same_spot():
+    # Immer direkt hinter dem ersten Eintrag einfügen - der ungünstigste Fall für die Schlüssellänge
+    ranks = ["V", "k"]
+    for _ in range(200):
+        ranks.insert(1, rank_between(ranks[0], ranks[1]))
+    assert ranks == sorted(ranks) and len(set(ranks)) == len(ranks)
+    # Etwa eine Stelle pro fünf Einfügungen - zu lange Schlüssel kürzt der Rebalance-Job
+    assert max(map(len, ranks)) <= 200 // 4
+
+
+def test_random_insertions_stay_sorted():
+    rng = random.Random(42)
+    ranks = []
+    for _ in range(1000):
+        position = rng.randint(0, len(ranks))
+        lower = ranks[position - 1] if position else None
+        upper = ranks[position] if position < len(ranks) else None
+        rank = rank_between(lower, upper)
+        assert_valid(rank, lower, upper)
+        ranks.insert(position, rank)
+    assert ranks == sorted(ranks)
+
+
+@pytest.mark.parametrize("lower, upper, count", [
+    (None, None, 0), (None, None, 1), (None, None, 100), ("A", "B", 50), ("V", None, 7), (None, "1", 30),
+])
+def test_ranks_between_are_ascending_and_inside(lower, upper, count):
+    ranks = ranks_between(lower, upper, count)
+    assert len(ranks) == count
+    assert ranks == sorted(set(ranks))
+    for rank in ranks:
+        assert_valid(rank, lower, upper)
+
+
+def test_ranks_between_stays_short():
+    # Halbierung: 1000 Schlüssel in einer Lücke brauchen nur wenige Stellen
+    assert max(map(len, ranks_between("A", "B", 1000))) <= 3
+
+
+@pytest.mark.parametrize("count", [0, 1, 2, 61, 62, 63, 5000])
+def test_spaced_ranks(count):
+    ranks = spaced_ranks(count)
+    assert len(ranks) == count
+    assert ranks == sorted(set(ranks))
+    for rank in ranks:
+        assert_valid(rank)
+
+
+@pytest.mark.parametrize("ranks, kept", [
+    ([], set()),
+    (["A", "B", "C"], {0, 1, 2}),
+    (["C", "A", "B"], {1, 2}),
+    (["B", "A", "C", "D"], {1, 2, 3}),
+    ([None, "A", None, "B"], {1, 3}),
+    (["A", "A", "B"], {1, 2}),
+])
+def test_increasing_positions_keep_longest_sorted_run(ranks, kept):
+    assert _increasing_positions(ranks) == kept
@@ -0,0 +1,71 @@
+"""StatisticsManager: per $inc gepflegtes Statistik-Dokument stimmt nach jeder Mutation mit $facet überein"""
+import asyncio
+
+import server
+from server import BookmarkCreate, BookmarkMove, StatisticsManager
+
+# Vergleichbare Felder aus get_counters (materialisiert) und aggregate_counters ($facet)
+COUNTER_FIELDS = ("total_bookmarks", "status_counts", "locked_links", "categories_distribution",
+                  "subcategories_distribution")
+
+
+async def assert_materialized_matches_facet(manager, step):
+    stored = await manager.statistics_manager.get_counters()
+    actual = await manager.statistics_manager.aggregate_counters()
+    for field in COUNTER_FIELDS:
+        assert stored[field] == actual[field], f"{step}: {field}"
+
+
+def test_encoded_keys_round_trip():
+    for name in (None, "", "Node.js", "$Kosten", "a.b.c", "Preis in $", "Ünïcode"):
+        key = StatisticsManager._encode_key(name)
+        assert "." not in key and not key.startswith("$")
+        assert StatisticsManager._decode_key(key) == name
+
+
+def test_deltas_follow_every_mutation(manager):
+    async def scenario():
+        await manager.statistics_manager.reset()
+
+        async def create(title, url, category, subcategory=None):
+            return await manager.create_bookmark(
+                BookmarkCreate(title=title, url=url, category=category, subcategory=subcategory)
+            )
+
+        # Kategorienamen mit "." und "$" landen als kodierte Feldnamen im Statistik-Dokument
+        node = await create("Node", "https://nodejs.org/", "Node.js", "v20.1")
+        costs = await create("Kosten", "https://example.com/kosten", "$Kosten")
+        first = await create("Original", "https://example.com/page", "Web", "Docs")
+        await create("Kopie", "https://www.example.com/page/", "Web")
+        await create("Dritte", "http://example.com/page#top", "Node.js")
+        await assert_materialized_matches_facet(manager, "create")
+
+        await server.update_bookmark_status(node.id, {"status_type": "dead"})
+        await server.update_bookmark_status(costs.id, {"status_type": "locked"})
+        await assert_materialized_matches_facet(manager, "status")
+
+        await manager.move_bookmarks(BookmarkMove(
+            bookmark_ids=[first.id, node.id], target_category="Node.js", target_subcategory="Archiv"
+        ))
+        await assert_materialized_matches_facet(manager, "move")
+
+        await server.find_duplicates(dry_run=False)
+        assert await manager.db.bookmarks.count_documents({"status_type": "duplicate"}) == 2
+        await assert_materialized_matches_facet(manager, "mark duplicates")
+
+        await server.remove_duplicates()
+        assert await manager.db.bookmarks.count_documents({}) == 3
+        await assert_materialized_matches_facet(manager, "delete marked duplicates")
+
+        await create("Nochmal", "https://nodejs.org", "$Kosten", "v1.2")
+        await manager.find_and_remove_duplicates()
+        assert await manager.db.bookmarks.count_documents({}) == 3
+        await assert_materialized_matches_facet(manager, "remove duplicates")
+
+        await server.delete_bookmark(costs.id)
+        await assert_materialized_matches_facet(manager, "delete")
+
+        # Kein Drift: reconcile findet nichts zu korrigieren
+        return (await manager.statistics_manager.reconcile())["drift"]
+
+    assert asyncio.run(scenario()) == {}